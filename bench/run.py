@@ -0,0 +1,133 @@
+"""
+Benchmark suite for reclist generation.
+
+Run from the repository root, e.g. ``python -m bench.run -o bench.json``. Every case records wall time, peak
+memory, line count, redundancy and fluency-class counts as JSON, so runs can be compared over time.
+"""
+import argparse
+import gc
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from core import Generator
+from core.patterns import PatternTable
+
+from .synthetic import DICTIONARIES
+
+
+def run_case(
+        syllable_map: dict[str, tuple[str, str]],
+        mode: str,
+        max_length: int,
+        sss_first: bool,
+        iter_depth: int,
+        max_redu: int,
+        repeat: int,
+        pattern_table: PatternTable
+) -> dict[str, Any]:
+    """
+    Time ``Generator.create_reclist`` for one setting.
+
+    Wall time is the best of ``repeat`` runs without tracing; peak memory is measured in one extra traced run.
+
+    :return: Result record.
+    """
+    record: dict[str, Any] = {
+        "mode": mode,
+        "max_length": max_length,
+        "sss_first": sss_first,
+        "iter_depth": iter_depth,
+        "max_redu": max_redu,
+    }
+    generator = Generator(syllable_map, pattern_table)
+    times = []
+    try:
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            reclist = generator.create_reclist(
+                mode, max_length, sss_first, iter_depth, max_redu)
+            times.append(time.perf_counter() - start)
+    except NotImplementedError as e:
+        record["skipped"] = str(e)
+        return record
+
+    gc.collect()
+    tracemalloc.start()
+    generator.create_reclist(mode, max_length, sss_first, iter_depth, max_redu)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    summary = generator.summary()
+    record.update({
+        "wall_time": min(times),
+        "wall_times": times,
+        "peak_memory": peak,
+        "lines": len(reclist),
+        "redundancy": summary["redundancy"],
+        "perfect_fluent": summary["perfect_fluent"],
+        "in_turn_fluent": summary["in_turn_fluent"],
+        "not_fluent": summary["not_fluent"],
+    })
+    return record
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark reclist generation on synthetic dictionaries.")
+    parser.add_argument("-d", "--dictionaries", nargs="+", choices=list(DICTIONARIES),
+                        default=list(DICTIONARIES), help="Dictionary shapes to run, default all.")
+    parser.add_argument("-m", "--modes", nargs="+", choices=["CVVC", "VCV", "VCV_WITH_VC"],
+                        default=["CVVC", "VCV", "VCV_WITH_VC"], help="Generation modes, default all.")
+    parser.add_argument("-l", "--max-lengths", nargs="+", type=int, default=[4, 6, 8],
+                        help="Line lengths, default 4 6 8.")
+    parser.add_argument("-s", "--sss-first", nargs="+", type=int, choices=[0, 1], default=[0, 1],
+                        help="SSS-first settings as 0/1, default both.")
+    parser.add_argument("--iter-depths", nargs="+", type=int,
+                        help="In-turn iteration depths, default half of each line length.")
+    parser.add_argument("-r", "--max-redundancy", type=int, default=50,
+                        help="Maximum redundancy, default 50.")
+    parser.add_argument("-n", "--repeat", type=int, default=3,
+                        help="Timed runs per case, default 3.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic dictionaries.")
+    parser.add_argument("-o", "--output", help="JSON output path, default stdout.")
+    args = parser.parse_args()
+
+    pattern_table = PatternTable()
+    results = []
+    for name in args.dictionaries:
+        syllable_map = DICTIONARIES[name](args.seed)
+        for mode, max_length, sss_first in itertools.product(args.modes, args.max_lengths, args.sss_first):
+            for iter_depth in args.iter_depths or [max_length // 2]:
+                record = run_case(syllable_map, mode, max_length, bool(sss_first), iter_depth,
+                                  args.max_redundancy, args.repeat, pattern_table)
+                record["dictionary"] = name
+                record["syllables"] = len(syllable_map)
+                results.append(record)
+                case = f"{name:<9} {mode:<11} l={max_length} s={sss_first} d={iter_depth}"
+                if "skipped" in record:
+                    print(f"{case}: skipped", file=sys.stderr)
+                else:
+                    print(f"{case}: {record['wall_time'] * 1000:9.2f} ms {record['lines']} lines",
+                          file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
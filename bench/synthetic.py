@@ -0,0 +1,61 @@
+import random
+
+
+def _weighted_pairs(
+        rng: random.Random,
+        lefts: list[str],
+        rights: list[str],
+        size: int,
+        skew: float
+) -> dict[str, tuple[str, str]]:
+    """
+    Sample distinct (left, right) pairs with Zipf-like weights until the map reaches the requested size.
+
+    :param rng: Random source.
+    :param lefts: Left phonemes.
+    :param rights: Right phonemes.
+    :param size: Number of syllables, at most len(lefts) * len(rights).
+    :param skew: Zipf exponent; 0 gives uniform degrees, larger values give a few very busy phonemes.
+    :return: {syllable: (left, right)}
+    """
+    size = min(size, len(lefts) * len(rights))
+    left_weights = [1 / (rank + 1) ** skew for rank in range(len(lefts))]
+    right_weights = [1 / (rank + 1) ** skew for rank in range(len(rights))]
+    syllable_map: dict[str, tuple[str, str]] = {}
+    while len(syllable_map) < size:
+        batch = size - len(syllable_map)
+        for left, right in zip(rng.choices(lefts, left_weights, k=batch),
+                               rng.choices(rights, right_weights, k=batch)):
+            syllable_map.setdefault(f"{left}{right}", (left, right))
+    return syllable_map
+
+
+def japanese_like(seed: int = 0) -> dict[str, tuple[str, str]]:
+    """About 120 syllables: ~25 consonants over 5 vowels, almost fully dense."""
+    rng = random.Random(seed)
+    lefts = [f"c{i}" for i in range(25)]
+    rights = [f"v{i}" for i in range(5)]
+    return _weighted_pairs(rng, lefts, rights, 120, 0.0)
+
+
+def mandarin_like(seed: int = 0) -> dict[str, tuple[str, str]]:
+    """About 400 syllables: ~23 initials over ~35 finals, half dense with mild skew."""
+    rng = random.Random(seed)
+    lefts = [f"c{i}" for i in range(23)]
+    rights = [f"v{i}" for i in range(35)]
+    return _weighted_pairs(rng, lefts, rights, 400, 0.5)
+
+
+def english_like(seed: int = 0, size: int = 3000) -> dict[str, tuple[str, str]]:
+    """Thousands of syllables: many onsets and rhymes with strongly skewed degrees."""
+    rng = random.Random(seed)
+    lefts = [f"c{i}" for i in range(120)]
+    rights = [f"v{i}" for i in range(90)]
+    return _weighted_pairs(rng, lefts, rights, size, 1.1)
+
+
+DICTIONARIES = {
+    "japanese": japanese_like,
+    "mandarin": mandarin_like,
+    "english": english_like,
+}
@@ -1,4 +1,27 @@
-from .generator import Generator
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
+if TYPE_CHECKING:
+    from .generator import Generator
+    from .index import SyllableIndex
+    from .patterns import PatternTable, iter_patterns
 
-__all__ = ["Generator"]
+# The public names are imported on first use, so importing a light submodule such as ``core.options`` does not load
+# the generator and numpy.
+_EXPORTS = {
+    "Generator": ".generator",
+    "PatternTable": ".patterns",
+    "SyllableIndex": ".index",
+    "iter_patterns": ".patterns",
+}
+
+__all__ = ["Generator", "PatternTable", "SyllableIndex", "iter_patterns"]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
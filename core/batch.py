@@ -0,0 +1,167 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+
+import tomli
+
+from .compiled import COMPILED_SUFFIX, load_dictionary
+from .generator import Generator
+from .options import GenerateOptions
+from .patterns import PatternTable
+from .presamp import write_presamp_file
+from .writers import write_generation
+
+
+@dataclass(slots=True)
+class BatchJob:
+    """
+    One dictionary of a batch run.
+
+    :param input: Dictionary file path.
+    :param output: Output directory.
+    :param options: Generation parameters.
+    """
+    input: str
+    output: str
+    options: GenerateOptions = field(default_factory=GenerateOptions)
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """
+    Outcome of one batch job.
+
+    :param error: Error message if the job failed, None otherwise.
+    """
+    input: str
+    output: str
+    syllables: int = 0
+    lines: int = 0
+    seconds: float = 0.0
+    error: str | None = None
+
+
+def load_batch_jobs(path: str, output_root: str | None = None) -> list[BatchJob]:
+    """
+    Load batch jobs from a directory of ``.toml`` dictionaries and compiled ``.srd`` dictionaries (see
+    ``core.compiled``), or from a manifest file. If a directory holds both forms of a dictionary, the compiled one is
+    used.
+
+    A manifest is a TOML file with an optional ``[defaults]`` table of generation parameters and a
+    ``[[dictionary]]`` array. Each entry has an ``input`` path, an optional ``output`` directory and optional
+    per-file parameters; relative paths are relative to the manifest.
+
+    :param path: Directory or manifest file path.
+    :param output_root: Directory that receives one output directory per dictionary; defaults to the directory of the
+        dictionaries (or of the manifest).
+    :return: List of jobs in a stable order.
+    :raise ValueError: The manifest is invalid.
+    """
+    if os.path.isdir(path):
+        root = output_root or path
+        names: dict[str, str] = {}
+        for name in sorted(os.listdir(path)):
+            stem, suffix = os.path.splitext(name)
+            if suffix == COMPILED_SUFFIX or (suffix == ".toml" and stem not in names):
+                names[stem] = name
+        return [BatchJob(os.path.join(path, name), os.path.join(root, stem)) for stem, name in sorted(names.items())]
+
+    with open(path, "rb") as f:
+        try:
+            manifest = tomli.load(f)
+        except tomli.TOMLDecodeError as e:
+            raise ValueError(f"'{path}' is not a valid TOML file: {e}") from e
+    base_dir = os.path.dirname(os.path.abspath(path))
+    root = output_root or base_dir
+    defaults = GenerateOptions.from_mapping(manifest.get("defaults", {}))
+
+    jobs = []
+    for entry in manifest.get("dictionary", []):
+        entry = dict(entry)
+        if "input" not in entry:
+            raise ValueError("Every [[dictionary]] entry needs an 'input' path.")
+        input_path = os.path.join(base_dir, entry.pop("input"))
+        output = entry.pop("output", None)
+        output = os.path.join(base_dir, output) if output else os.path.join(
+            root, os.path.splitext(os.path.basename(input_path))[0])
+        jobs.append(BatchJob(input_path, output,
+                    GenerateOptions.from_mapping(entry, defaults)))
+    return jobs
+
+
+_worker_pattern_table: PatternTable | None = None
+
+
+def _init_worker(pattern_table: PatternTable) -> None:
+    """Install the pattern table shared by the parent process."""
+    global _worker_pattern_table
+    _worker_pattern_table = pattern_table
+
+
+def run_batch_job(job: BatchJob, pattern_table: PatternTable | None = None) -> BatchResult:
+    """
+    Run one batch job. Errors are reported in the result instead of being raised, so one broken dictionary does not
+    stop the batch.
+
+    :param job: Job to run.
+    :param pattern_table: Pattern table to share; the worker's table is used if not given.
+    :return: Job outcome.
+    """
+    result = BatchResult(job.input, job.output)
+    start = time.perf_counter()
+    try:
+        dictionary, index = load_dictionary(job.input)
+        options = job.options
+        if pattern_table is None:
+            # Inside a pool worker, components, restarts and the in-turn search must not spawn a pool of their own.
+            pattern_table = _worker_pattern_table
+            options = replace(options, jobs=1)
+        generator = Generator(dictionary.syllable_map, pattern_table, index=index)
+        result.syllables = len(dictionary.syllable_map)
+        result.lines = write_generation(generator, job.output, options)
+        write_presamp_file(os.path.join(job.output, "presamp.ini"), dictionary)
+    except (OSError, ValueError) as e:
+        result.error = str(e)
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: list[BatchJob], workers: int = 1) -> list[BatchResult]:
+    """
+    Run batch jobs across a process pool. Pattern tables for all jobs are built once up front and shared.
+
+    :param jobs: Jobs to run.
+    :param workers: Number of worker processes.
+    :return: One result per job, in job order.
+    """
+    pattern_table = PatternTable().warm(
+        [job.options.pattern_key() for job in jobs])
+    if workers <= 1 or len(jobs) <= 1:
+        return [run_batch_job(job, pattern_table) for job in jobs]
+    with ProcessPoolExecutor(
+            max_workers=min(workers, len(jobs)),
+            initializer=_init_worker,
+            initargs=(pattern_table,)
+    ) as executor:
+        return list(executor.map(run_batch_job, jobs))
+
+
+def format_batch_summary(results: list[BatchResult]) -> str:
+    """
+    Format batch results as a plain text table.
+
+    :param results: Batch results.
+    :return: Table text.
+    """
+    names = [os.path.basename(result.input) for result in results]
+    width = max([len("dictionary")] + [len(name) for name in names])
+    rows = [f"{'dictionary':<{width}}  {'syllables':>9}  {'lines':>7}  {'time (s)':>9}  status"]
+    for name, result in zip(names, results):
+        status = f"error: {result.error}" if result.error else "ok"
+        rows.append(f"{name:<{width}}  {result.syllables:>9}  {result.lines:>7}  "
+                    f"{result.seconds:>9.3f}  {status}")
+    total_lines = sum(result.lines for result in results)
+    total_seconds = sum(result.seconds for result in results)
+    rows.append(f"{'total':<{width}}  {'':>9}  {total_lines:>7}  {total_seconds:>9.3f}")
+    return "\n".join(rows)
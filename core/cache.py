@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict
+
+from .dictionary import SyllableDictionary
+from .generator import GENERATOR_VERSION
+from .options import GenerateOptions
+from .writers import ReclistWriter
+
+_META_NAME = "meta.json"
+_FILES = (ReclistWriter.RECLIST_NAME, ReclistWriter.OTO_NAME)
+
+
+def default_cache_dir() -> str:
+    """
+    Get the default cache directory: ``$XDG_CACHE_HOME/smooth-reclist``, or ``~/.cache/smooth-reclist``.
+
+    :return: Directory path.
+    """
+    root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "smooth-reclist")
+
+
+def cache_key(
+        dictionary: SyllableDictionary,
+        options: GenerateOptions,
+        previous_reclist: list[str] | None = None,
+        previous_syllable_map: dict[str, tuple[str, str]] | None = None
+) -> str:
+    """
+    Hash everything a ``generate`` result depends on.
+
+    The syllable map is normalized to a list of [syllable, left, right] in dictionary order, so formatting and
+    comments of the ``.toml`` file do not matter while the order, which the result depends on, does. The worker
+    count is left out because it does not change the result.
+
+    :param dictionary: Syllable dictionary, including its ``[config]`` block.
+    :param options: Generation parameters.
+    :param previous_reclist: Lines of a previous reclist for incremental regeneration.
+    :param previous_syllable_map: The syllable map the previous reclist was generated from.
+    :return: Hex SHA-256 digest.
+    """
+    parameters = asdict(options)
+    del parameters["jobs"]
+    data = {
+        "generator": GENERATOR_VERSION,
+        "syl": [[syl, left, right] for syl, (left, right) in dictionary.syllable_map.items()],
+        "config": {"n_fade": list(dictionary.n_fade), "end_flag": dictionary.end_flag},
+        "options": parameters,
+        "previous": previous_reclist,
+        "previous_syl": [[syl, left, right] for syl, (left, right) in previous_syllable_map.items()]
+        if previous_syllable_map is not None else None,
+    }
+    text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed on-disk cache of ``REClist.txt`` and ``oto.ini`` outputs.
+
+    Every entry is a directory named after its ``cache_key()``. Entries are evicted least recently used first once
+    the cache grows beyond ``max_bytes``; a hit counts as a use.
+
+    :param cache_dir: Cache directory, created on the first store.
+    :param max_bytes: Size cap of all entries together.
+    """
+
+    DEFAULT_MAX_BYTES = 256 << 20
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def restore(self, key: str, output_dir: str) -> int | None:
+        """
+        Copy a cached result into an output directory.
+
+        :param key: Key from ``cache_key()``.
+        :param output_dir: Output directory, created if it does not exist.
+        :return: Number of reclist lines, or None on a cache miss.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        meta_path = os.path.join(entry, _META_NAME)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                line_count = json.load(f)["lines"]
+            os.makedirs(output_dir, exist_ok=True)
+            for name in _FILES:
+                shutil.copyfile(os.path.join(entry, name), os.path.join(output_dir, name))
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        return line_count
+
+    def store(self, key: str, output_dir: str, line_count: int) -> None:
+        """
+        Add a result to the cache and evict old entries if the cache is over its size cap. Failures to write the
+        cache are ignored, since the result itself is already on disk.
+
+        :param key: Key from ``cache_key()``.
+        :param output_dir: Directory holding the generated ``REClist.txt`` and ``oto.ini``.
+        :param line_count: Number of reclist lines.
+        """
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+        except OSError:
+            return
+        try:
+            for name in _FILES:
+                shutil.copyfile(os.path.join(output_dir, name), os.path.join(tmp_dir, name))
+            with open(os.path.join(tmp_dir, _META_NAME), "w", encoding="utf-8") as f:
+                json.dump({"lines": line_count, "generator": GENERATOR_VERSION}, f)
+            # Another process may have stored the same key meanwhile; its entry is just as good.
+            os.replace(tmp_dir, os.path.join(self.cache_dir, key))
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self._evict(keep=key)
+
+    def _evict(self, keep: str) -> None:
+        """Remove least recently used entries until the cache fits ``max_bytes``, sparing ``keep``."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, name)
+            if name.startswith(".") or not os.path.isdir(entry):
+                continue
+            try:
+                size = sum(os.path.getsize(os.path.join(entry, f)) for f in os.listdir(entry))
+                used = os.path.getmtime(os.path.join(entry, _META_NAME))
+            except OSError:
+                continue
+            entries.append((used, name, size))
+            total += size
+        for _, name, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, name), ignore_errors=True)
+            total -= size
@@ -0,0 +1,222 @@
+import mmap
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from .dictionary import SyllableDictionary
+from .index import SyllableIndex
+from .interning import SymbolTable
+
+COMPILED_MAGIC = b"SRCD"
+# Version of the binary layout below. Bump it whenever the layout changes; older files are then rejected and must
+# be compiled again.
+COMPILED_FORMAT_VERSION = 1
+COMPILED_SUFFIX = ".srd"
+
+# magic, format version, flags, syllables, left phonemes, right phonemes, n_fade phonemes, distinct (left, right)
+# pairs, UTF-8 bytes of the name blob.
+_HEADER = struct.Struct("<4sHHIIIIII")
+_END_FLAG = 1
+_INT = np.dtype("<i4")
+
+
+@dataclass(slots=True)
+class CompiledDictionary:
+    """
+    A syllable dictionary loaded from a compiled artifact, together with its ready-made index.
+
+    :param dictionary: The dictionary, as ``SyllableDictionary().from_file()`` would read it from the ``.toml`` file.
+    :param index: Compiled index of ``dictionary.syllable_map``.
+    """
+    dictionary: SyllableDictionary
+    index: SyllableIndex
+
+
+def check_dictionary(dictionary: SyllableDictionary) -> None:
+    """
+    Check that every syllable has a left and a right phoneme and that no two syllables share a phoneme pair.
+
+    ``SyllableIndex`` silently uses the first syllable of a shared pair, so the other one could never be recorded
+    as a VC; a compiled dictionary rejects such pairs instead.
+
+    :param dictionary: Syllable dictionary.
+    :raise ValueError: The dictionary is empty, a phoneme is missing or two syllables share a phoneme pair.
+    """
+    if not dictionary.syllable_map:
+        raise ValueError("The syllable map is empty.")
+    missing = [syl for syl, (left, right) in dictionary.syllable_map.items() if not left.strip() or not right.strip()]
+    if missing:
+        raise ValueError(f"Syllables without a left or right phoneme: {', '.join(missing)}.")
+
+    owner: dict[tuple[str, str], str] = {}
+    duplicates = []
+    for syl, pair in dictionary.syllable_map.items():
+        first = owner.setdefault(pair, syl)
+        if first != syl:
+            duplicates.append(f"'{syl}' and '{first}' ({pair[0]} {pair[1]})")
+    if duplicates:
+        raise ValueError(f"Syllables sharing a phoneme pair: {', '.join(duplicates)}.")
+
+
+def _csr(rows: tuple[tuple[int, ...], ...]) -> tuple[np.ndarray, np.ndarray]:
+    """Flatten rows of IDs into (offsets, values)."""
+    offsets = np.zeros(len(rows) + 1, dtype=_INT)
+    np.cumsum([len(row) for row in rows], out=offsets[1:])
+    values = np.fromiter((value for row in rows for value in row), dtype=_INT, count=int(offsets[-1]))
+    return offsets, values
+
+
+def _rows(offsets: list[int], values: list[int]) -> tuple[tuple[int, ...], ...]:
+    """Inverse of ``_csr()``."""
+    return tuple(tuple(values[a:b]) for a, b in zip(offsets, offsets[1:]))
+
+
+def compile_dictionary(dictionary: SyllableDictionary) -> bytes:
+    """
+    Check a dictionary and compile it into a binary artifact.
+
+    Layout, all integers little-endian:
+
+    - header (``_HEADER``);
+    - int32 arrays: left ID and right ID of every syllable, then (offsets, values) of the left-to-rights,
+      right-to-lefts, left-to-syllables and right-to-syllables adjacency of ``SyllableIndex``;
+    - int32 character offsets into the name blob, one per name plus an end offset;
+    - the name blob: dictionary version, syllables, left phonemes, right phonemes and n_fade phonemes, as one UTF-8
+      string.
+
+    :param dictionary: Syllable dictionary.
+    :return: The artifact.
+    :raise ValueError: The dictionary does not pass ``check_dictionary()``.
+    """
+    check_dictionary(dictionary)
+    index = SyllableIndex(dictionary.syllable_map)
+    num_lefts = len(index.left_table)
+    num_rights = len(index.right_table)
+
+    pairs = np.array([index.pair_of(syl_id) for syl_id in range(len(index))], dtype=_INT)
+    left_to_rights = _csr(tuple(index.right_ids_for_left(left_id) for left_id in range(num_lefts)))
+    right_to_lefts = _csr(tuple(index.left_ids_for_right(right_id) for right_id in range(num_rights)))
+    left_to_syllables = _csr(tuple(index.syllables_for_left(left_id) for left_id in range(num_lefts)))
+    right_to_syllables = _csr(tuple(index.syllables_for_right(right_id) for right_id in range(num_rights)))
+
+    version = dictionary.version or "1.0.0"
+    names = [version, *index.syllable_table.names(), *index.left_table.names(), *index.right_table.names(),
+             *dictionary.n_fade]
+    name_offsets = np.zeros(len(names) + 1, dtype=_INT)
+    np.cumsum([len(name) for name in names], out=name_offsets[1:])
+    blob = "".join(names).encode("utf-8")
+
+    header = _HEADER.pack(
+        COMPILED_MAGIC, COMPILED_FORMAT_VERSION, _END_FLAG if dictionary.end_flag else 0, len(index), num_lefts,
+        num_rights, len(dictionary.n_fade), len(left_to_rights[1]), len(blob))
+    arrays = (pairs[:, 0], pairs[:, 1], *left_to_rights, *right_to_lefts, *left_to_syllables, *right_to_syllables,
+              name_offsets)
+    return header + b"".join(np.ascontiguousarray(array).tobytes() for array in arrays) + blob
+
+
+def write_compiled(path: str, dictionary: SyllableDictionary) -> None:
+    """
+    Compile a dictionary into a file.
+
+    :param path: Output file path.
+    :param dictionary: Syllable dictionary.
+    :raise ValueError: The dictionary does not pass ``check_dictionary()``.
+    """
+    data = compile_dictionary(dictionary)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def is_compiled(path: str) -> bool:
+    """
+    Check whether a file is a compiled dictionary, by its magic number.
+
+    :param path: File path.
+    :return: Whether the file starts with ``COMPILED_MAGIC``.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(COMPILED_MAGIC)) == COMPILED_MAGIC
+
+
+def read_compiled(path: str) -> CompiledDictionary:
+    """
+    Load a compiled dictionary. The file is memory-mapped and its tables are read in place, so no TOML is parsed
+    and no phoneme is interned again.
+
+    :param path: Artifact path.
+    :return: The dictionary and its index.
+    :raise ValueError: The file is not a compiled dictionary, was compiled by another format version, or is
+        truncated.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) < _HEADER.size:
+            raise ValueError(f"'{path}' is not a compiled dictionary.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return _read_buffer(path, buffer)
+
+
+def _read_buffer(path: str, buffer: mmap.mmap) -> CompiledDictionary:
+    """Decode a mapped artifact; the arrays viewing ``buffer`` are released before it returns."""
+    (magic, version, flags, num_syl, num_lefts, num_rights, num_n_fade, num_pairs,
+     blob_size) = _HEADER.unpack_from(buffer)
+    if magic != COMPILED_MAGIC:
+        raise ValueError(f"'{path}' is not a compiled dictionary.")
+    if version != COMPILED_FORMAT_VERSION:
+        raise ValueError(f"'{path}' was compiled with format version {version}, but version "
+                         f"{COMPILED_FORMAT_VERSION} is required; compile the dictionary again.")
+
+    num_names = 1 + num_syl + num_lefts + num_rights + num_n_fade
+    sizes = (num_syl, num_syl, num_lefts + 1, num_pairs, num_rights + 1, num_pairs, num_lefts + 1, num_syl,
+             num_rights + 1, num_syl, num_names + 1)
+    blob_start = _HEADER.size + _INT.itemsize * sum(sizes)
+    if len(buffer) != blob_start + blob_size:
+        raise ValueError(f"'{path}' is truncated or corrupt.")
+
+    tables = np.frombuffer(buffer, dtype=_INT, count=sum(sizes), offset=_HEADER.size)
+    parts = np.split(tables, np.cumsum(sizes)[:-1])
+    (lefts_of, rights_of, l2r_offsets, l2r, r2l_offsets, r2l, l2s_offsets, l2s, r2s_offsets, r2s,
+     name_offsets) = (part.tolist() for part in parts)
+    del tables, parts
+    text = buffer[blob_start:].decode("utf-8")
+
+    names = [text[a:b] for a, b in zip(name_offsets, name_offsets[1:])]
+    syllable_names = names[1:1 + num_syl]
+    left_names = names[1 + num_syl:1 + num_syl + num_lefts]
+    right_names = names[1 + num_syl + num_lefts:num_names - num_n_fade]
+    syllable_pairs = tuple(zip(lefts_of, rights_of))
+    syllable_map = {syl: (left_names[left_id], right_names[right_id])
+                    for syl, (left_id, right_id) in zip(syllable_names, syllable_pairs)}
+
+    dictionary = SyllableDictionary()
+    dictionary.version = names[0]
+    dictionary.syllable_map = syllable_map
+    dictionary.n_fade = names[num_names - num_n_fade:]
+    dictionary.end_flag = bool(flags & _END_FLAG)
+
+    index = SyllableIndex.from_tables(
+        syllable_map,
+        SymbolTable.from_names(left_names),
+        SymbolTable.from_names(right_names),
+        SymbolTable.from_names(syllable_names),
+        syllable_pairs,
+        _rows(l2r_offsets, l2r),
+        _rows(r2l_offsets, r2l),
+        _rows(l2s_offsets, l2s),
+        _rows(r2s_offsets, r2s),
+    )
+    return CompiledDictionary(dictionary, index)
+
+
+def load_dictionary(path: str) -> tuple[SyllableDictionary, SyllableIndex | None]:
+    """
+    Read a dictionary from either a ``.toml`` file or a compiled artifact.
+
+    :param path: Dictionary file path.
+    :return: The dictionary, and its index if the file was compiled (None for a ``.toml`` file).
+    :raise ValueError: The file is not a valid dictionary.
+    """
+    if is_compiled(path):
+        compiled = read_compiled(path)
+        return (compiled.dictionary, compiled.index)
+    return (SyllableDictionary().from_file(path), None)
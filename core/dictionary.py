@@ -0,0 +1,116 @@
+import json
+import re
+from typing import Any, Self, TextIO
+
+_BARE_KEY = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def _toml_key(key: str) -> str:
+    """Format a TOML key, quoting it unless it is a bare key."""
+    return key if _BARE_KEY.fullmatch(key) else _toml_str(key)
+
+
+def _toml_str(value: str) -> str:
+    """Format a TOML basic string. JSON string escapes are a subset of TOML's."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+class SyllableDictionary:
+    """
+    Syllable dictionary in the ``.toml`` format described in readme.md.
+
+    The values must be explicitly set via member functions with a ``from`` prefix (e.g., ``from_file()``).
+    """
+
+    MIN_VERSION = (1, 0, 0)
+
+    def __init__(self) -> None:
+        self.version: str = ""
+        self.syllable_map: dict[str, tuple[str, str]] = {}
+        self.n_fade: list[str] = []
+        self.end_flag: bool = True
+
+    def from_file(self, path: str) -> Self:
+        """
+        Read a dictionary from a ``.toml`` file.
+
+        :param path: Dictionary file path.
+        :return: self
+        :raise ValueError: The file is not a valid dictionary.
+        """
+        # Imported here, so that commands reading a compiled dictionary (see core.compiled) do not load the parser.
+        import tomli
+
+        with open(path, "rb") as f:
+            try:
+                data = tomli.load(f)
+            except tomli.TOMLDecodeError as e:
+                raise ValueError(f"'{path}' is not a valid TOML file: {e}") from e
+        return self.from_dict(data)
+
+    def from_dict(self, data: dict[str, Any]) -> Self:
+        """
+        Read a dictionary from parsed TOML data.
+
+        :param data: Parsed TOML document.
+        :return: self
+        :raise ValueError: The data is not a valid dictionary.
+        """
+        version = data.get("version")
+        if not isinstance(version, str):
+            raise ValueError("The dictionary has no 'version' field.")
+        try:
+            version_tuple = tuple(int(part) for part in version.split("."))
+        except ValueError:
+            raise ValueError(f"Invalid dictionary version '{version}'.") from None
+        if version_tuple < self.MIN_VERSION:
+            raise ValueError(f"Dictionary version '{version}' is lower than 1.0.0.")
+
+        syl = data.get("syl")
+        if not isinstance(syl, dict) or not syl:
+            raise ValueError("The dictionary has no '[syl]' table.")
+        syllable_map = {}
+        for name, phonemes in syl.items():
+            if (not isinstance(phonemes, list) or len(phonemes) != 2
+                    or not all(isinstance(p, str) and p for p in phonemes)):
+                raise ValueError(
+                    f"Syllable '{name}' must be defined as [\"L\", \"R\"].")
+            syllable_map[name] = (phonemes[0], phonemes[1])
+
+        config = data.get("config", {})
+        n_fade = config.get("n_fade", [])
+        end_flag = config.get("end_flag", True)
+        if not isinstance(n_fade, list) or not all(isinstance(p, str) for p in n_fade):
+            raise ValueError("'n_fade' must be an array of strings.")
+        if not isinstance(end_flag, bool):
+            raise ValueError("'end_flag' must be a boolean.")
+
+        self.version = version
+        self.syllable_map = syllable_map
+        self.n_fade = n_fade
+        self.end_flag = end_flag
+        return self
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the dictionary to TOML data, ready for ``tomli_w``.
+
+        :return: TOML document.
+        """
+        return {
+            "version": self.version or "1.0.0",
+            "syl": {syl: [left, right] for syl, (left, right) in self.syllable_map.items()},
+            "config": {"n_fade": list(self.n_fade), "end_flag": self.end_flag},
+        }
+
+    def write_toml(self, f: TextIO) -> None:
+        """
+        Write the dictionary as TOML, one syllable per line in the format of readme.md.
+
+        :param f: Output text file.
+        """
+        f.write(f"version = {_toml_str(self.version or '1.0.0')}\n\n[syl]\n")
+        for syl, (left, right) in self.syllable_map.items():
+            f.write(f"{_toml_key(syl)} = [{_toml_str(left)}, {_toml_str(right)}]\n")
+        n_fade = ", ".join(_toml_str(p) for p in self.n_fade)
+        f.write(f"\n[config]\nn_fade = [{n_fade}]\nend_flag = {'true' if self.end_flag else 'false'}\n")
@@ -1,33 +1,98 @@
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Collection, Container, Iterator
+from dataclasses import dataclass
+from itertools import combinations
 from typing import Literal
-from .views import RLPairView, SyllableView
+from .index import SyllableIndex
+from .in_turn import (LineState, build_in_turn_chunk, build_in_turn_line, free_syllable, init_in_turn_worker,
+                      label_needs, line_slots, window_slack)
+from .interning import SymbolTable
+from .oto import build_oto, oto_lines
+from .packing import PackingReport, pack_not_fluent, pack_perfect_fluent
+from .patterns import Pattern, PatternTable, default_pattern_table
+from .reclist import split_line
+from .restarts import reclist_score, shuffled_syllable_map
+from .stats import CountingProxy, GenerationStats, StageStats
+from .vcv import cover_transitions
+from .views import RLPairView
+
+ReclistEntry = tuple[str, list[tuple[str, str]]]
+
+# Version of the generated output. Bump it whenever a change alters the reclist or oto.ini produced for the same
+# input, so that cached results (see core.cache) are not reused.
+GENERATOR_VERSION = "11"
+
+
+@dataclass(frozen=True, slots=True)
+class _NamedIds:
+    """Membership of a set of names, tested by ID."""
+    table: SymbolTable
+    names: Container[str]
+
+    def __contains__(self, symbol_id: int) -> bool:
+        return self.table.name_of(symbol_id) in self.names
 
 
 class Generator:
     """Generator for creating a REClist.
 
     :param syllable_map: A syllable mapping table in the format {syllable: (right, left)}.
+    :param pattern_table: Memoized in-turn pattern table; the process-wide default table is shared if not given.
+    :param stats: Instrumentation filled in by every run; None disables instrumentation.
+    :param index: Compiled index of ``syllable_map`` to share, e.g. across generators or pool workers; compiled once
+        here if not given.
     """
 
-    def __init__(self, syllable_map: dict[str, tuple[str, str]]) -> None:
+    def __init__(
+            self,
+            syllable_map: dict[str, tuple[str, str]],
+            pattern_table: PatternTable | None = None,
+            stats: GenerationStats | None = None,
+            index: SyllableIndex | None = None
+    ) -> None:
         self.syllable_map = syllable_map
+        self._pattern_table = pattern_table if pattern_table is not None else default_pattern_table
+        self.stats = stats
+        self._index = index if index is not None else SyllableIndex(syllable_map)
+
+    @property
+    def index(self) -> SyllableIndex:
+        """The compiled syllable index shared by every run of this generator."""
+        return self._index
 
     def reset(self) -> None:
-        self._syllable_view = SyllableView().from_syllable_phoneme_map(self.syllable_map)
-        self._pair_view = RLPairView(self.syllable_map)
+        index = self._index
+        if not len(index):
+            raise ValueError("The syllable map is empty.")
+        self._pair_view = RLPairView(index)
+        if self.stats is not None:
+            self._pair_view = CountingProxy(
+                self._pair_view, self.stats.pair_view_calls)
 
-        self._syl_unused_as_start: set[str] = set(
-            self._syllable_view.get_syllable_map().keys())
+        self._syl_unused_as_start: set[str] = set(index.syllable_table.names())
 
-        self._right_unused_as_end: set[str] = set(self._pair_view.all_rights())
+        self._right_unused_as_end: set[str] = set(index.right_table.names())
 
-        self._syl_unused_as_nonstart: set[str] = set(
-            self._syllable_view.get_syllable_map().keys())
+        self._syl_unused_as_nonstart: set[str] = set(index.syllable_table.names())
 
         self._redu: int = 0
+        self._in_turn_redu: int = 0
+        self._packing_report = PackingReport()
 
+        self._kept_num: int = 0
+        self._sss_num: int = 0
         self._perfect_fluent_num: int = 0
         self._in_turn_fluent_num: int = 0
         self._not_fluent_num: int = 0
+        self._vcv_num: int = 0
+        self._vcv_lower_bound: int = 0
+
+        self._search_patterns: int = 0
+        self._search_covered: int = 0
+        self._search_timed_out: bool = False
+        self._best_restart: int = 0
 
     def generate(
             self,
@@ -38,6 +103,12 @@ class Generator:
             sss_first: bool,
             iter_depth: int,
             max_redu: int,
+            jobs: int = 1,
+            previous_reclist: list[str] | None = None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None = None,
+            time_budget: float | None = None,
+            restarts: int = 1,
+            seed: int = 0,
     ) -> tuple[list[str], list[str]]:
         """
         Generate a reclist.
@@ -49,19 +120,71 @@ class Generator:
         :param sss_first: Whether to use SSS mode (see readme.md for details).
         :param iter_depth: Maximum number of iterations to search for smooth in-turn mode.
         :param max_redu: Maximum redundancy allowed for constructing smooth in-turn sequences; ignored under NO_IN_TURN policy.
+        :param jobs: Number of worker processes for independent dictionary components, restarts and the in-turn search. The result does not depend on it.
+        :param previous_reclist: Lines of a previous reclist to regenerate incrementally (see ``iter_reclist()``).
+        :param previous_syllable_map: The syllable map the previous reclist was generated from.
+        :param time_budget: Seconds after which the in-turn search stops and keeps the lines found so far (see ``iter_reclist()``).
+        :param restarts: Number of dictionary orders to search, keeping the best result (see ``iter_reclist()``).
+        :param seed: Seed of the shuffled dictionary orders.
 
         :return: A pair, where the first element is an array of REClist lines, and the second element is an array of oto.ini template lines.
         """
-
-        audio_phoneme_map = self.create_reclist(
+        # The whole reclist is at hand, so the oto.ini rows are built in one NumPy pass.
+        entries = list(self.iter_reclist(
             mode=mode,
             max_length=max_length,
             sss_first=sss_first,
             iter_depth=iter_depth,
-            max_redu=max_redu
-        )
-        oto = self.create_oto(bmp=bmp, audio_phoneme_map=audio_phoneme_map)
-        return ([reclist for reclist in audio_phoneme_map.keys()], oto)
+            max_redu=max_redu,
+            policy=policy,
+            jobs=jobs,
+            previous_reclist=previous_reclist,
+            previous_syllable_map=previous_syllable_map,
+            time_budget=time_budget,
+            restarts=restarts,
+            seed=seed
+        ))
+        text = build_oto(entries, bmp, mode)
+        return ([line for line, _ in entries], text.split("\n") if text else [])
+
+    def iter_generate(
+            self,
+            mode: Literal["CVVC", "VCV", "VCV_WITH_VC"],
+            policy: Literal["DEFAULT", "NO_IN_TURN"],
+            bmp: int,
+            max_length: int,
+            sss_first: bool,
+            iter_depth: int,
+            max_redu: int,
+            jobs: int = 1,
+            previous_reclist: list[str] | None = None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None = None,
+            time_budget: float | None = None,
+            restarts: int = 1,
+            seed: int = 0,
+    ) -> Iterator[tuple[str, list[str]]]:
+        """
+        Generate a reclist as a stream. Each line is yielded as soon as it is committed, so the caller can write it out
+        while the search is still running. The oto.ini rows of each line come from ``oto_lines()``, which formats a
+        single line without NumPy. Parameters are the same as ``generate()``.
+
+        :return: An iterator of pairs, where the first element is a REClist line, and the second element is the oto.ini template lines for it.
+        """
+        for line, phoneme_pairs in self.iter_reclist(
+                mode=mode,
+                max_length=max_length,
+                sss_first=sss_first,
+                iter_depth=iter_depth,
+                max_redu=max_redu,
+                policy=policy,
+                jobs=jobs,
+                previous_reclist=previous_reclist,
+                previous_syllable_map=previous_syllable_map,
+                time_budget=time_budget,
+                restarts=restarts,
+                seed=seed
+        ):
+            yield (line, oto_lines(line, phoneme_pairs, bmp, mode))
 
     def create_reclist(
             self,
@@ -69,249 +192,812 @@ class Generator:
             max_length: int,
             sss_first: bool,
             iter_depth: int,
-            max_redu: int
-    ) -> dict[str, list[str]]:
-        self.reset()
+            max_redu: int,
+            policy: Literal["DEFAULT", "NO_IN_TURN"] = "DEFAULT",
+            jobs: int = 1,
+            previous_reclist: list[str] | None = None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None = None,
+            time_budget: float | None = None,
+            restarts: int = 1,
+            seed: int = 0
+    ) -> dict[str, list[tuple[str, str]]]:
+        """
+        Create a reclist. Parameters are the same as ``iter_reclist()``.
 
-    def create_oto(
+        :return: A reclist dictionary where keys are lines and values are lists of phoneme pairs for that line.
+        """
+        return dict(self.iter_reclist(
+            mode=mode,
+            max_length=max_length,
+            sss_first=sss_first,
+            iter_depth=iter_depth,
+            max_redu=max_redu,
+            policy=policy,
+            jobs=jobs,
+            previous_reclist=previous_reclist,
+            previous_syllable_map=previous_syllable_map,
+            time_budget=time_budget,
+            restarts=restarts,
+            seed=seed
+        ))
+
+    def iter_reclist(
             self,
-            audio_phoneme_map: dict[str, list[str]],
-            bmp: int
-    ) -> list[str]:
-        pass
-
-    def _cvvc_perfect_fluent(self, max_length: int, use_right_view: bool) -> dict[str, list[tuple[str, str]]]:
+            mode: Literal["CVVC", "VCV", "VCV_WITH_VC"],
+            max_length: int,
+            sss_first: bool,
+            iter_depth: int,
+            max_redu: int,
+            policy: Literal["DEFAULT", "NO_IN_TURN"] = "DEFAULT",
+            jobs: int = 1,
+            previous_reclist: list[str] | None = None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None = None,
+            time_budget: float | None = None,
+            restarts: int = 1,
+            seed: int = 0
+    ) -> Iterator[ReclistEntry]:
         """
-        Generate a perfectly smooth CVVC reclist.
+        Create a reclist as a stream, stage by stage.
 
+        :param mode: Generation mode, can be 'CVVC', 'VCV', or 'VCV_WITH_VC'. The VCV modes cover every transition with Eulerian trails (see ``core.vcv``); the CVVC parameters ``sss_first``, ``iter_depth``, ``max_redu``, ``policy``, ``jobs`` and ``time_budget`` do not apply to them.
         :param max_length: Maximum line length.
-        :param use_right_view: After initial generation, some phonemes may remain because they are insufficient to form a full line. If this flag is set, attempt again from the perspective of right phonemes.
-
-        :return: A reclist dictionary where keys are lines and values are lists of phoneme pairs for that line, i.e., {line: [(left, right)]}.
+        :param sss_first: Whether to use SSS mode (see readme.md for details).
+        :param iter_depth: Maximum number of iterations to search for smooth in-turn mode.
+        :param max_redu: Maximum redundancy the in-turn lines may add in total. The other stages are not limited by it; redundancy they add is still reported by ``summary()``.
+        :param policy: Policy for generation, either 'DEFAULT' or 'NO_IN_TURN'.
+        :param jobs: Number of worker processes for independent dictionary components, restarts and the in-turn search.
+        :param previous_reclist: Lines of a previous reclist. If given together with ``previous_syllable_map``, every line whose syllables are unchanged is kept first and in its original order, and the search only covers the remaining pairs.
+        :param previous_syllable_map: The syllable map the previous reclist was generated from.
+        :param time_budget: Seconds, counted from the start of the call, after which the in-turn search stops. The lines found before the deadline are kept; the other stages always run to completion. None searches without a limit.
+        :param restarts: CVVC mode only. The greedy stages depend on the dictionary order, so with ``restarts > 1`` the search runs on the original order and on ``restarts - 1`` shuffled orders, on ``jobs`` worker processes, and the best result by ``reclist_score()`` is kept. The result depends on ``seed`` but not on ``jobs``.
+        :param seed: Seed of the shuffled dictionary orders.
+
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        :raise ValueError: A previous reclist is given in a VCV mode.
         """
-        syl_map = self._syllable_view.get_syllable_map()
-        lr_to_syl = {phonemes: syl for syl, phonemes in syl_map.items()}
-        result = {}
-        line_num = 0
-
-        # TODO: Pop should not be used, but should be removed one by one based on the results.
-
-        if use_right_view:
-            primary_keys = self._pair_view.all_rights()
-            get_list = self._pair_view.get_lefts_for_right
-            pop_chunk = self._pair_view.pop_lefts_for_right
-        else:
-            primary_keys = self._pair_view.all_lefts()
-            get_list = self._pair_view.get_rights_for_left
-            pop_chunk = self._pair_view.pop_rights_for_left
-
-        for key in primary_keys:
-            while True:
-                items = get_list(key)
-                if len(items) < max_length:
-                    break
-                chunk = pop_chunk(key, max_length)
-                if not chunk:
-                    break
-
-                syllable_names = []
-                phoneme_pairs = []
-
-                if use_right_view:
-                    first_syl = lr_to_syl[(chunk[0], key)]
-                else:
-                    first_syl = lr_to_syl[(key, chunk[0])]
-                syllable_names.append(first_syl)
-                phoneme_pairs.append(("-", first_syl))
-
-                for item in chunk[1:]:
-                    if use_right_view:
-                        syl = lr_to_syl[(item, key)]
-                    else:
-                        syl = lr_to_syl[(key, item)]
-                    syllable_names.append(syl)
+        if mode != "CVVC" and previous_reclist is not None:
+            raise ValueError(f"Incremental regeneration is not supported in the '{mode}' mode.")
+
+        stats = self.stats
+        started_tracing = False
+        if stats is not None:
+            stats.clear()
+            if stats.trace_memory and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+        try:
+            start = time.perf_counter()
+            deadline = start + time_budget if time_budget is not None else None
+            self.reset()
+            if stats is not None:
+                stats.stages["reset"] = StageStats(seconds=time.perf_counter() - start)
+
+            components = self._index.components() \
+                if mode == "CVVC" and restarts <= 1 and previous_reclist is None else []
+            if mode != "CVVC":
+                yield from self._stage("vcv_cover", self._vcv_cover(max_length, mode == "VCV_WITH_VC"))
+            elif restarts > 1:
+                yield from self._stage("restarts", self._cvvc_restarts(
+                    restarts, seed, max_length, sss_first, iter_depth, max_redu, policy, jobs, deadline,
+                    previous_reclist, previous_syllable_map))
+            elif len(components) > 1:
+                yield from self._stage("components", self._cvvc_components(
+                    components, max_length, sss_first, iter_depth, max_redu, policy, jobs, deadline))
+            else:
+                if previous_reclist is not None and previous_syllable_map is not None:
+                    yield from self._stage("keep_previous", self._keep_previous(
+                        previous_reclist, previous_syllable_map))
+                if sss_first:
+                    yield from self._stage("sss_first", self._cvvc_sss_first(max_length))
+                yield from self._stage("perfect_fluent", self._cvvc_perfect_fluent(max_length))
+                if policy != "NO_IN_TURN":
+                    patterns = self._create_pattern(iter_depth, max_length)
+                    executor = ProcessPoolExecutor(max_workers=jobs, initializer=init_in_turn_worker,
+                                                   initargs=(self._index,)) if jobs > 1 else None
+                    try:
+                        for use_right_view in (False, True):
+                            name = "in_turn_fluent_right" if use_right_view else "in_turn_fluent_left"
+                            yield from self._stage(name, self._cvvc_in_turn_fluent(
+                                patterns, max_length, use_right_view, max_redu, deadline, executor, jobs))
+                    finally:
+                        if executor is not None:
+                            executor.shutdown(cancel_futures=True)
+                yield from self._stage("not_fluent", self._cvvc_not_fluent(max_length))
+
+            if stats is not None:
+                stats.result = self.summary()
+        finally:
+            if started_tracing:
+                tracemalloc.stop()
+
+    def summary(self) -> dict[str, int]:
+        """
+        Get the counters of the last run.
 
-                    if use_right_view:
-                        phoneme_pairs.append((key, item))
-                    else:
-                        phoneme_pairs.append((item, key))
+        :return: Line counts per fluency class, redundancy, the perfect-fluent packing bound, the units that are still uncovered, the in-turn search coverage, in VCV modes the line count and its lower bound, and the restart whose result was kept.
+        """
+        return {
+            "lines": self._kept_num + self._sss_num + self._perfect_fluent_num + self._in_turn_fluent_num + self._not_fluent_num
+            + self._vcv_num,
+            "kept": self._kept_num,
+            "sss": self._sss_num,
+            "perfect_fluent": self._perfect_fluent_num,
+            "in_turn_fluent": self._in_turn_fluent_num,
+            "not_fluent": self._not_fluent_num,
+            "redundancy": self._redu,
+            "perfect_fluent_upper_bound": self._packing_report.upper_bound,
+            "perfect_fluent_gap": self._packing_report.upper_bound - self._perfect_fluent_num,
+            "unused_as_start": len(self._syl_unused_as_start),
+            "unused_as_nonstart": len(self._syl_unused_as_nonstart),
+            "unused_as_end": len(self._right_unused_as_end),
+            "in_turn_patterns": self._search_patterns,
+            "in_turn_patterns_covered": self._search_covered,
+            "in_turn_timed_out": int(self._search_timed_out),
+            "vcv": self._vcv_num,
+            "vcv_lower_bound": self._vcv_lower_bound,
+            "best_restart": self._best_restart,
+        }
+
+    def _stage(self, name: str, stage: Iterator[ReclistEntry]) -> Iterator[ReclistEntry]:
+        """
+        Attach instrumentation to a stage if stats are enabled.
 
-                    phoneme_pairs.append((syl, ""))
+        :param name: Stage name.
+        :param stage: Stage iterator.
+        :return: The stage iterator, measured or not.
+        """
+        return self.stats.wrap(name, stage) if self.stats is not None else stage
 
-                self._syl_unused_as_start.remove(syllable_names[0])
-                for syl in syllable_names[1:]:
-                    self._syl_unused_as_nonstart.remove(syl)
+    def create_oto(
+            self,
+            audio_phoneme_map: dict[str, list[tuple[str, str]]],
+            bmp: int,
+            mode: Literal["CVVC", "VCV", "VCV_WITH_VC"] = "CVVC"
+    ) -> list[str]:
+        """
+        Create the oto.ini template for a reclist.
 
-                if use_right_view:
-                    last_right = key
-                else:
-                    last_right = chunk[-1]
-                phoneme_pairs.append((last_right, "-"))
+        :param audio_phoneme_map: A reclist dictionary from ``create_reclist()``.
+        :param bmp: Tempo (BPM) for recording guidance BGM.
+        :param mode: The mode the reclist was created in.
 
-                last_syl = syllable_names[-1]
-                self._right_unused_as_end.remove(syl_map[last_syl][1])
+        :return: oto.ini template lines.
+        """
+        text = build_oto(audio_phoneme_map.items(), bmp, mode)
+        return text.split("\n") if text else []
 
-                key_str = "_".join(syllable_names)
-                result[key_str] = phoneme_pairs
-                line_num += 1
+    def _keep_previous(
+            self,
+            previous_reclist: list[str],
+            previous_syllable_map: dict[str, tuple[str, str]]
+    ) -> Iterator[ReclistEntry]:
+        """
+        Re-commit the lines of a previous reclist that are still valid for the current syllable map.
 
-        self._perfect_fluent_num += line_num
-        return result
+        A line is valid if all its syllables still exist with the same left and right phonemes.
 
-    def _create_pattern(self, p: int, m: int) -> list[tuple[list[int], int]]:
-        """
-        Generate all possible integer sequence patterns.
+        :param previous_reclist: Lines of the previous reclist.
+        :param previous_syllable_map: The syllable map the previous reclist was generated from.
 
-        :param p: Maximum sequence length (inclusive).
-        :param m: Divisor condition for filtering valid lengths r.
-        :return: A list of tuples (sequence, num_labels), where sequence is a list of integers of length r, and num_labels is the number of distinct integers in the sequence (i.e., max_label + 1, at least 2). The list is sorted in ascending order of num_labels.
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
         """
-        patterns: list[tuple[list[int], int]] = []
-        for r in range(2, p + 1):
-            if m % r != 0:
+        syl_map = self._index.syllable_map
+        for line in previous_reclist:
+            syllable_names = split_line(line, previous_syllable_map)
+            if syllable_names is None:
                 continue
+            if any(syl_map.get(syl) != previous_syllable_map[syl] for syl in syllable_names):
+                continue
+            self._kept_num += 1
+            yield self._commit_line(syllable_names)
 
-            def backtrack(labels: list[int], max_label: int):
-                if len(labels) == r:
-                    if max_label >= 1:
-                        patterns.append((labels[:], max_label + 1))
-                    return
-                for label in range(max_label + 1):
-                    labels.append(label)
-                    backtrack(labels, max_label)
-                    labels.pop()
-                labels.append(max_label + 1)
-                backtrack(labels, max_label + 1)
-                labels.pop()
-
-            backtrack([0], 0)
-
-        patterns.sort(key=lambda x: x[1])
-        return patterns
+    def _cvvc_components(
+            self,
+            components: list[tuple[int, ...]],
+            max_length: int,
+            sss_first: bool,
+            iter_depth: int,
+            max_redu: int,
+            policy: Literal["DEFAULT", "NO_IN_TURN"],
+            jobs: int,
+            deadline: float | None
+    ) -> Iterator[ReclistEntry]:
+        """
+        Generate each connected component of the dictionary (see ``SyllableIndex.components()``) on its own.
 
-    def _cvvc_in_turn_fluent(self, pattrens: list[tuple[list[int], int]], max_length: int, use_right_view: bool) -> dict[str, list[tuple[str, str]]]:
-        syl_map = self._syllable_view.get_syllable_map()
-        lr_to_syl = {phonemes: syl for syl, phonemes in syl_map.items()}
-        result: dict[str, list[tuple[str, str]]] = {}
-        line_num = 0
+        Components share no phoneme, so the CVVC stages of one component never touch another, and the search cost
+        depends on the largest component instead of the whole dictionary. Each component gets a share of
+        ``max_redu`` proportional to its syllable count. With ``jobs > 1`` the components are
+        solved in a process pool, one component per task. Either way their lines are committed in component
+        order, each component's lines in its own stage order, so the result does not depend on ``jobs``.
 
-        if use_right_view:
-            get_all_phonemes = self._pair_view.all_rights
-            get_list = self._pair_view.get_lefts_for_right
-        else:
-            get_all_phonemes = self._pair_view.all_lefts
-            get_list = self._pair_view.get_rights_for_left
+        :param components: Syllable IDs per component.
+        :param max_length: Maximum line length.
+        :param sss_first: Whether to use SSS mode.
+        :param iter_depth: Maximum number of iterations to search for smooth in-turn mode.
+        :param max_redu: Maximum redundancy allowed for constructing smooth in-turn sequences.
+        :param policy: Policy for generation.
+        :param jobs: Number of worker processes.
+        :param deadline: ``time.perf_counter()`` value at which the in-turn search of every component stops, or
+            None to search everything.
 
-        for pattren in pattrens:
-            all_phonemes = get_all_phonemes()
-            pattern_len = len(pattren[0])
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        syl_map = self._index.syllable_map
+        name_of = self._index.syllable_table.name_of
+        maps = [{name_of(syl_id): syl_map[name_of(syl_id)] for syl_id in ids} for ids in components]
+        if self.stats is not None:
+            self.stats.count("components.count", len(maps))
+            self.stats.count("components.largest", max(map(len, maps)))
+
+        # Split the redundancy budget by component size, so that the whole run stays within max_redu.
+        total = len(self._index)
+        args = [(max_length, sss_first, iter_depth, max_redu * len(ids) // total, policy) for ids in components]
+        executor = ProcessPoolExecutor(max_workers=min(jobs, len(maps))) if jobs > 1 else None
+        try:
+            for lines, summary, stats in self._solve_all(maps, args, deadline, executor):
+                if self.stats is not None:
+                    self.stats.merge(stats, "components")
+                yield from self._commit_solved(lines, summary)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def _cvvc_restarts(
+            self,
+            restarts: int,
+            seed: int,
+            max_length: int,
+            sss_first: bool,
+            iter_depth: int,
+            max_redu: int,
+            policy: Literal["DEFAULT", "NO_IN_TURN"],
+            jobs: int,
+            deadline: float | None,
+            previous_reclist: list[str] | None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None
+    ) -> Iterator[ReclistEntry]:
+        """
+        Search several dictionary orders (see ``shuffled_syllable_map()``) and commit the best result by
+        ``reclist_score()``. Ties go to the lower restart number, so the result does not depend on ``jobs``.
 
-            # TODO: Use while to manually process the index, as the contents of the iterating container will be deleted inside the loop.
-            for i in range(len(all_phonemes) - pattern_len + 1):
-                phonemes = all_phonemes[i:i + pattern_len]
+        :param restarts: Number of orders to search, the original order included.
+        :param seed: Seed of the shuffled orders.
+        :param max_length: Maximum line length.
+        :param sss_first: Whether to use SSS mode.
+        :param iter_depth: Maximum number of iterations to search for smooth in-turn mode.
+        :param max_redu: Maximum redundancy allowed for constructing smooth in-turn sequences.
+        :param policy: Policy for generation.
+        :param jobs: Number of worker processes.
+        :param deadline: ``time.perf_counter()`` value at which the in-turn search of every restart stops, or None
+            to search everything.
+        :param previous_reclist: Lines of a previous reclist to keep, passed to every restart.
+        :param previous_syllable_map: The syllable map the previous reclist was generated from.
+
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        syl_map = self._index.syllable_map
+        maps = [shuffled_syllable_map(syl_map, seed, restart) for restart in range(restarts)]
+        executor = ProcessPoolExecutor(max_workers=min(jobs, restarts)) if jobs > 1 else None
+        try:
+            best = None
+            results = self._solve_all(maps, [(max_length, sss_first, iter_depth, max_redu, policy)] * restarts,
+                                      deadline, executor, previous_reclist, previous_syllable_map)
+            for restart, (lines, summary, stats) in enumerate(results):
+                if self.stats is not None:
+                    self.stats.merge(stats, "restarts")
+                score = reclist_score(summary)
+                if best is None or score < best[0]:
+                    best = (score, restart, lines, summary)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        _, self._best_restart, lines, summary = best
+        if self.stats is not None:
+            self.stats.count("restarts.count", restarts)
+            self.stats.count("restarts.best", self._best_restart)
+        yield from self._commit_solved(lines, summary)
+
+    def _solve_all(
+            self,
+            maps: list[dict[str, tuple[str, str]]],
+            args: list[tuple],
+            deadline: float | None,
+            executor: ProcessPoolExecutor | None,
+            previous_reclist: list[str] | None = None,
+            previous_syllable_map: dict[str, tuple[str, str]] | None = None
+    ) -> Iterator[tuple[list[list[str]], dict[str, int], GenerationStats | None]]:
+        """
+        Run ``solve_cvvc()`` on several syllable maps, on the executor if given, and yield the results in order.
+        With stats enabled, every sub-run is measured on its own, to be merged into this run's stats.
 
-                # TODO: Inline nested functions.
+        :param maps: Syllable maps to solve.
+        :param args: ``max_length``, ``sss_first``, ``iter_depth``, ``max_redu`` and ``policy`` of every map.
+        :param deadline: ``time.perf_counter()`` value at which every in-turn search stops, or None.
+        :param executor: Process pool, or None to solve one map after the other in this process.
+        :param previous_reclist: Lines of a previous reclist to keep.
+        :param previous_syllable_map: The syllable map the previous reclist was generated from.
 
-                def _build_by_phonemes(phonemes, pattern_len) -> tuple[bool, dict[str, list[tuple[str, str]]]]:
-                    line_result: dict[str, list[tuple[str, str]]] = {}
+        :return: An iterator of ``solve_cvvc()`` results.
+        """
+        def budget() -> float | None:
+            return max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+
+        def sub_stats() -> GenerationStats | None:
+            return GenerationStats(self.stats.trace_memory) if self.stats is not None else None
+
+        if executor is not None:
+            futures = [executor.submit(solve_cvvc, syllable_map, *map_args, budget(), None,
+                                       previous_reclist, previous_syllable_map, sub_stats())
+                       for syllable_map, map_args in zip(maps, args)]
+            return (future.result() for future in futures)
+        return (solve_cvvc(syllable_map, *map_args, budget(), self._pattern_table,
+                           previous_reclist, previous_syllable_map, sub_stats())
+                for syllable_map, map_args in zip(maps, args))
+
+    def _commit_solved(self, lines: list[list[str]], summary: dict[str, int]) -> Iterator[ReclistEntry]:
+        """
+        Commit the lines of a ``solve_cvvc()`` result and add its summary counters to this run. The caller merges
+        the sub-run's ``GenerationStats``.
 
-                    if len(phonemes) < pattern_len:
-                        return (False, {})
+        :param lines: Syllables of every line, in commit order.
+        :param summary: ``Generator.summary()`` of the solved run.
 
-                    # TODO: Remove unnecessary rotations.
-                    for offset in range(pattern_len):
-                        phonemes_pattren: list[str] = []
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        for syllable_names in lines:
+            yield self._commit_line(syllable_names)
+        self._kept_num += summary["kept"]
+        self._sss_num += summary["sss"]
+        self._perfect_fluent_num += summary["perfect_fluent"]
+        self._in_turn_fluent_num += summary["in_turn_fluent"]
+        self._not_fluent_num += summary["not_fluent"]
+        self._packing_report.upper_bound += summary["perfect_fluent_upper_bound"]
+        self._search_patterns += summary["in_turn_patterns"]
+        self._search_covered += summary["in_turn_patterns_covered"]
+        self._search_timed_out |= bool(summary["in_turn_timed_out"])
+
+    def _vcv_cover(self, max_length: int, with_vc: bool) -> Iterator[ReclistEntry]:
+        """
+        Generate a VCV reclist that records every "R S" transition, see ``cover_transitions()``.
 
-                        for label in pattren[0]:
-                            index = (label + offset) % pattern_len
-                            phonemes_pattren.append(phonemes[index])
+        Transitions and starts the cover records a second time are counted as redundancy. The VCs recorded in
+        'VCV_WITH_VC' mode are not, since every VC comes with many VCVs.
 
-                        phonemes_pattren = phonemes_pattren * \
-                            (max_length // pattern_len)
+        :param max_length: Maximum line length.
+        :param with_vc: Whether to record the VC of every transition as well ('VCV_WITH_VC' mode).
 
-                        syllable_names = []
-                        phoneme_pairs = []
-                        available: dict[str, list[str]] = {}
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        index = self._index
+        cover = cover_transitions(index, max_length)
+        self._vcv_lower_bound = cover.lower_bound
+        self._redu += cover.repeated_transitions + cover.repeated_starts
+        if self.stats is not None:
+            self.stats.count("vcv.lower_bound", cover.lower_bound)
+            self.stats.count("vcv.repeated_transitions", cover.repeated_transitions)
+            self.stats.count("vcv.repeated_starts", cover.repeated_starts)
+
+        # Names by syllable ID, looked up once: a cover has |R| |S| transitions.
+        syllable_names_of = [index.syllable_table.name_of(syl_id) for syl_id in range(len(index.syllable_table))]
+        pairs = [index.pair_of(syl_id) for syl_id in range(len(index.syllable_table))]
+        left_of = [index.left_table.name_of(left_id) for left_id, _ in pairs]
+        right_of = [index.right_table.name_of(right_id) for _, right_id in pairs]
+        for syl_ids in cover.lines:
+            syllable_names = [syllable_names_of[syl_id] for syl_id in syl_ids]
+            self._syl_unused_as_start.discard(syllable_names[0])
+            self._syl_unused_as_nonstart.difference_update(syllable_names[1:])
+
+            phoneme_pairs = [("-", syllable_names[0])]
+            prev_right = right_of[syl_ids[0]]
+            for syl_id, syl in zip(syl_ids[1:], syllable_names[1:]):
+                phoneme_pairs.append((prev_right, syl))
+                if with_vc:
+                    phoneme_pairs.append((prev_right, left_of[syl_id]))
+                prev_right = right_of[syl_id]
+            phoneme_pairs.append((prev_right, "-"))
+            self._right_unused_as_end.discard(prev_right)
+
+            self._vcv_num += 1
+            yield ("_".join(syllable_names), phoneme_pairs)
+
+    def _cvvc_sss_first(self, max_length: int) -> Iterator[ReclistEntry]:
+        """
+        Generate the SSS lines such as ``da_da_da``: one per right phoneme that no line ends in yet, whose third
+        syllable can be stretched into the long vowel of that right phoneme.
 
-                        first = True
+        Repeating a syllable records its own VC, so each line also covers the start, CV, VC and end of its
+        syllable. For every right phoneme the syllable is taken from the uncombined pairs, choosing the left
+        phoneme with the fewest uncombined pairs, since those pairs are the hardest for the fluent stages to pack.
+        All syllables are chosen before the first line is committed with ``_commit_line()``, so the choice does not
+        depend on the order of the right phonemes.
 
-                        for p in phonemes_pattren:
+        :param max_length: Maximum line length; lines are shortened to ``da_da`` if it is 2.
 
-                            if first:
-                                first = False
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        index = self._index
+        view = self._pair_view
+        rights = index.right_table
+        syllables = index.syllable_table
+        repeat = min(3, max_length)
+
+        chosen: list[int] = []
+        for right in self._right_unused_as_end:
+            right_id = rights.id_of(right)
+            left_ids = view.left_ids_for_right(right_id)
+            if left_ids:
+                left_id = min(left_ids, key=lambda l: (len(view.right_ids_for_left(l)), l))
+                chosen.append(index.syllable_id_for(left_id, right_id))
+            else:
+                chosen.append(index.syllables_for_right(right_id)[0])
+        chosen.sort()
+
+        for syl_id in chosen:
+            self._sss_num += 1
+            yield self._commit_line([syllables.name_of(syl_id)] * repeat)
+
+    def _cvvc_perfect_fluent(self, max_length: int) -> Iterator[ReclistEntry]:
+        """
+        Generate a perfectly smooth CVVC reclist.
 
-                                if p not in available.keys():
-                                    if get_list(p):
-                                        available[p] = get_list(p)
-                                    else:
-                                        all_phonemes.remove(p)
-                                        return (False, {})
+        Lines from the left view (same left phoneme) and from the right view (same right phoneme) are packed
+        together by ``pack_perfect_fluent``, so pairs are not claimed by whichever view happens to run first.
+        A line of ``max_length`` syllables records ``max_length - 1`` VCs, so each star gets ``max_length - 1``
+        pairs plus one free syllable sharing its key: a tail for a left-view line, a head for a right-view line
+        (see ``StarLine``). The free syllable is chosen to cover an unused end or start if possible. The packing
+        report is kept in ``self._packing_report``.
 
-                                partner = available[p][0]
-                                available[p].pop()
+        :param max_length: Maximum line length.
 
-                                if use_right_view:
-                                    first_syl = lr_to_syl[(partner, p)]
-                                else:
-                                    first_syl = lr_to_syl[(p, partner)]
+        :return: An iterator of committed reclist entries (line, phoneme pairs), i.e., (line, [(left, right)]).
+        """
+        index = self._index
+        syllables = index.syllable_table
+        state = self._line_state({})
+        report = pack_perfect_fluent(
+            self._pair_view.pair_ids(), len(index.left_table), len(index.right_table), max_length - 1)
+        self._packing_report = report
+
+        for line in report.lines:
+            if line.use_right_view:
+                syl_ids = [index.syllable_id_for(partner, line.key) for partner in line.partners]
+                head = free_syllable(index, state, index.syllables_for_right(line.key), syl_ids, use_as_start=True)
+                syl_ids.insert(0, head)
+            else:
+                syl_ids = [index.syllable_id_for(line.key, partner) for partner in line.partners]
+                first = next((n for n, syl_id in enumerate(syl_ids)
+                              if syllables.name_of(syl_id) in self._syl_unused_as_start), 0)
+                syl_ids.insert(0, syl_ids.pop(first))
+                syl_ids.append(free_syllable(index, state, index.syllables_for_left(line.key), syl_ids,
+                                             use_as_start=False))
+
+            self._perfect_fluent_num += 1
+            yield self._commit_line([syllables.name_of(syl_id) for syl_id in syl_ids])
+
+    def _line_state(self, partners: dict[int, Collection[int]]) -> LineState:
+        """
+        Get the live state the in-turn line builder reads.
 
-                                syllable_names.append(first_syl)
-                                phoneme_pairs.append(("-", first_syl))
-                                continue
+        :param partners: Uncombined partner IDs of the key phonemes that lines are built for.
+        :return: The state, reading the unused sets of this generator.
+        """
+        index = self._index
+        return LineState(partners, _NamedIds(index.syllable_table, self._syl_unused_as_start),
+                         _NamedIds(index.syllable_table, self._syl_unused_as_nonstart),
+                         _NamedIds(index.right_table, self._right_unused_as_end))
 
-                            partners = available[p]
+    def _line_snapshot(self, keys: tuple[int, ...], use_right_view: bool) -> LineState:
+        """
+        Copy the part of the live state that lines on the given key phonemes can read, for a process pool.
 
-                            if not partners:
-                                return (False, {})
+        :param keys: Key phoneme IDs.
+        :param use_right_view: Whether the key phonemes are right phonemes.
+        :return: The state, restricted to the syllables that share a key phoneme.
+        """
+        index = self._index
+        syllables = index.syllable_table
+        rights = index.right_table
+        if use_right_view:
+            partner_ids, syllables_for = self._pair_view.left_ids_for_right, index.syllables_for_right
+        else:
+            partner_ids, syllables_for = self._pair_view.right_ids_for_left, index.syllables_for_left
+        relevant = {syl_id for key in keys for syl_id in syllables_for(key)}
+        ends = {index.pair_of(syl_id)[1] for syl_id in relevant}
+        return LineState(
+            {key: tuple(partner_ids(key)) for key in keys},
+            frozenset(syl_id for syl_id in relevant if syllables.name_of(syl_id) in self._syl_unused_as_start),
+            frozenset(syl_id for syl_id in relevant if syllables.name_of(syl_id) in self._syl_unused_as_nonstart),
+            frozenset(right_id for right_id in ends if rights.name_of(right_id) in self._right_unused_as_end))
+
+    def _line_pairs(self, syllable_names: list[str]) -> list[tuple[str, str]]:
+        """
+        Build the phoneme pairs recorded by a line.
 
-                            partner = partners[0]
-                            available[p].pop()
+        :param syllable_names: Syllables of the line, in order.
+        :return: [("-", first syllable), (previous right, left), (syllable, ""), ..., (last right, "-")].
+        """
+        syl_map = self._index.syllable_map
+        phoneme_pairs = [("-", syllable_names[0])]
+        prev_right = syl_map[syllable_names[0]][1]
+        for syl in syllable_names[1:]:
+            left, right = syl_map[syl]
+            phoneme_pairs.append((prev_right, left))
+            phoneme_pairs.append((syl, ""))
+            prev_right = right
+        phoneme_pairs.append((prev_right, "-"))
+        return phoneme_pairs
+
+    def _commit_line(self, syllable_names: list[str]) -> ReclistEntry:
+        """
+        Mark the starts, non-starts, VCs and end of a line as used and build its reclist entry.
 
-                            if use_right_view:
-                                syl = lr_to_syl[(partner, p)]
-                            else:
-                                syl = lr_to_syl[(p, partner)]
-                            syllable_names.append(syl)
+        The VCs are the ones ``SyllableIndex.line_vcs()`` says the line records, so the uncombined pairs left in the
+        view are exactly the VC units ``CoverageValidator`` would report missing. Syllables that were already
+        recorded as non-start are counted as redundancy.
 
-                            if use_right_view:
-                                phoneme_pairs.append((p, partner))
-                            else:
-                                phoneme_pairs.append((partner, p))
+        :param syllable_names: Syllables of the line, in order.
+        :return: A pair (line, phoneme pairs).
+        """
+        id_of = self._index.syllable_table.id_of
+        for left_id, right_id in self._index.line_vcs([id_of(syl) for syl in syllable_names]):
+            self._pair_view.remove_pair_ids(left_id, right_id)
+
+        self._syl_unused_as_start.discard(syllable_names[0])
+        for syl in syllable_names[1:]:
+            if syl in self._syl_unused_as_nonstart:
+                self._syl_unused_as_nonstart.remove(syl)
+            else:
+                self._redu += 1
+
+        phoneme_pairs = self._line_pairs(syllable_names)
+        self._right_unused_as_end.discard(phoneme_pairs[-1][0])
+        return ("_".join(syllable_names), phoneme_pairs)
+
+    def _create_pattern(self, p: int, m: int) -> tuple[Pattern, ...]:
+        """
+        Get all possible integer sequence patterns from the pattern table.
 
-                            phoneme_pairs.append((syl, ""))
+        :param p: Maximum sequence length (inclusive).
+        :param m: Divisor condition for filtering valid lengths r.
+        :return: A tuple of (sequence, num_labels), where sequence is a tuple of integers of length r, and num_labels is the number of distinct integers in the sequence (i.e., max_label + 1, at least 2). The tuple is sorted in ascending order of num_labels.
+        """
+        return self._pattern_table.get(p, m)
 
-                        if len(syllable_names) == max_length:
-                            self._syl_unused_as_start.remove(syllable_names[0])
+    def _cvvc_in_turn_fluent(
+            self,
+            pattrens: tuple[Pattern, ...],
+            max_length: int,
+            use_right_view: bool,
+            max_redu: int,
+            deadline: float | None = None,
+            executor: ProcessPoolExecutor | None = None,
+            jobs: int = 1
+    ) -> Iterator[ReclistEntry]:
+        """
+        Generate in-turn smooth CVVC lines.
+
+        For every pattern, lines are built as long as some set of key phonemes can fill it. The pair view keeps
+        its phonemes in buckets by partner count (see ``RLPairView.top_left_ids()``), so the ``2 * num_labels``
+        phonemes with the most uncombined partners are read off without scanning. Their ``num_labels``-subsets are
+        tried by a cheap heuristic score, the most partners in total first, and ``window_slack()`` bounds each
+        subset before a line is built: a subset whose counts cannot cover the pattern is pruned. The label that
+        needs the most partners goes to the phoneme with the most partners. A line records one VC per
+        neighbouring syllables (see ``line_slots()``), so every pair it claims is carried by the syllable next to
+        the VC, and ``build_in_turn_line()`` matches the partners to the slots so that such a syllable exists. The
+        first subset that yields a line is committed, and the subsets are read off again. A line that would push
+        the redundancy added by in-turn lines of this run past ``max_redu`` is rejected like a subset that cannot
+        be matched.
+
+        With an ``executor`` the lines of all subsets that survive the bound are built on the process pool against
+        a snapshot of the view (see ``_build_in_turn_lines()``), and the first that is accepted, in the same subset
+        order, is committed. Nothing is committed between the builds of a round, so the result is identical to the
+        serial search.
+
+        With a ``deadline`` the search is anytime: the stage stops as soon as the deadline passes, and the lines
+        committed so far stay committed. The patterns finished are counted in ``summary()``.
+
+        :param pattrens: Patterns from ``_create_pattern()``.
+        :param max_length: Maximum line length.
+        :param use_right_view: Use right phonemes as the key phonemes of the pattern instead of left phonemes.
+        :param max_redu: Maximum redundancy the in-turn lines of this run may add, both views together.
+        :param deadline: ``time.perf_counter()`` value at which to stop, or None to search everything.
+        :param executor: Process pool whose workers ran ``init_in_turn_worker()`` with this generator's index, or
+            None to build every line in this process.
+        :param jobs: Number of workers of the pool.
+
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        view = self._pair_view
+        index = self._index
+        syllables = index.syllable_table
+        if use_right_view:
+            top_ids = view.top_right_ids
+            partner_ids = view.left_ids_for_right
+        else:
+            top_ids = view.top_left_ids
+            partner_ids = view.right_ids_for_left
+
+        tried = accepted = pruned = 0
+        try:
+            for pattern_index, (labels, num_labels) in enumerate(pattrens):
+                if deadline is not None and time.perf_counter() >= deadline:
+                    self._search_timed_out = True
+                    self._search_patterns += len(pattrens) - pattern_index
+                    return
+                self._search_patterns += 1
+
+                slots = line_slots(labels, max_length, use_right_view)
+                needs = label_needs(slots, num_labels)
+                # Labels by need, largest first, to line up with the phonemes of each subset.
+                by_need = sorted(range(num_labels), key=lambda label: (-needs[label], label))
+                while True:
+                    pool = top_ids(2 * num_labels)
+                    counts = {key: len(partner_ids(key)) for key in pool}
+                    subsets = sorted(combinations(pool, num_labels), key=lambda keys: -sum(map(counts.get, keys)))
+                    # Key phonemes of every label per subset, or None if the subset is pruned.
+                    key_sets: list[list[int] | None] = []
+                    for keys in subsets:
+                        if window_slack(needs, [counts[key] for key in keys]) < 0:
+                            key_sets.append(None)
+                            continue
+                        assigned = [0] * num_labels
+                        for label, key in zip(by_need, sorted(keys, key=lambda key: -counts[key])):
+                            assigned[label] = key
+                        key_sets.append(assigned)
+                    feasible = [keys for keys in key_sets if keys is not None]
+                    if executor is not None and len(feasible) > 1:
+                        built = self._build_in_turn_lines(executor, jobs, slots, feasible, pool, use_right_view)
+                    else:
+                        state = self._line_state({key: partner_ids(key) for key in pool})
+                        built = (build_in_turn_line(index, state, slots, keys, use_right_view) for keys in feasible)
+
+                    syl_ids = None
+                    try:
+                        for keys in key_sets:
+                            if deadline is not None and time.perf_counter() >= deadline:
+                                self._search_timed_out = True
+                                self._search_patterns += len(pattrens) - pattern_index - 1
+                                return
+                            if keys is None:
+                                pruned += 1
+                                continue
+                            tried += 1
+                            syl_ids = next(built)
+                            if syl_ids is not None:
+                                redu = self._line_redundancy(syl_ids)
+                                if self._in_turn_redu + redu <= max_redu:
+                                    break
+                                syl_ids = None
+                    finally:
+                        built.close()
+                    if syl_ids is None:
+                        break
+
+                    accepted += 1
+                    self._in_turn_fluent_num += 1
+                    self._in_turn_redu += redu
+                    yield self._commit_line([syllables.name_of(syl_id) for syl_id in syl_ids])
+                self._search_covered += 1
+        finally:
+            if self.stats is not None:
+                self.stats.count("in_turn.candidates_tried", tried)
+                self.stats.count("in_turn.candidates_accepted", accepted)
+                self.stats.count("in_turn.candidates_pruned", pruned)
+
+    def _build_in_turn_lines(
+            self,
+            executor: ProcessPoolExecutor,
+            jobs: int,
+            slots: list[tuple[int, int]],
+            key_sets: list[list[int]],
+            pool: tuple[int, ...],
+            use_right_view: bool
+    ) -> Iterator[list[int] | None]:
+        """
+        Build the in-turn lines of several key phoneme assignments on a process pool.
 
-                            for syl in syllable_names[1:]:
-                                self._syl_unused_as_nonstart.remove(syl)
+        Every worker builds against the same snapshot of the pair view and the unused sets, taken before any of
+        the lines is committed, so each line is the one ``build_in_turn_line()`` returns in this process. The
+        lines are yielded in order as their chunk finishes, and the chunks not yet started are cancelled when the
+        caller stops early.
 
-                            if use_right_view:
-                                last_right = phonemes_pattren[-1]
-                            else:
-                                last_right = phoneme_pairs[-1][1]
-                            phoneme_pairs.append((last_right, "-"))
+        :param executor: Process pool whose workers ran ``init_in_turn_worker()`` with this generator's index.
+        :param jobs: Number of workers of the pool; the assignments are split into as many chunks.
+        :param slots: Result of ``line_slots()``.
+        :param key_sets: Key phoneme ID of every label, per assignment.
+        :param pool: Key phonemes the assignments are drawn from.
+        :param use_right_view: Whether the key phonemes are right phonemes.
 
-                            self._right_unused_as_end.remove(last_right)
+        :return: An iterator of the line, or None, of every assignment.
+        """
+        state = self._line_snapshot(pool, use_right_view)
+        size = -(-len(key_sets) // jobs)
+        futures = [executor.submit(build_in_turn_chunk, state, slots, key_sets[i:i + size], use_right_view)
+                   for i in range(0, len(key_sets), size)]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def _line_redundancy(self, syl_ids: list[int]) -> int:
+        """
+        Count the redundancy ``_commit_line()`` would add for a line: its non-start syllables that are already
+        recorded at a non-start position, by an earlier line or earlier in this one.
 
-                            reclist_line_str = "_".join(syllable_names)
-                            line_result[reclist_line_str] = phoneme_pairs
+        :param syl_ids: Syllable IDs of the line.
+        :return: Redundancy of the line.
+        """
+        name_of = self._index.syllable_table.name_of
+        seen: set[int] = set()
+        redu = 0
+        for syl_id in syl_ids[1:]:
+            if syl_id in seen or name_of(syl_id) not in self._syl_unused_as_nonstart:
+                redu += 1
+            seen.add(syl_id)
+        return redu
+
+    def _cvvc_not_fluent(self, max_length: int) -> Iterator[ReclistEntry]:
+        """
+        Cover everything the fluent stages left over with as few lines as possible, see ``pack_not_fluent()``.
 
-                            for left, right in phoneme_pairs:
-                                if left != "-" and right != "-":
-                                    if right != "":
-                                        self._pair_view.remove_pair(
-                                            left, right)
-                            return (True, line_result)
-                        else:
-                            return (False, {})
-                    return (False, {})
+        The leftovers are the uncombined pairs, the syllables not yet recorded at a non-start position, and the
+        unused starts and ends. The packed lines record every uncombined pair, so once this stage has run the pair
+        view is empty and ``CoverageValidator`` reports no missing unit.
 
-                success, line_result = _build_by_phonemes(
-                    phonemes, pattern_len)
-                if success:
-                    line_num += 1
-                    result.update(line_result)
+        :param max_length: Maximum line length.
 
-    def _cvvc_not_fluent(self, max_length: int) -> dict[str, list[tuple[str, str]]]:
-        pass
+        :return: An iterator of committed reclist entries (line, phoneme pairs).
+        """
+        index = self._index
+        syllables = index.syllable_table
+        body = sorted(syllables.id_of(syl) for syl in self._syl_unused_as_nonstart)
+        starts = sorted(syllables.id_of(syl) for syl in self._syl_unused_as_start)
+        ends = sorted(index.right_table.id_of(right) for right in self._right_unused_as_end)
+
+        for syl_ids in pack_not_fluent(index, self._pair_view.pair_ids(), body, starts, ends, max_length):
+            self._not_fluent_num += 1
+            yield self._commit_line([syllables.name_of(syl_id) for syl_id in syl_ids])
+
+
+def solve_cvvc(
+        syllable_map: dict[str, tuple[str, str]],
+        max_length: int,
+        sss_first: bool,
+        iter_depth: int,
+        max_redu: int,
+        policy: Literal["DEFAULT", "NO_IN_TURN"],
+        time_budget: float | None,
+        pattern_table: PatternTable | None = None,
+        previous_reclist: list[str] | None = None,
+        previous_syllable_map: dict[str, tuple[str, str]] | None = None,
+        stats: GenerationStats | None = None
+) -> tuple[list[list[str]], dict[str, int], GenerationStats | None]:
+    """
+    Generate a CVVC reclist for one connected component or one restart, e.g. in a pool worker.
+
+    :param syllable_map: Syllable mapping table of the component.
+    :param max_length: Maximum line length.
+    :param sss_first: Whether to use SSS mode.
+    :param iter_depth: Maximum number of iterations to search for smooth in-turn mode.
+    :param max_redu: Maximum redundancy allowed for constructing smooth in-turn sequences.
+    :param policy: Policy for generation.
+    :param time_budget: Seconds after which the in-turn search stops, or None.
+    :param pattern_table: Memoized in-turn pattern table; the process-wide default table if not given.
+    :param previous_reclist: Lines of a previous reclist to keep.
+    :param previous_syllable_map: The syllable map the previous reclist was generated from.
+    :param stats: Instrumentation of the run, or None.
+
+    :return: The syllables of every line, in commit order, the ``Generator.summary()`` of the run and its stats.
+    """
+    generator = Generator(syllable_map, pattern_table, stats=stats)
+    lines = []
+    for _, phoneme_pairs in generator.iter_reclist(
+            "CVVC", max_length, sss_first, iter_depth, max_redu, policy, previous_reclist=previous_reclist,
+            previous_syllable_map=previous_syllable_map, time_budget=time_budget):
+        # The pairs are ("-", first syllable), then a VC pair and a (syllable, "") pair per syllable, then the end.
+        lines.append([phoneme_pairs[0][1]] + [phoneme_pairs[i][0] for i in range(2, len(phoneme_pairs) - 1, 2)])
+    return (lines, generator.summary(), stats)
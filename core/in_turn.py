@@ -0,0 +1,218 @@
+from collections.abc import Collection, Container, Mapping, Sequence
+from dataclasses import dataclass
+from .index import SyllableIndex
+
+
+@dataclass(frozen=True, slots=True)
+class LineState:
+    """
+    What the in-turn line builder reads from a generator: the uncombined partners of the key phonemes and the
+    syllables and right phonemes that are still unused. The generator passes live lookups when it builds lines
+    itself and a plain snapshot, restricted to the syllables of the current key phonemes, to a process pool.
+
+    :param partners: Uncombined partner IDs of every key phoneme, in view order.
+    :param unused_start: Syllable IDs not yet recorded at the start of a line.
+    :param unused_nonstart: Syllable IDs not yet recorded at a non-start position.
+    :param unused_end: Right phoneme IDs not yet recorded at the end of a line.
+    """
+    partners: Mapping[int, Collection[int]]
+    unused_start: Container[int]
+    unused_nonstart: Container[int]
+    unused_end: Container[int]
+
+
+def line_slots(labels: Sequence[int], max_length: int, use_right_view: bool) -> list[tuple[int, int]]:
+    """
+    Get the VCs an in-turn line records, as (target label, host label) slots in line order.
+
+    The syllables of an in-turn line follow the key phonemes of ``labels``, repeated to ``max_length``: in the
+    left view syllable i has the left phoneme of label i, in the right view its right phoneme. A line records
+    the pair (left of the next syllable, right of this one) between two neighbouring syllables, so each slot
+    covers a pair of the target label's key phoneme and a partner, and the partner is carried by the syllable of
+    the host label. In the left view the host is the syllable before the VC and the last syllable is free; in
+    the right view the host is the syllable after it and the first syllable is free.
+
+    :param labels: Pattern label sequence, its length divides ``max_length``.
+    :param max_length: Maximum line length.
+    :param use_right_view: Whether the key phonemes are right phonemes.
+    :return: One slot per neighbouring syllables, ``max_length - 1`` in total.
+    """
+    sequence = tuple(labels) * (max_length // len(labels))
+    if use_right_view:
+        return list(zip(sequence, sequence[1:]))
+    return [(after, before) for before, after in zip(sequence, sequence[1:])]
+
+
+def label_needs(slots: Sequence[tuple[int, int]], num_labels: int) -> list[int]:
+    """
+    Get the number of uncombined partners the key phoneme of each label must supply to a line.
+
+    :param slots: Result of ``line_slots()``.
+    :param num_labels: Number of distinct labels.
+    :return: One need per label, indexed by label.
+    """
+    needs = [0] * num_labels
+    for target, _ in slots:
+        needs[target] += 1
+    return needs
+
+
+def window_slack(needs: Sequence[int], counts: Sequence[int]) -> int:
+    """
+    Bound whether a set of key phonemes can fill a pattern without building a line.
+
+    A line assigns the label needs to the phonemes one to one, so the phonemes can only fill it if their partner
+    counts, largest first, cover the needs, largest first, position by position. A negative slack proves that no
+    assignment fits. A partner also needs a syllable with the host phoneme, so a nonnegative slack does not
+    prove the opposite; ``match_partners()`` decides that.
+
+    :param needs: Result of ``label_needs()``.
+    :param counts: Uncombined partner count of each phoneme.
+    :return: The smallest surplus of a count over a nonzero need.
+    """
+    return min(c - n for c, n in zip(sorted(counts, reverse=True), sorted(needs, reverse=True)) if n)
+
+
+def match_partners(candidates: Sequence[Sequence[int]]) -> list[int] | None:
+    """
+    Give every slot of one key phoneme a distinct partner, by augmenting paths (Kuhn's algorithm).
+
+    Each slot tries its candidates in order, so a slot keeps its most preferred partner unless another slot has
+    no other choice. O(slots * candidates).
+
+    :param candidates: Partner IDs each slot may take, most preferred first.
+    :return: The partner of every slot, or None if the slots cannot all be matched.
+    """
+    owner: dict[int, int] = {}
+
+    def augment(slot: int, seen: set[int]) -> bool:
+        for partner in candidates[slot]:
+            if partner in seen:
+                continue
+            seen.add(partner)
+            if partner not in owner or augment(owner[partner], seen):
+                owner[partner] = slot
+                return True
+        return False
+
+    for slot in range(len(candidates)):
+        if not augment(slot, set()):
+            return None
+    matched = [0] * len(candidates)
+    for partner, slot in owner.items():
+        matched[slot] = partner
+    return matched
+
+
+def free_syllable(
+        index: SyllableIndex,
+        state: LineState,
+        candidates: Sequence[int],
+        line: Sequence[int],
+        use_as_start: bool
+) -> int:
+    """
+    Choose the free head or tail syllable of a fluent line.
+
+    :param index: Syllable index of the generator.
+    :param state: Unused syllables and right phonemes.
+    :param candidates: Syllable IDs sharing the key phoneme of the line.
+    :param line: Syllable IDs already in the line.
+    :param use_as_start: True for a head, which should cover an unused start; False for a tail, which should
+        cover an unused end, or else a syllable not yet recorded at a non-start position.
+    :return: The syllable ID, preferring one not in the line yet.
+    """
+    in_line = set(line)
+
+    def score(syl_id: int) -> tuple[bool, bool, bool]:
+        if use_as_start:
+            useful = syl_id in state.unused_start
+        else:
+            useful = index.pair_of(syl_id)[1] in state.unused_end
+        return (useful, syl_id not in in_line, use_as_start or syl_id in state.unused_nonstart)
+
+    return max(candidates, key=score)
+
+
+def build_in_turn_line(
+        index: SyllableIndex,
+        state: LineState,
+        slots: Sequence[tuple[int, int]],
+        keys: Sequence[int],
+        use_right_view: bool
+) -> list[int] | None:
+    """
+    Build an in-turn line whose VCs are all uncombined pairs.
+
+    The slots of each target phoneme need distinct partners, and a partner P can only fill a slot if the
+    syllable of P and the host phoneme exists: (host, P) in the left view, (P, host) in the right view. Partners
+    are matched per target phoneme with ``match_partners()``, preferring partners whose syllable is not yet
+    recorded at a non-start position. The free syllable at the end (left view) or start (right view) is chosen
+    by ``free_syllable()``.
+
+    :param index: Syllable index of the generator.
+    :param state: Partners and unused syllables to build against.
+    :param slots: Result of ``line_slots()``.
+    :param keys: Key phoneme ID of every label.
+    :param use_right_view: Whether the key phonemes are right phonemes.
+    :return: Syllable IDs of the line, or None if the slots cannot all be matched.
+    """
+    if use_right_view:
+        def host_syllable(host: int, partner: int) -> int | None:
+            return index.syllable_id_for(partner, host)
+    else:
+        def host_syllable(host: int, partner: int) -> int | None:
+            return index.syllable_id_for(host, partner)
+
+    by_target: dict[int, list[int]] = {}
+    for position, (target, _) in enumerate(slots):
+        by_target.setdefault(target, []).append(position)
+
+    hosts = [0] * len(slots)
+    for target, positions in by_target.items():
+        candidates = []
+        for position in positions:
+            host = keys[slots[position][1]]
+            usable = [(syl_id, partner) for partner in state.partners[keys[target]]
+                      if (syl_id := host_syllable(host, partner)) is not None]
+            usable.sort(key=lambda item: item[0] not in state.unused_nonstart)
+            candidates.append([partner for _, partner in usable])
+        partners = match_partners(candidates)
+        if partners is None:
+            return None
+        for position, partner in zip(positions, partners):
+            hosts[position] = host_syllable(keys[slots[position][1]], partner)
+
+    if use_right_view:
+        first = keys[slots[0][0]]
+        return [free_syllable(index, state, index.syllables_for_right(first), hosts, use_as_start=True), *hosts]
+    last = keys[slots[-1][0]]
+    return [*hosts, free_syllable(index, state, index.syllables_for_left(last), hosts, use_as_start=False)]
+
+
+_worker_index: SyllableIndex | None = None
+
+
+def init_in_turn_worker(index: SyllableIndex) -> None:
+    """Install the syllable index shared by the parent process."""
+    global _worker_index
+    _worker_index = index
+
+
+def build_in_turn_chunk(
+        state: LineState,
+        slots: Sequence[tuple[int, int]],
+        key_sets: Sequence[Sequence[int]],
+        use_right_view: bool
+) -> list[list[int] | None]:
+    """
+    Build the in-turn lines of several key phoneme assignments against one snapshot, on the index installed by
+    ``init_in_turn_worker()``.
+
+    :param state: Snapshot of the partners and unused syllables.
+    :param slots: Result of ``line_slots()``.
+    :param key_sets: Key phoneme ID of every label, per assignment.
+    :param use_right_view: Whether the key phonemes are right phonemes.
+    :return: The result of ``build_in_turn_line()`` for every assignment, in order.
+    """
+    return [build_in_turn_line(_worker_index, state, slots, keys, use_right_view) for keys in key_sets]
@@ -0,0 +1,260 @@
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+from typing import Self
+
+from .interning import SymbolTable
+
+
+class SyllableIndex:
+    """
+    Immutable compiled lookup tables of a syllable map. The index holds only tuples and private dicts, so it can be
+    pickled and sent to pool workers.
+
+    Left phonemes, right phonemes and syllables are interned into dense integer IDs in syllable map order. The
+    index is built once per dictionary and only read afterwards, so it can be shared by every generation stage, by
+    repeated runs of a ``Generator`` and by pool workers. Per-run state such as the uncombined pairs lives in
+    ``RLPairView``, which copies its adjacency from here.
+
+    If two syllables share the same (left, right) pair, the first one is used for that pair.
+
+    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}.
+    """
+
+    __slots__ = ("_syllable_map", "_lefts", "_rights", "_syllables", "_syllable_pairs",
+                 "_left_to_rights", "_right_to_lefts", "_left_to_syllables", "_right_to_syllables", "_pair_to_syl")
+
+    def __init__(self, syllable_map: dict[str, tuple[str, str]]) -> None:
+        lefts = SymbolTable()
+        rights = SymbolTable()
+        syllables = SymbolTable()
+        syllable_pairs: list[tuple[int, int]] = []
+        left_to_rights: list[dict[int, None]] = []
+        right_to_lefts: list[dict[int, None]] = []
+        left_to_syllables: list[list[int]] = []
+        right_to_syllables: list[list[int]] = []
+        pair_to_syl: dict[tuple[int, int], int] = {}
+
+        for syl, (left, right) in syllable_map.items():
+            left_id = lefts.intern(left)
+            right_id = rights.intern(right)
+            syl_id = syllables.intern(syl)
+            if left_id == len(left_to_rights):
+                left_to_rights.append({})
+                left_to_syllables.append([])
+            if right_id == len(right_to_lefts):
+                right_to_lefts.append({})
+                right_to_syllables.append([])
+
+            syllable_pairs.append((left_id, right_id))
+            left_to_rights[left_id][right_id] = None
+            right_to_lefts[right_id][left_id] = None
+            left_to_syllables[left_id].append(syl_id)
+            right_to_syllables[right_id].append(syl_id)
+            pair_to_syl.setdefault((left_id, right_id), syl_id)
+
+        self._syllable_map = dict(syllable_map)
+        self._lefts = lefts
+        self._rights = rights
+        self._syllables = syllables
+        self._syllable_pairs = tuple(syllable_pairs)
+        self._left_to_rights = tuple(tuple(ids) for ids in left_to_rights)
+        self._right_to_lefts = tuple(tuple(ids) for ids in right_to_lefts)
+        self._left_to_syllables = tuple(tuple(ids) for ids in left_to_syllables)
+        self._right_to_syllables = tuple(tuple(ids) for ids in right_to_syllables)
+        self._pair_to_syl = pair_to_syl
+
+    @classmethod
+    def from_tables(
+            cls,
+            syllable_map: dict[str, tuple[str, str]],
+            lefts: SymbolTable,
+            rights: SymbolTable,
+            syllables: SymbolTable,
+            syllable_pairs: tuple[tuple[int, int], ...],
+            left_to_rights: tuple[tuple[int, ...], ...],
+            right_to_lefts: tuple[tuple[int, ...], ...],
+            left_to_syllables: tuple[tuple[int, ...], ...],
+            right_to_syllables: tuple[tuple[int, ...], ...]
+    ) -> Self:
+        """
+        Build an index from tables compiled ahead of time (see ``core.compiled``), without interning the syllable
+        map again. The tables must be those the constructor would build from ``syllable_map``, and no two
+        syllables may share a phoneme pair.
+
+        :param syllable_map: Syllable mapping table, taken over, not copied.
+        :param lefts: Symbol table of left phonemes.
+        :param rights: Symbol table of right phonemes.
+        :param syllables: Symbol table of syllables.
+        :param syllable_pairs: (left ID, right ID) of every syllable.
+        :param left_to_rights: Distinct right IDs of every left phoneme, in syllable map order.
+        :param right_to_lefts: Distinct left IDs of every right phoneme, in syllable map order.
+        :param left_to_syllables: Syllable IDs of every left phoneme.
+        :param right_to_syllables: Syllable IDs of every right phoneme.
+        :return: New index.
+        """
+        index = cls.__new__(cls)
+        index._syllable_map = syllable_map
+        index._lefts = lefts
+        index._rights = rights
+        index._syllables = syllables
+        index._syllable_pairs = syllable_pairs
+        index._left_to_rights = left_to_rights
+        index._right_to_lefts = right_to_lefts
+        index._left_to_syllables = left_to_syllables
+        index._right_to_syllables = right_to_syllables
+        index._pair_to_syl = {pair: syl_id for syl_id, pair in enumerate(syllable_pairs)}
+        return index
+
+    @property
+    def syllable_map(self) -> Mapping[str, tuple[str, str]]:
+        """Read-only forward table {syllable: (left, right)}."""
+        return MappingProxyType(self._syllable_map)
+
+    @property
+    def left_table(self) -> SymbolTable:
+        """Symbol table of left phonemes."""
+        return self._lefts
+
+    @property
+    def right_table(self) -> SymbolTable:
+        """Symbol table of right phonemes."""
+        return self._rights
+
+    @property
+    def syllable_table(self) -> SymbolTable:
+        """Symbol table of syllables."""
+        return self._syllables
+
+    def pair_of(self, syl_id: int) -> tuple[int, int]:
+        """
+        Get the phoneme pair of a syllable.
+
+        :param syl_id: Syllable ID.
+        :return: (left ID, right ID).
+        """
+        return self._syllable_pairs[syl_id]
+
+    def right_ids_for_left(self, left_id: int) -> tuple[int, ...]:
+        """
+        Get the distinct right phonemes paired with a left phoneme, in syllable map order.
+
+        :param left_id: Left phoneme ID.
+        :return: Right phoneme IDs.
+        """
+        return self._left_to_rights[left_id]
+
+    def left_ids_for_right(self, right_id: int) -> tuple[int, ...]:
+        """
+        Get the distinct left phonemes paired with a right phoneme, in syllable map order.
+
+        :param right_id: Right phoneme ID.
+        :return: Left phoneme IDs.
+        """
+        return self._right_to_lefts[right_id]
+
+    def syllables_for_left(self, left_id: int) -> tuple[int, ...]:
+        """
+        Get the syllables that start with a left phoneme.
+
+        :param left_id: Left phoneme ID.
+        :return: Syllable IDs.
+        """
+        return self._left_to_syllables[left_id]
+
+    def syllables_for_right(self, right_id: int) -> tuple[int, ...]:
+        """
+        Get the syllables that end with a right phoneme.
+
+        :param right_id: Right phoneme ID.
+        :return: Syllable IDs.
+        """
+        return self._right_to_syllables[right_id]
+
+    def left_degree(self, left_id: int) -> int:
+        """
+        Get the number of distinct right phonemes paired with a left phoneme.
+
+        :param left_id: Left phoneme ID.
+        :return: Degree.
+        """
+        return len(self._left_to_rights[left_id])
+
+    def right_degree(self, right_id: int) -> int:
+        """
+        Get the number of distinct left phonemes paired with a right phoneme.
+
+        :param right_id: Right phoneme ID.
+        :return: Degree.
+        """
+        return len(self._right_to_lefts[right_id])
+
+    def line_vcs(self, syl_ids: Sequence[int]) -> list[tuple[int, int]]:
+        """
+        Get the VCs a line records, as (left ID, right ID) pairs.
+
+        Between two neighbouring syllables S and T a line records the VC "R L" of the right phoneme of S and the left
+        phoneme of T. It is returned in the orientation of ``pair_of()``, (left of T, right of S), and it is a CVVC
+        unit exactly if some syllable has this pair. This is the one definition of a VC unit, shared by the
+        ``RLPairView`` bookkeeping of ``Generator`` and by ``CoverageValidator``.
+
+        :param syl_ids: Syllable IDs of the line, in order.
+        :return: One pair per neighbouring syllables, in line order.
+        """
+        pairs = self._syllable_pairs
+        return [(pairs[after][0], pairs[before][1]) for before, after in zip(syl_ids, syl_ids[1:])]
+
+    def syllable_id_for(self, left_id: int, right_id: int) -> int | None:
+        """
+        Get the syllable made of a phoneme pair.
+
+        :param left_id: Left phoneme ID.
+        :param right_id: Right phoneme ID.
+        :return: Syllable ID, or None if no syllable has this pair.
+        """
+        return self._pair_to_syl.get((left_id, right_id))
+
+    def syllable_for(self, left: str, right: str) -> str | None:
+        """
+        Get the syllable made of a phoneme pair, by name.
+
+        :param left: Left phoneme.
+        :param right: Right phoneme.
+        :return: Syllable name, or None if no syllable has this pair.
+        """
+        left_id = self._lefts.id_of(left)
+        right_id = self._rights.id_of(right)
+        if left_id is None or right_id is None:
+            return None
+        syl_id = self._pair_to_syl.get((left_id, right_id))
+        return self._syllables.name_of(syl_id) if syl_id is not None else None
+
+    def components(self) -> list[tuple[int, ...]]:
+        """
+        Split the syllables into the connected components of the bipartite left-right phoneme graph, in which
+        every syllable is an edge between its left and its right phoneme. Syllables of different components share
+        no phoneme, so each component can be generated on its own. Uses union-find, O(n α(n)).
+
+        :return: Syllable IDs per component, ascending, ordered by their first syllable.
+        """
+        num_lefts = len(self._lefts)
+        # Vertices 0..num_lefts-1 are left phonemes, the rest are right phonemes.
+        parent = list(range(num_lefts + len(self._rights)))
+
+        def find(vertex: int) -> int:
+            while parent[vertex] != vertex:
+                parent[vertex] = parent[parent[vertex]]
+                vertex = parent[vertex]
+            return vertex
+
+        for left_id, right_id in self._syllable_pairs:
+            a, b = find(left_id), find(num_lefts + right_id)
+            if a != b:
+                parent[max(a, b)] = min(a, b)
+
+        members: dict[int, list[int]] = {}
+        for syl_id, (left_id, _) in enumerate(self._syllable_pairs):
+            members.setdefault(find(left_id), []).append(syl_id)
+        return [tuple(ids) for ids in members.values()]
+
+    def __len__(self) -> int:
+        return len(self._syllable_pairs)
@@ -0,0 +1,77 @@
+from typing import Self
+
+
+class SymbolTable:
+    """
+    Bidirectional mapping between phoneme (or syllable) names and dense integer IDs.
+
+    IDs are handed out in first-seen order starting from 0, so they can be used directly as list indices.
+    """
+
+    __slots__ = ("_names", "_ids")
+
+    def __init__(self) -> None:
+        self._names: list[str] = []
+        self._ids: dict[str, int] = {}
+
+    @classmethod
+    def from_names(cls, names: list[str]) -> Self:
+        """
+        Build a table whose IDs are the positions of ``names``.
+
+        :param names: Distinct names, indexed by ID. The list is taken over, not copied.
+        :return: New table.
+        :raise ValueError: A name occurs twice.
+        """
+        table = cls()
+        table._names = names
+        table._ids = {name: _id for _id, name in enumerate(names)}
+        if len(table._ids) != len(names):
+            raise ValueError("The symbol names are not distinct.")
+        return table
+
+    def intern(self, name: str) -> int:
+        """
+        Get the ID of a name, assigning a new one if the name has not been seen yet.
+
+        :param name: Phoneme or syllable name.
+        :return: Dense integer ID.
+        """
+        _id = self._ids.get(name)
+        if _id is None:
+            _id = len(self._names)
+            self._ids[name] = _id
+            self._names.append(name)
+        return _id
+
+    def id_of(self, name: str) -> int | None:
+        """
+        Get the ID of a name without interning it.
+
+        :param name: Phoneme or syllable name.
+        :return: The ID, or None if the name is unknown.
+        """
+        return self._ids.get(name)
+
+    def name_of(self, _id: int) -> str:
+        """
+        Get the name behind an ID.
+
+        :param _id: Dense integer ID.
+        :return: Phoneme or syllable name.
+        """
+        return self._names[_id]
+
+    def names(self) -> list[str]:
+        """
+        Get all interned names, indexed by ID. The returned list must not be modified.
+
+        :return: List of names.
+        """
+        return self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
@@ -0,0 +1,91 @@
+from dataclasses import dataclass, fields
+from typing import Any, Literal, Self
+
+
+@dataclass(slots=True)
+class GenerateOptions:
+    """
+    Parameters of a ``generate`` run. The defaults are the CLI defaults described in readme.md.
+
+    :param iter_depth: In-turn iteration depth; None means half of ``max_length``, which is also the maximum.
+    :param jobs: Worker processes for dictionary components, restarts and the in-turn search.
+    :param time_budget: Seconds after which the in-turn search stops; None means no limit.
+    :param restarts: Number of dictionary orders searched by the CVVC multi-start search; 1 searches only the
+        dictionary order.
+    :param seed: Seed of the shuffled dictionary orders.
+    """
+    mode: Literal["CVVC", "VCV", "VCV_WITH_VC"] = "CVVC"
+    policy: Literal["DEFAULT", "NO_IN_TURN"] = "DEFAULT"
+    bpm: int = 120
+    max_length: int = 6
+    sss_first: bool = False
+    iter_depth: int | None = None
+    max_redundancy: int = 50
+    jobs: int = 1
+    time_budget: float | None = None
+    restarts: int = 1
+    seed: int = 0
+
+    @classmethod
+    def from_mapping(cls, data: dict[str, Any], base: Self | None = None) -> Self:
+        """
+        Build options from a mapping such as a manifest table. Missing or None values fall back to ``base``.
+
+        :param data: Option values keyed by field name; "-" is accepted in place of "_".
+        :param base: Options to start from, the defaults if not given.
+        :return: New options.
+        :raise ValueError: The mapping contains an unknown option.
+        """
+        names = {f.name for f in fields(cls)}
+        values = {f.name: getattr(base, f.name) for f in fields(cls)} if base is not None else {}
+        for key, value in data.items():
+            name = key.replace("-", "_")
+            if name not in names:
+                raise ValueError(f"Unknown generation option '{key}'.")
+            if value is not None:
+                values[name] = value
+        return cls(**values)
+
+    def get_iter_depth(self) -> int:
+        """
+        Get the effective in-turn iteration depth.
+
+        :return: Iteration depth, at most half of ``max_length``.
+        """
+        limit = self.max_length // 2
+        return min(self.iter_depth or limit, limit)
+
+    def pattern_key(self) -> tuple[int, int]:
+        """
+        Get the ``PatternTable`` key used by these options.
+
+        :return: (p, m)
+        """
+        return (self.get_iter_depth(), self.max_length)
+
+    def generate_kwargs(self) -> dict[str, Any]:
+        """
+        Get the keyword arguments for ``Generator.generate()`` and ``Generator.iter_generate()``.
+
+        :return: Keyword arguments.
+        """
+        return {**self.reclist_kwargs(), "bmp": self.bpm}
+
+    def reclist_kwargs(self) -> dict[str, Any]:
+        """
+        Get the keyword arguments for ``Generator.iter_reclist()``, i.e. without the tempo.
+
+        :return: Keyword arguments.
+        """
+        return {
+            "mode": self.mode,
+            "policy": self.policy,
+            "max_length": self.max_length,
+            "sss_first": self.sss_first,
+            "iter_depth": self.get_iter_depth(),
+            "max_redu": self.max_redundancy,
+            "jobs": self.jobs,
+            "time_budget": self.time_budget,
+            "restarts": self.restarts,
+            "seed": self.seed,
+        }
@@ -0,0 +1,150 @@
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+
+# Number of beats of guide BGM before the first syllable of a line.
+LEAD_IN_BEATS = 4
+
+# Entry kinds, used as row indices into _TIMING.
+_CV_START = 0
+_CV = 1
+_VC = 2
+_END = 3
+# A VC that shares its syllable with the VCV before it (VCV_WITH_VC mode), so it does not start a new syllable.
+_VC_SHARED = 4
+
+# Timing of each entry kind in beats: (offset relative to the syllable beat, consonant, cutoff, preutterance, overlap).
+# The cutoff is negative, i.e. measured from the offset, as usual for oto.ini templates.
+_TIMING = np.array([
+    (-0.25, 0.375, -0.75, 0.25, 0.0),
+    (-0.25, 0.375, -0.75, 0.25, 0.125),
+    (-0.5, 0.375, -0.5, 0.25, 0.125),
+    (0.5, 0.375, -0.75, 0.25, 0.125),
+    (-0.5, 0.375, -0.5, 0.25, 0.125),
+])
+
+# _TIMING as plain floats, for oto_lines().
+_TIMING_ROWS: list[list[float]] = _TIMING.tolist()
+
+_ROW_FORMAT = "%s=%s,%.10g,%.10g,%.10g,%.10g,%.10g"
+
+
+def pair_alias(pair: tuple[str, str]) -> str:
+    """
+    Get the oto.ini alias of a phoneme pair.
+
+    :param pair: Phoneme pair from a reclist entry, e.g. ("-", "da"), ("a", "d"), ("da", "") or ("a", "-").
+    :return: Alias such as "- da", "a d", "da" or "a -".
+    """
+    first, second = pair
+    return f"{first} {second}" if second else first
+
+
+def _pair_kind(index: int, second: str, prev_kind: int, shared_vc: bool) -> int:
+    """Get the entry kind of the pair at ``index`` of a line, given the kind of the pair before it."""
+    if index == 0:
+        return _CV_START
+    if second == "-":
+        return _END
+    if second == "":
+        return _CV
+    if shared_vc and prev_kind == _VC:
+        return _VC_SHARED
+    return _VC
+
+
+def build_oto(
+        entries: Iterable[tuple[str, list[tuple[str, str]]]],
+        bpm: int,
+        mode: Literal["CVVC", "VCV", "VCV_WITH_VC"] = "CVVC"
+) -> str:
+    """
+    Build the oto.ini template for many reclist lines at once.
+
+    Every syllable of a line lasts one beat of the guide BGM, after ``LEAD_IN_BEATS`` beats of lead-in. A VC or VCV
+    pair belongs to the syllable it leads into and the end pair to the last syllable. The timings of all pairs are
+    computed in one NumPy pass from the entry kind and the syllable index, and all rows are formatted by a single
+    string formatting operation.
+
+    :param entries: Reclist entries (line, phoneme pairs), as built by ``Generator``.
+    :param bpm: Tempo of the guide BGM.
+    :param mode: Generation mode of the entries. In 'VCV_WITH_VC' mode every VCV pair is followed by the VC pair of
+        the same syllable.
+
+    :return: oto.ini text with one "wav=alias,offset,consonant,cutoff,preutterance,overlap" row per line of text,
+        without a trailing newline.
+    """
+    wavs: list[str] = []
+    aliases: list[str] = []
+    kinds: list[int] = []
+    line_starts: list[int] = []
+    shared_vc = mode == "VCV_WITH_VC"
+    for line, phoneme_pairs in entries:
+        line_starts.append(len(kinds))
+        wavs.extend([f"{line}.wav"] * len(phoneme_pairs))
+        pair_kind = _CV_START
+        for index, pair in enumerate(phoneme_pairs):
+            aliases.append(pair_alias(pair))
+            pair_kind = _pair_kind(index, pair[1], pair_kind, shared_vc)
+            kinds.append(pair_kind)
+    if not kinds:
+        return ""
+
+    kind = np.array(kinds, dtype=np.intp)
+    # The syllable index of a row is the number of VC rows so far in its line; shared VC rows do not count.
+    vc_count = np.cumsum(kind == _VC)
+    starts = np.array(line_starts, dtype=np.intp)
+    line_of_row = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(kind))))
+    before_line = np.where(starts > 0, vc_count[starts - 1], 0)
+    position = vc_count - before_line[line_of_row]
+
+    beat = 60000 / bpm
+    timing = _TIMING[kind]
+    values = np.empty((len(kind), 5))
+    values[:, 0] = (LEAD_IN_BEATS + position + timing[:, 0]) * beat
+    values[:, 1:] = timing[:, 1:] * beat
+    # Round to microseconds and turn -0.0 into 0.0.
+    values = np.round(values, 3) + 0.0
+
+    table = np.empty((len(kind), 7), dtype=object)
+    table[:, 0] = wavs
+    table[:, 1] = aliases
+    table[:, 2:] = values
+    return "\n".join([_ROW_FORMAT] * len(kind)) % tuple(table.ravel().tolist())
+
+
+def oto_lines(
+        line: str,
+        phoneme_pairs: list[tuple[str, str]],
+        bpm: int,
+        mode: Literal["CVVC", "VCV", "VCV_WITH_VC"] = "CVVC"
+) -> list[str]:
+    """
+    Build the oto.ini template lines for one reclist line.
+
+    The rows are the ones ``build_oto()`` gives for the line, computed with plain floats: for a single line, setting
+    up the NumPy arrays costs more than the arithmetic. The rounding follows ``np.round()``, which scales, rounds
+    half to even and scales back.
+
+    :param line: Reclist line, used as the wav file name.
+    :param phoneme_pairs: Phoneme pairs of the line, as built by ``Generator``.
+    :param bpm: Tempo of the guide BGM.
+    :param mode: Generation mode of the line (see ``build_oto()``).
+
+    :return: oto.ini lines in the format "wav=alias,offset,consonant,cutoff,preutterance,overlap".
+    """
+    beat = 60000 / bpm
+    wav = f"{line}.wav"
+    shared_vc = mode == "VCV_WITH_VC"
+    rows = []
+    position = 0
+    pair_kind = _CV_START
+    for index, pair in enumerate(phoneme_pairs):
+        pair_kind = _pair_kind(index, pair[1], pair_kind, shared_vc)
+        if pair_kind == _VC:
+            position += 1
+        offset, *lengths = _TIMING_ROWS[pair_kind]
+        values = ((LEAD_IN_BEATS + position + offset) * beat, *(length * beat for length in lengths))
+        rows.append(_ROW_FORMAT % (wav, pair_alias(pair), *(round(value * 1000) / 1000 for value in values)))
+    return rows
@@ -0,0 +1,292 @@
+import heapq
+from dataclasses import dataclass, field
+
+from .index import SyllableIndex
+
+
+@dataclass(frozen=True, slots=True)
+class StarLine:
+    """
+    A perfectly fluent line: ``capacity`` pairs that all share one phoneme.
+
+    A line records the VC of every two neighbouring syllables, i.e. the pair (left of the next syllable, right of
+    this one). A left-view line with key L is the syllables (L, partner) in order plus one more syllable with left
+    phoneme L, so it records every (L, partner) pair. A right-view line with key R is one syllable with right
+    phoneme R followed by the syllables (partner, R), so it records every (partner, R) pair. The extra syllable is
+    not part of the star; ``Generator`` chooses it.
+
+    :param use_right_view: True if the shared phoneme is a right phoneme, False if it is a left phoneme.
+    :param key: Interned ID of the shared phoneme.
+    :param partners: Interned IDs of the partner phonemes, in line order.
+    """
+    use_right_view: bool
+    key: int
+    partners: tuple[int, ...]
+
+
+@dataclass(slots=True)
+class PackingReport:
+    """
+    Result of a perfect-fluent packing run.
+
+    :param lines: Packed lines, left-view lines first, each view ordered by phoneme ID.
+    :param upper_bound: An upper bound on the number of lines any packing can reach.
+    :param moved_pairs: Number of pairs re-assigned by the improvement pass.
+    """
+    lines: list[StarLine] = field(default_factory=list)
+    upper_bound: int = 0
+    moved_pairs: int = 0
+
+    @property
+    def gap(self) -> int:
+        """Number of lines between this packing and the upper bound (0 means provably optimal)."""
+        return self.upper_bound - len(self.lines)
+
+
+def pack_perfect_fluent(
+        pairs: list[tuple[int, int]],
+        num_lefts: int,
+        num_rights: int,
+        capacity: int
+) -> PackingReport:
+    """
+    Pack phoneme pairs into as many perfectly fluent lines as possible, using both views together.
+
+    The pairs are the edges of a bipartite L-R graph and a line is a star of ``capacity`` edges around one vertex
+    (see ``StarLine``), so the task is to assign every edge to one of its endpoints such that the sum of
+    ``assigned // capacity`` over all vertices is maximal. Each edge is first assigned to its endpoint with the
+    larger degree. Then vertices are visited by ascending shortfall to their next full line, and a vertex pulls
+    edges from neighbours whose leftovers would not form a line anyway, in one pass over its incident edges. The
+    run time is O(E + V log V).
+
+    :param pairs: Uncombined pairs as (left ID, right ID), in view order.
+    :param num_lefts: Number of interned left phonemes.
+    :param num_rights: Number of interned right phonemes.
+    :param capacity: Pairs per line, i.e. the maximum line length minus 1.
+
+    :return: The packed lines together with an upper bound on the line count.
+    """
+    report = PackingReport()
+    if capacity < 1 or not pairs:
+        return report
+
+    # Vertices 0..num_lefts-1 are left phonemes, the rest are right phonemes.
+    num_vertices = num_lefts + num_rights
+    degree = [0] * num_vertices
+    for left, right in pairs:
+        degree[left] += 1
+        degree[num_lefts + right] += 1
+
+    report.upper_bound = min(
+        len(pairs) // capacity, sum(d // capacity for d in degree))
+
+    owner = [0] * len(pairs)
+    assigned = [0] * num_vertices
+    incident: list[list[int]] = [[] for _ in range(num_vertices)]
+    for index, (left, right) in enumerate(pairs):
+        right_vertex = num_lefts + right
+        incident[left].append(index)
+        incident[right_vertex].append(index)
+        # Ties go to the left view, which is the one the greedy stage tried first.
+        vertex = left if degree[left] >= degree[right_vertex] else right_vertex
+        owner[index] = vertex
+        assigned[vertex] += 1
+
+    def shortfall(vertex: int) -> int:
+        return (capacity - assigned[vertex] % capacity) % capacity
+
+    order = sorted(
+        (v for v in range(num_vertices) if degree[v] >= capacity),
+        key=lambda v: (shortfall(v) or capacity, v))
+
+    for vertex in order:
+        # An edge passed over once stays unusable for this vertex: it is owned by the vertex already, or its owner
+        # has no leftover to give, and leftovers only shrink while the vertex pulls edges. So one pass suffices.
+        need = shortfall(vertex) or capacity
+        donors: list[int] = []
+        taken: dict[int, int] = {}
+        for index in incident[vertex]:
+            other = owner[index]
+            if other == vertex or assigned[other] % capacity <= taken.get(other, 0):
+                continue
+            taken[other] = taken.get(other, 0) + 1
+            donors.append(index)
+            if len(donors) < need:
+                continue
+            for donor in donors:
+                assigned[owner[donor]] -= 1
+                owner[donor] = vertex
+            assigned[vertex] += need
+            report.moved_pairs += need
+            need = capacity
+            donors = []
+            taken = {}
+
+    for vertex in range(num_vertices):
+        full = assigned[vertex] // capacity
+        if not full:
+            continue
+        use_right_view = vertex >= num_lefts
+        key = vertex - num_lefts if use_right_view else vertex
+        owned = [index for index in incident[vertex] if owner[index] == vertex]
+        for n in range(full):
+            chunk = owned[n * capacity:(n + 1) * capacity]
+            if use_right_view:
+                partners = tuple(pairs[index][0] for index in chunk)
+            else:
+                partners = tuple(pairs[index][1] for index in chunk)
+            report.lines.append(StarLine(use_right_view, key, partners))
+
+    return report
+
+
+def pack_not_fluent(
+        index: SyllableIndex,
+        pairs: list[tuple[int, int]],
+        body: list[int],
+        starts: list[int],
+        ends: list[int],
+        max_length: int
+) -> list[list[int]]:
+    """
+    Pack what the fluent stages left over into few lines: the uncombined pairs, the syllables not yet recorded at
+    a non-start position, and the remaining starts and ends.
+
+    A line records the pair (left of the next syllable, right of this one) between two neighbouring syllables.
+    Each line is a walk led by an unused start, preferably one whose right phoneme still has uncombined pairs.
+    While the right phoneme R of the last syllable has an uncombined pair (L, R), the walk appends a syllable
+    with left phoneme L, a ``body`` syllable if possible, else the syllable (L, R) itself, which keeps the walk on
+    R; so the pairs of one right phoneme are covered together. Otherwise it jumps to the right phoneme with the
+    most uncombined pairs, kept in a heap with lazy deletion, through a syllable ending in it, or appends any
+    ``body`` syllable once no pair is left. A line ends at ``max_length`` syllables or when nothing is left to
+    cover. Starts left over get one-syllable lines. Ends left over are appended to lines that still have room,
+    or get a line of their own. Apart from scanning the uncombined pairs of the current right phoneme, every
+    step is O(log n).
+
+    :param index: Compiled syllable index.
+    :param pairs: Uncombined pairs as (left ID, right ID); each one is a syllable.
+    :param body: Syllable IDs that still need a non-start position.
+    :param starts: Syllable IDs that still need to start a line.
+    :param ends: Right phoneme IDs that still need to end a line.
+    :param max_length: Maximum line length, at least 2.
+
+    :return: Lines as lists of syllable IDs.
+    :raise ValueError: ``max_length`` is less than 2.
+    """
+    if not (pairs or body or starts or ends):
+        return []
+    if max_length < 2:
+        raise ValueError("A line needs room for a start and at least one more syllable.")
+
+    pending: dict[int, dict[int, None]] = {}
+    for left, right in pairs:
+        pending.setdefault(right, {})[left] = None
+    # Max-heap of right phonemes by uncombined pairs, as (-count, right ID); stale entries are skipped.
+    heap = [(-len(lefts), right) for right, lefts in pending.items()]
+    heapq.heapify(heap)
+
+    unused_body = dict.fromkeys(body)
+    body_by_left: dict[int, list[int]] = {}
+    body_by_right: dict[int, list[int]] = {}
+    for syl_id in reversed(body):
+        left, right = index.pair_of(syl_id)
+        body_by_left.setdefault(left, []).append(syl_id)
+        body_by_right.setdefault(right, []).append(syl_id)
+    unused_start = dict.fromkeys(starts)
+    starts_by_right: dict[int, list[int]] = {}
+    for syl_id in reversed(starts):
+        starts_by_right.setdefault(index.pair_of(syl_id)[1], []).append(syl_id)
+    unused_end = dict.fromkeys(ends)
+
+    def peek(candidates: list[int] | None, unused: dict[int, None]) -> int | None:
+        while candidates:
+            if candidates[-1] in unused:
+                return candidates[-1]
+            candidates.pop()
+        return None
+
+    def top_right() -> int | None:
+        while heap:
+            count, right = heap[0]
+            lefts = pending.get(right)
+            if lefts and len(lefts) == -count:
+                return right
+            heapq.heappop(heap)
+            if lefts:
+                heapq.heappush(heap, (-len(lefts), right))
+        return None
+
+    def cover(left: int, right: int) -> None:
+        lefts = pending.get(right)
+        if lefts is not None and left in lefts:
+            del lefts[left]
+            if not lefts:
+                del pending[right]
+
+    def take_start() -> int:
+        right = top_right()
+        syl_id = peek(starts_by_right.get(right), unused_start) if right is not None else None
+        if syl_id is None and unused_start:
+            syl_id = next(iter(unused_start))
+        if syl_id is not None:
+            del unused_start[syl_id]
+            return syl_id
+        if right is not None:
+            return index.syllables_for_right(right)[0]
+        # Only body syllables are left; any start will do.
+        return next(iter(unused_body))
+
+    def next_syllable(right: int, last: bool) -> int | None:
+        lefts = pending.get(right)
+        if lefts:
+            for left in lefts:
+                syl_id = peek(body_by_left.get(left), unused_body)
+                if syl_id is not None:
+                    return syl_id
+            return index.syllable_id_for(next(iter(lefts)), right)
+        target = top_right()
+        if target is not None:
+            syl_id = peek(body_by_right.get(target), unused_body)
+            if syl_id is not None:
+                return syl_id
+            # A syllable recorded before, worth it only if the line goes on to cover a pair of the target.
+            return None if last else index.syllables_for_right(target)[0]
+        return next(iter(unused_body), None)
+
+    packed: list[list[int]] = []
+    # Lines that are short enough to take one more syllable and whose end covers nothing new.
+    open_lines: list[list[int]] = []
+
+    def add_line(syl_ids: list[int]) -> None:
+        packed.append(syl_ids)
+        right = index.pair_of(syl_ids[-1])[1]
+        if right in unused_end:
+            del unused_end[right]
+        elif len(syl_ids) < max_length:
+            open_lines.append(syl_ids)
+
+    while pending or unused_body:
+        syl_ids = [take_start()]
+        right = index.pair_of(syl_ids[0])[1]
+        while len(syl_ids) < max_length:
+            syl_id = next_syllable(right, len(syl_ids) == max_length - 1)
+            if syl_id is None:
+                break
+            left, next_right = index.pair_of(syl_id)
+            cover(left, right)
+            unused_body.pop(syl_id, None)
+            syl_ids.append(syl_id)
+            right = next_right
+        add_line(syl_ids)
+
+    for syl_id in unused_start:
+        add_line([syl_id])
+
+    for right in list(unused_end):
+        end = index.syllables_for_right(right)[0]
+        if open_lines:
+            syl_ids = open_lines.pop()
+            syl_ids.append(end)
+        else:
+            packed.append([end])
+    return packed
@@ -0,0 +1,102 @@
+from collections.abc import Iterator
+from typing import Self
+
+Pattern = tuple[tuple[int, ...], int]
+
+
+def iter_patterns(p: int, m: int) -> Iterator[Pattern]:
+    """
+    Lazily generate all restricted-growth label sequences used as in-turn patterns.
+
+    Patterns are yielded in ascending order of ``num_labels``; patterns with the same number of labels are
+    yielded by ascending length and then in lexicographic order, which is the same order as a stable sort of
+    the full backtracking enumeration.
+
+    :param p: Maximum sequence length (inclusive).
+    :param m: Divisor condition for filtering valid lengths r.
+    :return: Iterator of tuples (sequence, num_labels).
+    """
+    lengths = [r for r in range(2, p + 1) if m % r == 0]
+    if not lengths:
+        return
+    for num_labels in range(2, lengths[-1] + 1):
+        for r in lengths:
+            if r >= num_labels:
+                yield from _iter_rgs(r, num_labels)
+
+
+def _iter_rgs(length: int, num_labels: int) -> Iterator[Pattern]:
+    """
+    Generate restricted-growth sequences of a given length that use exactly ``num_labels`` labels.
+
+    The sequence is built in place on a single list and only branches that can still reach ``num_labels``
+    distinct labels are explored, so every visited leaf is a result.
+
+    :param length: Sequence length.
+    :param num_labels: Exact number of distinct labels.
+    :return: Iterator of tuples (sequence, num_labels) in lexicographic order.
+    """
+    labels = [0] * length
+    # Each stack entry is the (position, next label to try, max label before this position).
+    stack = [(1, 0, 0)]
+    while stack:
+        pos, label, max_label = stack.pop()
+        if pos == length:
+            if max_label + 1 == num_labels:
+                yield (tuple(labels), num_labels)
+            continue
+        limit = min(max_label + 1, num_labels - 1)
+        if label > limit:
+            continue
+        stack.append((pos, label + 1, max_label))
+        new_max = max(max_label, label)
+        # Prune when the remaining positions cannot introduce the missing labels.
+        if num_labels - 1 - new_max > length - pos - 1:
+            continue
+        labels[pos] = label
+        stack.append((pos + 1, 0, new_max))
+
+
+class PatternTable:
+    """
+    Memoized table of in-turn patterns keyed by ``(p, m)``.
+
+    Tables are built in memory on first use and shared by every generator of a process; pool workers get them warm
+    from the parent. Even the largest table the CLI can ask for (``-l 8``) builds in well under a millisecond, so
+    tables are not kept on disk.
+    """
+
+    def __init__(self) -> None:
+        self._tables: dict[tuple[int, int], tuple[Pattern, ...]] = {}
+
+    def get(self, p: int, m: int) -> tuple[Pattern, ...]:
+        """
+        Get the patterns for ``(p, m)``, building them on first use.
+
+        :param p: Maximum sequence length (inclusive).
+        :param m: Divisor condition for filtering valid lengths r.
+        :return: Tuple of (sequence, num_labels), sorted by num_labels. The result is shared and must not be modified.
+        """
+        key = (p, m)
+        patterns = self._tables.get(key)
+        if patterns is None:
+            patterns = tuple(iter_patterns(p, m))
+            self._tables[key] = patterns
+        return patterns
+
+    def warm(self, keys: list[tuple[int, int]]) -> Self:
+        """
+        Build the patterns for several keys ahead of time.
+
+        :param keys: List of (p, m).
+        :return: self
+        """
+        for p, m in keys:
+            self.get(p, m)
+        return self
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._tables
+
+
+default_pattern_table = PatternTable()
@@ -0,0 +1,142 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TextIO
+
+from .dictionary import SyllableDictionary
+from .views import SyllableView
+
+PRESAMP_VERSION = "1.7"
+DEFAULT_VOLUME = "100"
+
+
+@dataclass(slots=True)
+class PresampData:
+    """
+    The parts of a ``presamp.ini`` this program understands.
+
+    :param left_map: Consonant table in the format {left: [syllable]}, from ``[CONSONANT]``.
+    :param right_map: Vowel table in the format {right: [syllable]}, from ``[VOWEL]``.
+    :param n_fade: Consonants whose crossfade flag is 1.
+    :param end_flag: Whether ``[ENDFLAG]`` is enabled.
+    """
+    left_map: dict[str, list[str]] = field(default_factory=dict)
+    right_map: dict[str, list[str]] = field(default_factory=dict)
+    n_fade: list[str] = field(default_factory=list)
+    end_flag: bool = True
+
+    def to_dictionary(self) -> SyllableDictionary:
+        """
+        Convert to a syllable dictionary. Syllables without a consonant (pure vowels) and consonant-row syllables
+        that no ``[VOWEL]`` row lists have no phoneme pair and are dropped, as in
+        ``SyllableView.from_phoneme_syllable_map()``. ``n_fade`` is kept as read, including consonants whose
+        syllables were all dropped.
+
+        :return: Syllable dictionary.
+        :raise ValueError: No syllable has both a vowel and a consonant.
+        """
+        view = SyllableView().from_phoneme_syllable_map(self.left_map, self.right_map)
+        dictionary = SyllableDictionary()
+        dictionary.version = "1.0.0"
+        dictionary.syllable_map = view.get_syllable_map()
+        dictionary.n_fade = self.n_fade
+        dictionary.end_flag = self.end_flag
+        return dictionary
+
+
+def parse_presamp(lines: Iterable[str]) -> PresampData:
+    """
+    Parse ``presamp.ini`` lines in a single pass.
+
+    ``[VOWEL]`` lines have the format ``vowel=alias=syllable,...=volume``, ``[CONSONANT]`` lines have the format
+    ``consonant=syllable,...=crossfade flag`` and ``[ENDFLAG]`` holds a single number. Other sections, comments and
+    blank lines are skipped.
+
+    :param lines: Lines of the file, e.g. an open text file.
+    :return: Parsed data.
+    """
+    data = PresampData()
+    section = ""
+    for raw in lines:
+        line = raw.strip()
+        if not line or line[0] in ";#":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            section = line[1:-1].strip().upper()
+            continue
+
+        if section == "VOWEL":
+            parts = line.split("=")
+            if len(parts) < 2:
+                continue
+            syllables = parts[2] if len(parts) > 2 else parts[1]
+            bucket = data.right_map.setdefault(parts[0], [])
+            bucket.extend(syl for syl in syllables.split(",") if syl)
+        elif section == "CONSONANT":
+            parts = line.split("=")
+            if len(parts) < 2:
+                continue
+            bucket = data.left_map.setdefault(parts[0], [])
+            bucket.extend(syl for syl in parts[1].split(",") if syl)
+            if len(parts) > 2 and parts[2].strip() == "1" and parts[0] not in data.n_fade:
+                data.n_fade.append(parts[0])
+        elif section == "ENDFLAG":
+            try:
+                data.end_flag = int(line) != 0
+            except ValueError:
+                pass
+            section = ""
+    return data
+
+
+def read_presamp(path: str, encoding: str | None = None) -> PresampData:
+    """
+    Read a ``presamp.ini`` file in a single streaming pass.
+
+    :param path: File path.
+    :param encoding: Text encoding. If not given, UTF-8 is tried first and Shift-JIS (cp932), the usual encoding of
+        UTAU files, is used if the file is not valid UTF-8.
+    :return: Parsed data.
+    """
+    if encoding is not None:
+        with open(path, "r", encoding=encoding) as f:
+            return parse_presamp(f)
+    try:
+        with open(path, "r", encoding="utf-8-sig") as f:
+            return parse_presamp(f)
+    except UnicodeDecodeError:
+        with open(path, "r", encoding="cp932") as f:
+            return parse_presamp(f)
+
+
+def write_presamp(f: TextIO, dictionary: SyllableDictionary) -> None:
+    """
+    Write a syllable dictionary as ``presamp.ini``, one line at a time.
+
+    The crossfade flag is a column of the ``[CONSONANT]`` rows, so an ``n_fade`` entry that is not the left phoneme
+    of any syllable has no row to go to and is not written.
+
+    :param f: Output text file.
+    :param dictionary: Syllable dictionary.
+    """
+    view = SyllableView().from_syllable_phoneme_map(dictionary.syllable_map)
+    n_fade = set(dictionary.n_fade)
+
+    f.write(f"[VERSION]\n{PRESAMP_VERSION}\n[VOWEL]\n")
+    for right, syllables in view.get_syl_to_right().items():
+        f.write(f"{right}={right}={','.join(syllables)}={DEFAULT_VOLUME}\n")
+    f.write("[CONSONANT]\n")
+    for left, syllables in view.get_syl_to_left().items():
+        f.write(f"{left}={','.join(syllables)}={1 if left in n_fade else 0}\n")
+    f.write(f"[ENDFLAG]\n{1 if dictionary.end_flag else 0}\n")
+
+
+def write_presamp_file(path: str, dictionary: SyllableDictionary, encoding: str = "utf-8") -> None:
+    """
+    Write a syllable dictionary to a ``presamp.ini`` file.
+
+    :param path: Output file path.
+    :param dictionary: Syllable dictionary.
+    :param encoding: Text encoding.
+    """
+    with open(path, "w", encoding=encoding, buffering=1 << 16) as f:
+        write_presamp(f, dictionary)
@@ -0,0 +1,36 @@
+def split_line(line: str, syllable_map: dict[str, tuple[str, str]]) -> list[str] | None:
+    """
+    Split a reclist line back into syllables.
+
+    Lines are syllables joined by "_", but a syllable name may itself contain "_", so the tokens are matched
+    against the syllable map, preferring the shortest syllable names.
+
+    :param line: Reclist line, e.g. "da_di_du".
+    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}.
+    :return: List of syllables, or None if the line cannot be made of known syllables.
+    """
+    tokens = line.split("_")
+    # best[i] is a split of tokens[:i], or None if there is none.
+    best: list[list[str] | None] = [None] * (len(tokens) + 1)
+    best[0] = []
+    for end in range(1, len(tokens) + 1):
+        for start in range(end - 1, -1, -1):
+            prefix = best[start]
+            if prefix is None:
+                continue
+            name = "_".join(tokens[start:end])
+            if name in syllable_map:
+                best[end] = prefix + [name]
+                break
+    return best[-1] if best[-1] else None
+
+
+def read_reclist(path: str) -> list[str]:
+    """
+    Read the lines of a ``REClist.txt`` file, skipping blank lines.
+
+    :param path: Reclist file path.
+    :return: List of reclist lines.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
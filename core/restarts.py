@@ -0,0 +1,39 @@
+import random
+from collections.abc import Mapping
+
+
+def shuffled_syllable_map(
+        syllable_map: Mapping[str, tuple[str, str]],
+        seed: int,
+        restart: int
+) -> dict[str, tuple[str, str]]:
+    """
+    Get the dictionary order searched by one restart of a multi-start search.
+
+    Restart 0 keeps the original order, so a multi-start search is never worse than a single run. Every other
+    restart shuffles the syllables with a generator seeded from ``seed`` and the restart number only, so each order
+    can be reproduced on its own, in any process.
+
+    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}.
+    :param seed: Seed of the multi-start search.
+    :param restart: Restart number, starting at 0.
+    :return: The syllable map in the order of this restart.
+    """
+    items = list(syllable_map.items())
+    if restart == 0:
+        return dict(items)
+    random.Random(f"{seed}:{restart}").shuffle(items)
+    return dict(items)
+
+
+def reclist_score(summary: dict[str, int]) -> tuple[int, int, int, int]:
+    """
+    Rank a generation result; smaller is better.
+
+    Results are compared by line count first, then redundancy, then the number of not fluent lines, and then by
+    the number of perfectly fluent lines, more being better.
+
+    :param summary: ``Generator.summary()`` of the run.
+    :return: Sort key.
+    """
+    return (summary["lines"], summary["redundancy"], summary["not_fluent"], -summary["perfect_fluent"])
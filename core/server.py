@@ -0,0 +1,273 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import signal
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Any
+
+import tomli
+
+from .compiled import load_dictionary
+from .dictionary import SyllableDictionary
+from .generator import Generator
+from .index import SyllableIndex
+from .options import GenerateOptions
+from .patterns import default_pattern_table
+from .presamp import parse_presamp, write_presamp, write_presamp_file
+from .writers import write_generation
+
+# Number of compiled dictionaries each worker keeps warm.
+_DICTIONARY_CACHE_SIZE = 32
+
+# Largest request line the server accepts, in bytes. Requests carry whole dictionaries.
+_MAX_REQUEST_BYTES = 64 << 20
+
+_worker_dictionaries: OrderedDict[str, tuple[SyllableDictionary, SyllableIndex]] = OrderedDict()
+
+
+def _init_worker() -> None:
+    """Build the pattern tables of every ``max_length`` and ``iter_depth`` the CLI accepts."""
+    default_pattern_table.warm([(p, m) for m in range(2, 9) for p in range(1, m // 2 + 1)])
+
+
+def _load_dictionary(params: dict[str, Any]) -> tuple[SyllableDictionary, SyllableIndex]:
+    """
+    Get the dictionary of a request, compiled, from the worker's cache if its content was seen before.
+
+    :param params: Request parameters with either ``toml`` (dictionary text) or ``input`` (path of a ``.toml`` or
+        compiled ``.srd`` dictionary).
+    :return: Dictionary and its compiled index.
+    :raise ValueError: Neither parameter is given, or the dictionary is invalid.
+    """
+    if "toml" in params:
+        text = params["toml"]
+        key = "text:" + hashlib.sha256(text.encode("utf-8")).hexdigest()
+    elif "input" in params:
+        path = os.path.abspath(params["input"])
+        stat = os.stat(path)
+        key = f"file:{path}:{stat.st_mtime_ns}:{stat.st_size}"
+        text = None
+    else:
+        raise ValueError("The request needs a 'toml' or an 'input' parameter.")
+
+    cached = _worker_dictionaries.get(key)
+    if cached is not None:
+        _worker_dictionaries.move_to_end(key)
+        return cached
+
+    if text is not None:
+        try:
+            data = tomli.loads(text)
+        except tomli.TOMLDecodeError as e:
+            raise ValueError(f"The dictionary is not valid TOML: {e}") from e
+        dictionary, index = SyllableDictionary().from_dict(data), None
+    else:
+        dictionary, index = load_dictionary(params["input"])
+    cached = (dictionary, index if index is not None else SyllableIndex(dictionary.syllable_map))
+    _worker_dictionaries[key] = cached
+    if len(_worker_dictionaries) > _DICTIONARY_CACHE_SIZE:
+        _worker_dictionaries.popitem(last=False)
+    return cached
+
+
+def run_generate(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Handle a ``generate`` request.
+
+    :param params: ``toml`` or ``input``, optional ``options`` (generation parameters as in a batch manifest) and
+        optional ``output`` directory.
+    :return: With ``output``: {"lines", "output"}, the files are written there. Without: {"reclist", "oto",
+        "summary"}.
+    """
+    dictionary, index = _load_dictionary(params)
+    # The worker pool is the parallelism; the search must not start a pool of its own.
+    options = replace(GenerateOptions.from_mapping(params.get("options", {})), jobs=1)
+    generator = Generator(dictionary.syllable_map, index=index)
+
+    output = params.get("output")
+    if output:
+        line_count = write_generation(generator, output, options)
+        write_presamp_file(os.path.join(output, "presamp.ini"), dictionary)
+        return {"lines": line_count, "output": output}
+    reclist, oto = generator.generate(**options.generate_kwargs())
+    return {"reclist": reclist, "oto": oto, "summary": generator.summary()}
+
+
+def run_to_presamp(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Handle a ``to_presamp`` request.
+
+    :param params: ``toml`` or ``input``.
+    :return: {"presamp": presamp.ini text}
+    """
+    dictionary, _ = _load_dictionary(params)
+    f = io.StringIO()
+    write_presamp(f, dictionary)
+    return {"presamp": f.getvalue()}
+
+
+def run_from_presamp(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Handle a ``from_presamp`` request.
+
+    :param params: ``presamp`` (presamp.ini text).
+    :return: {"toml": dictionary text}
+    :raise ValueError: The ``presamp`` parameter is missing.
+    """
+    if "presamp" not in params:
+        raise ValueError("The request needs a 'presamp' parameter.")
+    dictionary = parse_presamp(params["presamp"].splitlines()).to_dictionary()
+    f = io.StringIO()
+    dictionary.write_toml(f)
+    return {"toml": f.getvalue()}
+
+
+async def _send_quietly(send: Callable[[dict[str, Any]], Any], response: dict[str, Any]) -> None:
+    """Send a response, ignoring a connection that has gone away."""
+    try:
+        await send(response)
+    except (ConnectionError, RuntimeError):
+        pass
+
+
+_METHODS: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+    "generate": run_generate,
+    "to_presamp": run_to_presamp,
+    "from_presamp": run_from_presamp,
+}
+
+
+class GenerationServer:
+    """
+    Resident server that answers generation requests over a Unix socket.
+
+    The protocol is one JSON object per line in both directions. A request is
+    ``{"id": ..., "method": ..., "params": {...}, "group": ...}``, and the response carries the same ``id`` with either
+    ``result`` or ``error``. Requests of one connection run concurrently and may be answered out of order.
+
+    Methods are ``generate``, ``to_presamp`` and ``from_presamp`` (see ``run_generate()`` and friends), ``cancel``
+    with ``{"id": ...}`` of a request of the same connection, and ``ping``. A request with a ``group`` cancels the
+    unfinished requests of the same group on its connection, so an editor can tag every request with the document
+    it belongs to and only the newest one is answered. A cancelled request is answered with the error "cancelled";
+    if it already runs, its worker finishes in the background and the result is dropped.
+
+    Work runs on a process pool whose workers keep compiled dictionaries and pattern tables between requests.
+
+    :param socket_path: Path of the Unix socket.
+    :param workers: Number of worker processes, default is the number of CPUs.
+    """
+
+    def __init__(self, socket_path: str, workers: int | None = None) -> None:
+        self.socket_path = socket_path
+        self.workers = workers or os.cpu_count() or 1
+
+    async def serve_forever(self) -> None:
+        """
+        Listen until SIGTERM arrives or the task is cancelled (e.g. by Ctrl+C). The socket file is removed on exit.
+
+        :raise NotImplementedError: The platform has no Unix sockets.
+        """
+        if not hasattr(asyncio, "start_unix_server"):
+            raise NotImplementedError("The server needs Unix domain sockets.")
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+        self._executor = executor
+        server = await asyncio.start_unix_server(
+            self._handle_connection, self.socket_path, limit=_MAX_REQUEST_BYTES)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            loop.remove_signal_handler(signal.SIGTERM)
+            executor.shutdown(wait=False, cancel_futures=True)
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Read requests of one connection until it closes."""
+        lock = asyncio.Lock()
+        tasks: dict[Any, asyncio.Task] = {}
+        groups: dict[Any, Any] = {}
+        replies: set[asyncio.Task] = set()
+
+        async def send(response: dict[str, Any]) -> None:
+            async with lock:
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        def finished(task: asyncio.Task, request_id: Any) -> None:
+            if tasks.get(request_id) is task:
+                del tasks[request_id]
+            if task.cancelled() and not writer.is_closing():
+                # Cancelled before it started, so _run() never got to answer.
+                reply = asyncio.create_task(_send_quietly(send, {"id": request_id, "error": "cancelled"}))
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be a JSON object.")
+                except ValueError as e:
+                    await send({"id": None, "error": f"Invalid request: {e}"})
+                    continue
+
+                request_id = request.get("id")
+                method = request.get("method")
+                params = request.get("params") or {}
+                if method == "ping":
+                    await send({"id": request_id, "result": "pong"})
+                elif method == "cancel":
+                    task = tasks.get(params.get("id"))
+                    cancelled = task is not None and task.cancel()
+                    await send({"id": request_id, "result": {"cancelled": cancelled}})
+                elif method in _METHODS:
+                    group = request.get("group")
+                    if group is not None:
+                        stale = tasks.get(groups.get(group))
+                        if stale is not None:
+                            stale.cancel()
+                        groups[group] = request_id
+                    task = asyncio.create_task(self._run(request_id, _METHODS[method], params, send))
+                    tasks[request_id] = task
+                    task.add_done_callback(lambda done, key=request_id: finished(done, key))
+                else:
+                    await send({"id": request_id, "error": f"Unknown method '{method}'."})
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+
+    async def _run(
+            self,
+            request_id: Any,
+            handler: Callable[[dict[str, Any]], dict[str, Any]],
+            params: dict[str, Any],
+            send: Callable[[dict[str, Any]], Any]
+    ) -> None:
+        """Run one request on the pool and send its response."""
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, handler, params)
+        except asyncio.CancelledError:
+            response = {"id": request_id, "error": "cancelled"}
+        except Exception as e:
+            # Report any failure, including malformed parameters, so one bad request does not go unanswered.
+            response = {"id": request_id, "error": str(e) or type(e).__name__}
+        else:
+            response = {"id": request_id, "result": result}
+        await _send_quietly(send, response)
+
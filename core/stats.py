@@ -0,0 +1,151 @@
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class StageStats:
+    """
+    Measurements of one generation stage.
+
+    :param seconds: Wall time spent inside the stage, excluding time the consumer spends between yielded lines.
+    :param lines: Number of lines the stage committed.
+    :param peak_memory: Peak traced memory in bytes while the stage was active, or None without memory tracing.
+    """
+    seconds: float = 0.0
+    lines: int = 0
+    peak_memory: int | None = None
+
+
+class CountingProxy:
+    """
+    Proxy that counts calls to the methods of the wrapped object. Attribute reads that are not calls pass through.
+
+    :param target: Wrapped object.
+    :param counts: Call counters keyed by method name, updated in place.
+    """
+
+    def __init__(self, target: Any, counts: dict[str, int]) -> None:
+        self._target = target
+        self._counts = counts
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if not callable(attr):
+            return attr
+        counts = self._counts
+
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            counts[name] = counts.get(name, 0) + 1
+            return attr(*args, **kwargs)
+        return counted
+
+
+class GenerationStats:
+    """
+    Instrumentation of a generation run: per-stage wall time, line counts and optional tracemalloc peaks, call counts of
+    ``RLPairView`` operations and free-form counters such as in-turn candidates tried and accepted.
+
+    Pass an instance to ``Generator`` to enable it; a run without stats pays no instrumentation cost.
+
+    :param trace_memory: Record per-stage peak memory with tracemalloc (slows generation down noticeably).
+    :param on_stage_end: Optional hook called with the stage name and its measurements when a stage finishes.
+    """
+
+    def __init__(
+            self,
+            trace_memory: bool = False,
+            on_stage_end: Callable[[str, StageStats], None] | None = None
+    ) -> None:
+        self.trace_memory = trace_memory
+        self.on_stage_end = on_stage_end
+        self.stages: dict[str, StageStats] = {}
+        self.pair_view_calls: dict[str, int] = {}
+        self.counters: dict[str, int] = {}
+        self.result: dict[str, Any] = {}
+
+    def clear(self) -> None:
+        """Drop all measurements, e.g. before a new run."""
+        self.stages = {}
+        self.pair_view_calls = {}
+        self.counters = {}
+        self.result = {}
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Add to a counter.
+
+        :param name: Counter name.
+        :param value: Amount to add.
+        """
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "GenerationStats", prefix: str) -> None:
+        """
+        Add the measurements of a sub-run, e.g. one component or restart solved on its own.
+
+        Counters and pair view calls are added under their own names. Stages are added as ``"<prefix>.<stage>"``;
+        their time is already part of the parent stage ``prefix`` and is not counted again in ``total_seconds``.
+
+        :param other: Measurements of the sub-run.
+        :param prefix: Name of the parent stage.
+        """
+        for name, value in other.counters.items():
+            self.count(name, value)
+        for name, value in other.pair_view_calls.items():
+            self.pair_view_calls[name] = self.pair_view_calls.get(name, 0) + value
+        for name, sub in other.stages.items():
+            stats = self.stages.setdefault(f"{prefix}.{name}", StageStats())
+            stats.seconds += sub.seconds
+            stats.lines += sub.lines
+            if sub.peak_memory is not None:
+                stats.peak_memory = max(stats.peak_memory or 0, sub.peak_memory)
+
+    def wrap(self, name: str, stage: Iterator[T]) -> Iterator[T]:
+        """
+        Measure a stage that yields committed lines.
+
+        :param name: Stage name.
+        :param stage: Stage iterator.
+        :return: An iterator yielding the same items.
+        """
+        stats = self.stages.setdefault(name, StageStats())
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(stage)
+                except StopIteration:
+                    stats.seconds += time.perf_counter() - start
+                    break
+                stats.seconds += time.perf_counter() - start
+                stats.lines += 1
+                yield item
+        finally:
+            if tracing:
+                peak = tracemalloc.get_traced_memory()[1]
+                stats.peak_memory = max(stats.peak_memory or 0, peak)
+            if self.on_stage_end is not None:
+                self.on_stage_end(name, stats)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the measurements to JSON-ready data. ``total_seconds`` sums the top-level stages only, since merged
+        sub-run stages are part of their parent stage.
+
+        :return: {"stages": ..., "total_seconds": ..., "pair_view_calls": ..., "counters": ..., "result": ...}
+        """
+        return {
+            "stages": {name: asdict(stats) for name, stats in self.stages.items()},
+            "total_seconds": sum(stats.seconds for name, stats in self.stages.items() if "." not in name),
+            "pair_view_calls": dict(self.pair_view_calls),
+            "counters": dict(self.counters),
+            "result": dict(self.result),
+        }
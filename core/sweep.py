@@ -0,0 +1,175 @@
+import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from typing import Any
+
+from .generator import Generator
+from .index import SyllableIndex
+from .options import GenerateOptions
+from .patterns import PatternTable
+
+
+@dataclass(slots=True)
+class SweepResult:
+    """
+    Outcome of one configuration of a parameter sweep.
+
+    :param options: Generation parameters.
+    :param summary: ``Generator.summary()`` of the run, empty if it failed.
+    :param seconds: Wall time of ``Generator.generate``.
+    :param error: Error message if the run failed, None otherwise.
+    :param pareto: Whether no other configuration is at least as good in every objective and better in one.
+    """
+    options: GenerateOptions
+    summary: dict[str, int]
+    seconds: float
+    error: str | None = None
+    pareto: bool = False
+
+    def objectives(self) -> tuple[float, ...]:
+        """
+        Get the values to minimize: line count, redundancy, non-fluent line count and runtime.
+
+        :return: Objective vector.
+        """
+        return (self.summary["lines"], self.summary["redundancy"], self.summary["not_fluent"], self.seconds)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert to JSON-ready data.
+
+        :return: Result record.
+        """
+        return {"options": asdict(self.options), "summary": self.summary, "seconds": self.seconds,
+                "error": self.error, "pareto": self.pareto}
+
+
+def build_grid(
+        base: GenerateOptions,
+        max_lengths: list[int],
+        iter_depths: list[int | None],
+        max_redundancies: list[int],
+        sss_first: list[bool]
+) -> list[GenerateOptions]:
+    """
+    Build the sweep grid. Settings that resolve to the same effective parameters are only kept once.
+
+    :param base: Options for the parameters that are not swept.
+    :return: List of options in grid order.
+    """
+    grid = []
+    seen = set()
+    for max_length, iter_depth, max_redundancy, sss in itertools.product(
+            max_lengths, iter_depths, max_redundancies, sss_first):
+        options = replace(base, max_length=max_length, iter_depth=iter_depth,
+                          max_redundancy=max_redundancy, sss_first=sss, jobs=1)
+        key = (max_length, options.get_iter_depth(), max_redundancy, sss)
+        if key not in seen:
+            seen.add(key)
+            grid.append(options)
+    return grid
+
+
+_worker_syllable_map: dict[str, tuple[str, str]] = {}
+_worker_index: SyllableIndex | None = None
+_worker_pattern_table: PatternTable | None = None
+
+
+def _init_worker(
+        syllable_map: dict[str, tuple[str, str]],
+        index: SyllableIndex,
+        pattern_table: PatternTable
+) -> None:
+    """Install the dictionary, its compiled index and the pattern table shared by the parent process."""
+    global _worker_syllable_map, _worker_index, _worker_pattern_table
+    _worker_syllable_map = syllable_map
+    _worker_index = index
+    _worker_pattern_table = pattern_table
+
+
+def run_sweep_case(options: GenerateOptions) -> SweepResult:
+    """
+    Run one configuration on the dictionary installed by ``_init_worker()``.
+
+    :param options: Generation parameters.
+    :return: Result of the configuration.
+    """
+    generator = Generator(_worker_syllable_map, _worker_pattern_table, index=_worker_index)
+    start = time.perf_counter()
+    try:
+        generator.generate(**options.generate_kwargs())
+    except ValueError as e:
+        return SweepResult(options, {}, time.perf_counter() - start, str(e))
+    return SweepResult(options, generator.summary(), time.perf_counter() - start)
+
+
+def mark_pareto(results: list[SweepResult]) -> None:
+    """
+    Flag the Pareto-optimal results in place. Failed runs are never optimal.
+
+    :param results: Sweep results.
+    """
+    valid = [result for result in results if result.error is None]
+    for result in valid:
+        mine = result.objectives()
+        result.pareto = not any(
+            other is not result
+            and all(a <= b for a, b in zip(theirs, mine))
+            and theirs != mine
+            for other in valid
+            for theirs in (other.objectives(),)
+        )
+
+
+def run_sweep(
+        syllable_map: dict[str, tuple[str, str]],
+        grid: list[GenerateOptions],
+        workers: int = 1
+) -> list[SweepResult]:
+    """
+    Run every configuration of a grid on one dictionary across a process pool.
+
+    The dictionary, its compiled ``SyllableIndex`` and a pattern table warmed for the whole grid are sent to each
+    worker once, not once per configuration.
+
+    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}.
+    :param grid: Configurations to run.
+    :param workers: Number of worker processes.
+    :return: One result per configuration in grid order, with Pareto-optimal results flagged.
+    """
+    index = SyllableIndex(syllable_map)
+    pattern_table = PatternTable().warm([options.pattern_key() for options in grid])
+    if workers <= 1 or len(grid) <= 1:
+        _init_worker(syllable_map, index, pattern_table)
+        results = [run_sweep_case(options) for options in grid]
+    else:
+        with ProcessPoolExecutor(
+                max_workers=min(workers, len(grid)),
+                initializer=_init_worker,
+                initargs=(syllable_map, index, pattern_table)
+        ) as executor:
+            results = list(executor.map(run_sweep_case, grid))
+    mark_pareto(results)
+    return results
+
+
+def format_sweep_report(results: list[SweepResult]) -> str:
+    """
+    Format sweep results as a plain text table. Pareto-optimal rows are marked with "*".
+
+    :param results: Sweep results.
+    :return: Table text.
+    """
+    rows = ["   length  depth  redundancy  sss    lines  redu  perfect  in_turn  not_fluent  time (s)"]
+    for result in sorted(results, key=lambda r: (not r.pareto, r.summary.get("lines", 0), r.seconds)):
+        options = result.options
+        head = (f"{'*' if result.pareto else ' '}  {options.max_length:>6}  {options.get_iter_depth():>5}  "
+                f"{options.max_redundancy:>10}  {'yes' if options.sss_first else 'no':<3}")
+        if result.error:
+            rows.append(f"{head}  error: {result.error}")
+            continue
+        summary = result.summary
+        rows.append(f"{head}  {summary['lines']:>7}  {summary['redundancy']:>4}  {summary['perfect_fluent']:>7}  "
+                    f"{summary['in_turn_fluent']:>7}  {summary['not_fluent']:>10}  {result.seconds:>8.3f}")
+    return "\n".join(rows)
@@ -0,0 +1,214 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Literal
+
+import numpy as np
+
+from .index import SyllableIndex
+from .reclist import split_line
+
+Mode = Literal["CVVC", "VCV", "VCV_WITH_VC"]
+
+
+@dataclass(slots=True)
+class CoverageReport:
+    """
+    Result of a coverage check.
+
+    Unit names are oto.ini aliases: "- da" (start), "da" (CV), "a d" (VC), "a da" (VCV) and "a -" (end).
+
+    :param mode: Checked mode.
+    :param lines: Number of checked lines, including invalid ones.
+    :param required: Number of units the mode requires.
+    :param covered: Number of required units recorded at least once.
+    :param missing: Required units that no line records, in unit order.
+    :param duplicated: Required units recorded more than once, with their count.
+    :param invalid_lines: Lines that cannot be split into known syllables.
+    """
+    mode: Mode
+    lines: int = 0
+    required: int = 0
+    covered: int = 0
+    missing: list[str] = field(default_factory=list)
+    duplicated: dict[str, int] = field(default_factory=dict)
+    invalid_lines: list[str] = field(default_factory=list)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every required unit is covered and every line is valid."""
+        return not self.missing and not self.invalid_lines
+
+    @property
+    def repeated_recordings(self) -> int:
+        """
+        Number of recordings of required units beyond the first, over all unit kinds. This is not the generator's
+        ``redundancy``, which only counts syllables recorded again at a non-start position.
+        """
+        return sum(self.duplicated.values()) - len(self.duplicated)
+
+
+class CoverageValidator:
+    """
+    Check which units a reclist records, in one linear pass.
+
+    The units of a dictionary are compiled once into a dense ID space: one block each for starts, CVs, ends, VCs
+    and VCVs. The units a mode requires form a boolean mask over that space. A check maps every line to unit IDs,
+    counts them with a single ``np.bincount`` and compares the counts with the mask, so its cost is linear in the
+    size of the reclist.
+
+    Required units per mode:
+
+    - CVVC: every syllable as start ("- S") and as CV ("S"), every right phoneme as end ("R -"), and the VC
+      "R L" of every syllable (L, R), the same pairs ``RLPairView`` tracks. Which VC a line records is taken from
+      ``SyllableIndex.line_vcs()``, the definition the generator's bookkeeping uses as well.
+    - VCV: every syllable as start, every right phoneme as end, and every right phoneme followed by every syllable
+      ("R S").
+    - VCV_WITH_VC: the VCV units plus the CVVC VCs.
+
+    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}, or its compiled index.
+    :param mode: Recording list mode.
+    """
+
+    def __init__(self, syllable_map: dict[str, tuple[str, str]] | SyllableIndex, mode: Mode = "CVVC") -> None:
+        if mode not in ("CVVC", "VCV", "VCV_WITH_VC"):
+            raise ValueError(f"Unknown mode '{mode}'.")
+        index = syllable_map if isinstance(syllable_map, SyllableIndex) else SyllableIndex(syllable_map)
+        self.mode = mode
+        self._index = index
+
+        num_syl = len(index.syllable_table)
+        num_lefts = len(index.left_table)
+        num_rights = len(index.right_table)
+        self._cv = num_syl
+        self._end = 2 * num_syl
+        self._vc = self._end + num_rights
+        self._vcv = self._vc + num_rights * num_lefts
+        self._size = self._vcv + num_rights * num_syl
+
+        syl_ids = np.arange(num_syl)
+        pairs = np.array([index.pair_of(syl_id) for syl_id in range(num_syl)], dtype=np.intp).reshape(-1, 2)
+        required = np.zeros(self._size, dtype=bool)
+        required[syl_ids] = True
+        required[self._end:self._vc] = True
+        if mode in ("CVVC", "VCV_WITH_VC"):
+            required[self._vc + pairs[:, 1] * num_lefts + pairs[:, 0]] = True
+        if mode == "CVVC":
+            required[self._cv + syl_ids] = True
+        else:
+            required[self._vcv:] = True
+        self._required = required
+
+        # Per syllable ID: left ID and right ID, for building unit IDs of a line.
+        self._lefts = pairs[:, 0].tolist()
+        self._rights = pairs[:, 1].tolist()
+
+    def line_units(self, syl_ids: list[int]) -> list[int]:
+        """
+        Get the unit IDs one line records.
+
+        :param syl_ids: Syllable IDs of the line, in order.
+        :return: Unit IDs, one per recorded unit.
+        """
+        lefts = self._lefts
+        rights = self._rights
+        num_lefts = len(self._index.left_table)
+        num_syl = len(lefts)
+        vcv_mode = self.mode != "CVVC"
+        vc_mode = self.mode != "VCV"
+
+        units = [syl_ids[0]]
+        if vc_mode:
+            units.extend(self._vc + right_id * num_lefts + left_id
+                         for left_id, right_id in self._index.line_vcs(syl_ids))
+        prev_right = rights[syl_ids[0]]
+        for syl_id in syl_ids[1:]:
+            if vcv_mode:
+                units.append(self._vcv + prev_right * num_syl + syl_id)
+            else:
+                units.append(self._cv + syl_id)
+            prev_right = rights[syl_id]
+        units.append(self._end + prev_right)
+        return units
+
+    def validate(self, lines: Iterable[str]) -> CoverageReport:
+        """
+        Check a reclist.
+
+        :param lines: Reclist lines, e.g. from ``read_reclist()``.
+        :return: Coverage report.
+        """
+        report = CoverageReport(self.mode)
+        syllables = self._index.syllable_table
+        id_of = syllables.id_of
+        syllable_map = self._index.syllable_map
+
+        units: list[int] = []
+        for line in lines:
+            report.lines += 1
+            tokens = line.split("_")
+            syl_ids = [id_of(token) for token in tokens]
+            if None in syl_ids:
+                # Syllable names may contain "_"; fall back to the exact split.
+                names = split_line(line, syllable_map)
+                if names is None:
+                    report.invalid_lines.append(line)
+                    continue
+                syl_ids = [id_of(name) for name in names]
+            units.extend(self.line_units(syl_ids))
+
+        counts = np.bincount(np.array(units, dtype=np.intp), minlength=self._size)
+        required = self._required
+        report.required = int(required.sum())
+        report.covered = int((required & (counts > 0)).sum())
+        report.missing = [self.unit_name(int(u)) for u in np.flatnonzero(required & (counts == 0))]
+        report.duplicated = {self.unit_name(int(u)): int(counts[u])
+                             for u in np.flatnonzero(required & (counts > 1))}
+        return report
+
+    def unit_name(self, unit: int) -> str:
+        """
+        Get the oto.ini alias of a unit ID.
+
+        :param unit: Unit ID.
+        :return: Alias such as "- da", "da", "a d", "a da" or "a -".
+        """
+        index = self._index
+        syllable = index.syllable_table.name_of
+        left = index.left_table.name_of
+        right = index.right_table.name_of
+        if unit < self._cv:
+            return f"- {syllable(unit)}"
+        if unit < self._end:
+            return syllable(unit - self._cv)
+        if unit < self._vc:
+            return f"{right(unit - self._end)} -"
+        if unit < self._vcv:
+            right_id, left_id = divmod(unit - self._vc, len(index.left_table))
+            return f"{right(right_id)} {left(left_id)}"
+        right_id, syl_id = divmod(unit - self._vcv, len(index.syllable_table))
+        return f"{right(right_id)} {syllable(syl_id)}"
+
+
+def format_coverage_report(report: CoverageReport, limit: int = 20) -> str:
+    """
+    Format a coverage report as plain text.
+
+    :param report: Coverage report.
+    :param limit: Maximum number of units or lines listed per section.
+    :return: Report text.
+    """
+    rows = [
+        f"{report.mode}: {report.covered}/{report.required} units covered by {report.lines} lines, "
+        f"{len(report.missing)} missing, {len(report.duplicated)} duplicated ({report.repeated_recordings} repeated recordings).",
+    ]
+    sections = [
+        ("Missing", report.missing),
+        ("Duplicated", [f"{unit} (x{count})" for unit, count in report.duplicated.items()]),
+        ("Invalid lines", report.invalid_lines),
+    ]
+    for title, items in sections:
+        if not items:
+            continue
+        more = f", ... {len(items) - limit} more" if len(items) > limit else ""
+        rows.append(f"{title}: {', '.join(items[:limit])}{more}")
+    return "\n".join(rows)
@@ -0,0 +1,188 @@
+from collections import deque
+from dataclasses import dataclass, field
+
+from .index import SyllableIndex
+
+
+@dataclass(slots=True)
+class TransitionCover:
+    """
+    Result of a VCV transition covering run.
+
+    :param lines: Lines as tuples of syllable IDs.
+    :param lower_bound: A lower bound on the number of lines any cover can reach.
+    :param repeated_transitions: Number of transitions recorded a second time to link two parts of the cover.
+    :param repeated_starts: Number of lines whose first syllable already starts another line.
+    """
+    lines: list[tuple[int, ...]] = field(default_factory=list)
+    lower_bound: int = 0
+    repeated_transitions: int = 0
+    repeated_starts: int = 0
+
+    @property
+    def gap(self) -> int:
+        """Number of lines between this cover and the lower bound (0 means provably minimal)."""
+        return len(self.lines) - self.lower_bound
+
+
+def euler_circuit(index: SyllableIndex) -> tuple[int, list[tuple[int, int]]]:
+    """
+    Find a closed walk through the VCV transition graph that uses every transition exactly once, plus as few
+    linking edges as possible.
+
+    The vertices are the right phonemes. Every right phoneme R has an edge to R(S), labelled S, for every syllable
+    S, so each edge is one "R S" transition. A vertex has out-degree |S| and in-degree |R| times the number of
+    syllables that end in it. Each surplus in-edge is balanced by a linking edge to a vertex with surplus
+    out-edges. Every vertex can reach every other one through some syllable, so linking edges can always be
+    recorded as a repeated transition, or dropped where a line ends. Hierholzer's algorithm then finds an
+    Eulerian circuit. Edges are generated on the fly from a per-vertex cursor, so the run time is O(|R| |S|) and
+    the graph is never stored.
+
+    :param index: Compiled syllable index.
+    :return: The start right ID and the edges of the circuit as (target right ID, syllable ID or -1 for a linking
+        edge).
+    """
+    num_nodes = len(index.right_table)
+    num_syl = len(index.syllable_table)
+    right_of = [index.pair_of(syl_id)[1] for syl_id in range(num_syl)]
+
+    surplus_out: list[int] = []
+    surplus_in: list[int] = []
+    for node in range(num_nodes):
+        excess = num_syl - num_nodes * len(index.syllables_for_right(node))
+        if excess > 0:
+            surplus_out.extend([node] * excess)
+        elif excess < 0:
+            surplus_in.extend([node] * -excess)
+    links: list[list[int]] = [[] for _ in range(num_nodes)]
+    for source, target in zip(surplus_in, surplus_out):
+        links[source].append(target)
+
+    cursor = [0] * num_nodes
+
+    def next_edge(node: int) -> tuple[int, int] | None:
+        """Take an unused edge out of ``node``."""
+        syl_id = cursor[node]
+        if syl_id < num_syl:
+            cursor[node] = syl_id + 1
+            return (right_of[syl_id], syl_id)
+        if links[node]:
+            return (links[node].pop(), -1)
+        return None
+
+    start = surplus_out[0] if surplus_out else 0
+    stack = [(start, -1)]
+    circuit: list[tuple[int, int]] = []
+    while stack:
+        edge = next_edge(stack[-1][0])
+        if edge is None:
+            circuit.append(stack.pop())
+        else:
+            stack.append(edge)
+    circuit.reverse()
+    return (start, circuit[1:])
+
+
+def lower_bound(index: SyllableIndex, max_length: int) -> int:
+    """
+    Get a lower bound on the number of lines of any VCV reclist of a dictionary.
+
+    Every syllable must start a line, and a line records at most ``max_length - 1`` of the ``|R| |S|``
+    transitions. A line is also a walk in the graph of ``euler_circuit()``, so it can only absorb one unit of the
+    imbalance D, the total surplus of out-edges over in-edges, and a transition recorded a second time absorbs at
+    most one more. k lines with r repeated transitions therefore need ``k + r >= D`` and
+    ``k (max_length - 1) >= |R| |S| + r``, so k is at least the smaller of D and ``(|R| |S| + D) / max_length``.
+
+    :param index: Compiled syllable index.
+    :param max_length: Maximum line length, at least 2.
+    :return: The largest of the three bounds.
+    """
+    num_nodes = len(index.right_table)
+    num_syl = len(index.syllable_table)
+    transitions = num_nodes * num_syl
+    imbalance = sum(max(num_syl - num_nodes * len(index.syllables_for_right(node)), 0)
+                    for node in range(num_nodes))
+    step = max_length - 1
+    return max(num_syl, -(-transitions // step), min(imbalance, -(-(transitions + imbalance) // max_length)))
+
+
+def cover_transitions(index: SyllableIndex, max_length: int) -> TransitionCover:
+    """
+    Build VCV lines that record every "R S" transition, every syllable as a start and every right phoneme as an
+    end.
+
+    The circuit from ``euler_circuit()`` is cut into walks of at most ``max_length - 1`` transitions. A walk that
+    starts at right phoneme R becomes a line by putting a syllable that ends in R in front of it. Unused start
+    syllables are preferred. A linking edge ends the current walk if at most one transition would still fit.
+    Otherwise it is recorded as a repeated transition, so walks stay full. Starts and ends that no walk covers get
+    one-syllable lines. The line count is compared against ``lower_bound()``.
+
+    :param index: Compiled syllable index.
+    :param max_length: Maximum line length, at least 2.
+    :return: The lines and their lower bound.
+    :raise ValueError: ``max_length`` is less than 2.
+    """
+    if max_length < 2:
+        raise ValueError("A VCV line needs room for at least 2 syllables.")
+    num_nodes = len(index.right_table)
+    num_syl = len(index.syllable_table)
+    step = max_length - 1
+    cover = TransitionCover()
+    cover.lower_bound = lower_bound(index, max_length)
+
+    unused_starts = [deque(index.syllables_for_right(node)) for node in range(num_nodes)]
+    used_starts = [False] * num_syl
+    ends_left = set(range(num_nodes))
+    # Repeated starts and linking edges cycle through the syllables of a right phoneme, so repeats are spread out.
+    repeat_cursor = [0] * num_nodes
+
+    def next_syllable(node: int) -> int:
+        candidates = index.syllables_for_right(node)
+        syl_id = candidates[repeat_cursor[node] % len(candidates)]
+        repeat_cursor[node] += 1
+        return syl_id
+
+    def add_line(syl_ids: tuple[int, ...]) -> None:
+        first = syl_ids[0]
+        if used_starts[first]:
+            cover.repeated_starts += 1
+        used_starts[first] = True
+        ends_left.discard(index.pair_of(syl_ids[-1])[1])
+        cover.lines.append(syl_ids)
+
+    def take_start(node: int) -> int:
+        starts = unused_starts[node]
+        while starts:
+            syl_id = starts.popleft()
+            if not used_starts[syl_id]:
+                return syl_id
+        return next_syllable(node)
+
+    node, edges = euler_circuit(index)
+    walk_start = node
+    walk: list[int] = []
+    for target, syl_id in edges:
+        if syl_id < 0:
+            if step - len(walk) <= 1:
+                if walk:
+                    add_line((take_start(walk_start),) + tuple(walk))
+                    walk = []
+                walk_start = node = target
+                continue
+            syl_id = next_syllable(target)
+            cover.repeated_transitions += 1
+        walk.append(syl_id)
+        node = target
+        if len(walk) == step:
+            add_line((take_start(walk_start),) + tuple(walk))
+            walk = []
+            walk_start = node
+    if walk:
+        add_line((take_start(walk_start),) + tuple(walk))
+
+    for syl_id in range(num_syl):
+        if not used_starts[syl_id]:
+            add_line((syl_id,))
+    for node in sorted(ends_left):
+        add_line((take_start(node),))
+    return cover
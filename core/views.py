@@ -1,5 +1,11 @@
+import heapq
+from collections.abc import Collection, Iterator, KeysView, Mapping, Sequence
+from itertools import islice
 from typing import Self
 
+from .index import SyllableIndex
+from .interning import SymbolTable
+
 
 class SyllableView:
     """
@@ -12,8 +18,8 @@ class SyllableView:
     def __init__(self) -> None:
         self._syllable_map: dict[str, tuple[str, str]] = {}
 
-        self._syl_to_left_map: dict[str, list[str]] = {}
-        self._syl_to_right: dict[str, list[str]] = {}
+        self._syl_to_left_map: dict[str, list[str]] | None = None
+        self._syl_to_right: dict[str, list[str]] | None = None
 
     def from_syllable_phoneme_map(self, syllable_map: dict[str, tuple[str, str]]) -> Self:
         """
@@ -31,6 +37,16 @@ class SyllableView:
         """
         Build mapping tables from phonemes to syllables.
 
+        The syllables are ordered so that ``get_syl_to_left()`` and ``get_syl_to_right()`` list the phonemes and
+        their syllables in the order of ``left_map`` and ``right_map``, so tables written from a syllable map read
+        back into the same tables. Each table row and the order of the first syllables of the rows constrain the
+        order, and the constraints are merged topologically (Kahn's algorithm), ties going to the order of
+        ``left_map``. Rows that contradict each other cannot all be kept; their syllables then follow in the order
+        of ``left_map``. O(n log n).
+
+        A syllable listed in only one table has no phoneme pair and is dropped: a pure vowel without a consonant
+        row, or a syllable of a consonant row that no vowel row lists.
+
         :param left_map: Left phoneme table in the format {left: [syllable]}.
         :param right_map: Right phoneme table in the format {right: [syllable]}.
 
@@ -42,12 +58,51 @@ class SyllableView:
                         syllables in right_map.items() for syl in syllables}
 
         new_map = {syl: (syl_to_left[syl], syl_to_right[syl])
-                   for syl in syl_to_left}
+                   for syl in syl_to_left if syl in syl_to_right}
 
         self._set_to_empty()
-        self._syllable_map = new_map
+        self._syllable_map = {syl: new_map[syl] for syl in self._merge_rows(new_map, left_map, right_map)}
         return self
 
+    @staticmethod
+    def _merge_rows(
+            syllable_map: dict[str, tuple[str, str]],
+            left_map: dict[str, list[str]],
+            right_map: dict[str, list[str]]
+    ) -> list[str]:
+        """Order the syllables of ``syllable_map`` consistently with the rows of both tables, see above."""
+        rank = {syl: n for n, syl in enumerate(syllable_map)}
+        successors: dict[str, list[str]] = {syl: [] for syl in rank}
+        indegree = dict.fromkeys(rank, 0)
+
+        def chain(syllables: list[str]) -> None:
+            for before, after in zip(syllables, syllables[1:]):
+                successors[before].append(after)
+                indegree[after] += 1
+
+        for table, side in ((left_map, 0), (right_map, 1)):
+            rows = [[syl for syl in dict.fromkeys(syllables) if syllable_map.get(syl, ("", ""))[side] == phoneme]
+                    for phoneme, syllables in table.items()]
+            rows = [row for row in rows if row]
+            for row in rows:
+                chain(row)
+            chain([row[0] for row in rows])
+
+        ready = [(rank[syl], syl) for syl, degree in indegree.items() if not degree]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, syl = heapq.heappop(ready)
+            order.append(syl)
+            for after in successors[syl]:
+                indegree[after] -= 1
+                if not indegree[after]:
+                    heapq.heappush(ready, (rank[after], after))
+        if len(order) < len(rank):
+            placed = set(order)
+            order.extend(syl for syl in rank if syl not in placed)
+        return order
+
     def get_syllable_map(self) -> dict[str, tuple[str, str]]:
         """
         Get the syllable map.
@@ -64,7 +119,7 @@ class SyllableView:
         :return: {left: [syllable]}
         """
         self._check()
-        if not self._syl_to_left_map:
+        if self._syl_to_left_map is None:
             _map = {}
             for syl, (left, _) in self._syllable_map.items():
                 _map.setdefault(left, []).append(syl)
@@ -78,7 +133,7 @@ class SyllableView:
         :return: {right: [syllable]}
         """
         self._check()
-        if not self._syl_to_right:
+        if self._syl_to_right is None:
             _map = {}
             for syl, (_, right) in self._syllable_map.items():
                 _map.setdefault(right, []).append(syl)
@@ -97,24 +152,224 @@ class SyllableView:
 
     def _set_to_empty(self) -> None:
         """Clear the instance."""
-        self._syl_to_left_map = {}
-        self._syl_to_right = {}
+        self._syl_to_left_map = None
+        self._syl_to_right = None
+
+
+class PhonemeView(Collection[str]):
+    """
+    Read-only, copy-free view of the phonemes currently paired with a phoneme in an ``RLPairView``.
+
+    The view reflects later changes to the pair view, so it must not be kept across removals
+    when a stable snapshot is needed (use ``list(view)`` instead).
+
+    :param ids: Live adjacency of interned phoneme IDs.
+    :param table: Symbol table used to resolve IDs back to names.
+    """
+
+    __slots__ = ("_ids", "_table")
+
+    def __init__(self, ids: dict[int, None], table: SymbolTable) -> None:
+        self._ids = ids
+        self._table = table
+
+    def __iter__(self) -> Iterator[str]:
+        name_of = self._table.name_of
+        return (name_of(_id) for _id in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, str):
+            return False
+        _id = self._table.id_of(name)
+        return _id is not None and _id in self._ids
+
+    def first(self, count: int) -> list[str]:
+        """
+        Get at most ``count`` phonemes from the front of the view.
+
+        :param count: Number of phonemes.
+        :return: List of phonemes in view order.
+        """
+        name_of = self._table.name_of
+        return [name_of(_id) for _id in islice(self._ids, count)]
+
+
+class _Buckets:
+    """
+    Phoneme IDs of one side of an ``RLPairView`` in buckets by their number of uncombined partners.
+
+    Every bucket is a circular doubly linked list over arrays, in the order the IDs reached its count. Moving an ID
+    is O(1) and returns the neighbours it was unlinked from, so undoing the moves in reverse order relinks every ID
+    at its old position (as in dancing links).
+
+    :param counts: Partner count of every phoneme ID; IDs are linked in ID order within a bucket.
+    """
+
+    __slots__ = ("_heads", "_next", "_prev", "top")
+
+    def __init__(self, counts: list[int]) -> None:
+        # Nodes 0 to len(counts) - 1 are phoneme IDs, node _heads + c is the head of bucket c.
+        self._heads = len(counts)
+        self.top = max(counts, default=0)
+        self._next = list(range(self._heads + self.top + 1))
+        self._prev = list(self._next)
+        for _id, count in enumerate(counts):
+            if count:
+                self._link(_id, count)
+
+    def top_ids(self, count: int) -> list[int]:
+        """
+        Collect up to ``count`` IDs from the fullest buckets, tightening ``top`` on the way.
+
+        :param count: Number of IDs.
+        :return: IDs, most partners first.
+        """
+        heads, nxt = self._heads, self._next
+        while self.top > 0 and nxt[heads + self.top] == heads + self.top:
+            self.top -= 1
+        ids: list[int] = []
+        for c in range(self.top, 0, -1):
+            node = nxt[heads + c]
+            while node != heads + c:
+                if len(ids) == count:
+                    return ids
+                ids.append(node)
+                node = nxt[node]
+        return ids
+
+    def move(self, _id: int, after: int) -> tuple[int, int]:
+        """
+        Move an ID out of its bucket to the end of the bucket of ``after`` partners, or drop it if ``after`` is 0.
+
+        :param _id: Phoneme ID.
+        :param after: New partner count.
+        :return: The neighbours the ID was unlinked from, for ``undo_move()``.
+        """
+        links = (self._prev[_id], self._next[_id])
+        self._unlink(_id)
+        if after:
+            self._link(_id, after)
+        return links
+
+    def undo_move(self, _id: int, before: int, after: int, links: tuple[int, int]) -> None:
+        """
+        Undo the latest ``move()`` that is not undone yet.
+
+        :param _id: Phoneme ID.
+        :param before: Partner count before the move.
+        :param after: Partner count the move was to.
+        :param links: Result of the move.
+        """
+        if after:
+            self._unlink(_id)
+        prev, nxt = links
+        self._prev[_id], self._next[_id] = links
+        self._next[prev] = _id
+        self._prev[nxt] = _id
+        self.top = max(self.top, before)
+
+    def _link(self, _id: int, count: int) -> None:
+        """Append an ID to the bucket of ``count`` partners."""
+        head = self._heads + count
+        last = self._prev[head]
+        self._next[last] = _id
+        self._prev[_id] = last
+        self._next[_id] = head
+        self._prev[head] = _id
+
+    def _unlink(self, _id: int) -> None:
+        """Take an ID out of its bucket."""
+        prev, nxt = self._prev[_id], self._next[_id]
+        self._next[prev] = nxt
+        self._prev[nxt] = prev
 
 
 class RLPairView:
     """
     Phoneme pair view that maintains uncombined phoneme pairs and can be operated from multiple perspectives.
 
-    :param syllable_map: Syllable mapping table in the format {syllable: (left, right)}.
+    Left phonemes, right phonemes and syllables are interned into dense integer IDs by a ``SyllableIndex``. The
+    adjacency in both directions is an insertion-ordered ``dict[int, None]`` per phoneme ID, so removing a pair is
+    O(1) while the iteration order stays the same as the order in the syllable map. Only the adjacency is copied
+    per view; symbol tables and syllable lookups are shared with the index.
+
+    ``checkpoint()``, ``rollback()`` and ``release()`` let a search try a line and take it back exactly, logging
+    every removal instead of copying the view.
+
+    Phonemes are also kept in buckets by their number of uncombined partners, updated with every removal, so
+    ``top_left_ids()`` and ``top_right_ids()`` find the phonemes with the most partners without scanning.
+
+    :param source: A compiled ``SyllableIndex``, or a syllable mapping table in the format {syllable: (left, right)}
+        to compile one from.
     """
 
-    def __init__(self, syllable_map: dict[str, tuple[str, str]]):
-        self._right_to_lefts = {}
-        self._left_to_rights = {}
+    def __init__(self, source: SyllableIndex | dict[str, tuple[str, str]]):
+        index = source if isinstance(source, SyllableIndex) else SyllableIndex(source)
+        self._index = index
+        self._lefts = index.left_table
+        self._rights = index.right_table
+        self._syllables = index.syllable_table
+
+        self._right_to_lefts: list[dict[int, None]] = [
+            dict.fromkeys(index.left_ids_for_right(_id)) for _id in range(len(self._rights))]
+        self._left_to_rights: list[dict[int, None]] = [
+            dict.fromkeys(index.right_ids_for_left(_id)) for _id in range(len(self._lefts))]
+
+        # Phoneme IDs that still have at least one uncombined partner, in first-seen order.
+        self._live_rights: dict[int, None] = dict.fromkeys(range(len(self._rights)))
+        self._live_lefts: dict[int, None] = dict.fromkeys(range(len(self._lefts)))
+
+        # Partner-count index of both sides.
+        self._left_buckets = _Buckets(list(map(len, self._left_to_rights)))
+        self._right_buckets = _Buckets(list(map(len, self._right_to_lefts)))
+
+        # Undo log of the removals since the outermost open checkpoint, as (left ID, right ID, left bucket links,
+        # right bucket links), and the start of every open checkpoint in it.
+        self._undo_log: list[tuple[int, int, tuple[int, int], tuple[int, int]]] = []
+        self._levels: list[int] = []
+        # Position of every partner in the original adjacency order, built by the first checkpoint.
+        self._ranks: tuple[list[dict[int, int]], list[dict[int, int]]] | None = None
+
+    @property
+    def index(self) -> SyllableIndex:
+        """The compiled index the view was built from."""
+        return self._index
+
+    @property
+    def left_table(self) -> SymbolTable:
+        """Symbol table of left phonemes."""
+        return self._lefts
+
+    @property
+    def right_table(self) -> SymbolTable:
+        """Symbol table of right phonemes."""
+        return self._rights
+
+    @property
+    def syllable_table(self) -> SymbolTable:
+        """Symbol table of syllables."""
+        return self._syllables
+
+    def top_left_ids(self, count: int) -> list[int]:
+        """
+        Get the left phonemes with the most uncombined partners.
+
+        :param count: Number of phonemes to get.
+        :return: Up to ``count`` left phoneme IDs, most partners first; ties in the order they reached that count.
+        """
+        return self._left_buckets.top_ids(count)
+
+    def top_right_ids(self, count: int) -> list[int]:
+        """
+        Get the right phonemes with the most uncombined partners.
 
-        for syl, (left, right) in syllable_map.items():
-            self._right_to_lefts.setdefault(right, []).append(left)
-            self._left_to_rights.setdefault(left, []).append(right)
+        :param count: Number of phonemes to get.
+        :return: Up to ``count`` right phoneme IDs, most partners first; ties in the order they reached that count.
+        """
+        return self._right_buckets.top_ids(count)
 
     def get_lefts_for_right(self, right: str) -> list[str]:
         """
@@ -123,7 +378,7 @@ class RLPairView:
         :param right: Right phoneme.
         :return: List of left phonemes.
         """
-        return self._right_to_lefts.get(right, []).copy()
+        return list(self.lefts_for_right(right))
 
     def get_rights_for_left(self, left: str) -> list[str]:
         """
@@ -132,7 +387,67 @@ class RLPairView:
         :param left: Left phoneme.
         :return: List of right phonemes.
         """
-        return self._left_to_rights.get(left, []).copy()
+        return list(self.rights_for_left(left))
+
+    def lefts_for_right(self, right: str) -> PhonemeView:
+        """
+        Get a read-only view of the left phonemes that are not combined with the given right phoneme.
+
+        :param right: Right phoneme.
+        :return: Copy-free view of left phonemes.
+        """
+        right_id = self._rights.id_of(right)
+        ids = self._right_to_lefts[right_id] if right_id is not None else {}
+        return PhonemeView(ids, self._lefts)
+
+    def rights_for_left(self, left: str) -> PhonemeView:
+        """
+        Get a read-only view of the right phonemes that are not combined with the given left phoneme.
+
+        :param left: Left phoneme.
+        :return: Copy-free view of right phonemes.
+        """
+        left_id = self._lefts.id_of(left)
+        ids = self._left_to_rights[left_id] if left_id is not None else {}
+        return PhonemeView(ids, self._rights)
+
+    def count_lefts_for_right(self, right: str) -> int:
+        """
+        Get the number of left phonemes that are not combined with the given right phoneme.
+
+        :param right: Right phoneme.
+        :return: Number of left phonemes.
+        """
+        right_id = self._rights.id_of(right)
+        return len(self._right_to_lefts[right_id]) if right_id is not None else 0
+
+    def count_rights_for_left(self, left: str) -> int:
+        """
+        Get the number of right phonemes that are not combined with the given left phoneme.
+
+        :param left: Left phoneme.
+        :return: Number of right phonemes.
+        """
+        left_id = self._lefts.id_of(left)
+        return len(self._left_to_rights[left_id]) if left_id is not None else 0
+
+    def left_ids_for_right(self, right_id: int) -> KeysView[int]:
+        """
+        Get a read-only view of the IDs of left phonemes not combined with the given right phoneme ID.
+
+        :param right_id: Interned right phoneme ID.
+        :return: Copy-free view of left phoneme IDs.
+        """
+        return self._right_to_lefts[right_id].keys()
+
+    def right_ids_for_left(self, left_id: int) -> KeysView[int]:
+        """
+        Get a read-only view of the IDs of right phonemes not combined with the given left phoneme ID.
+
+        :param left_id: Interned left phoneme ID.
+        :return: Copy-free view of right phoneme IDs.
+        """
+        return self._left_to_rights[left_id].keys()
 
     def all_rights(self) -> list[str]:
         """
@@ -140,7 +455,8 @@ class RLPairView:
 
         :return: List of right phonemes.
         """
-        return list(self._right_to_lefts.keys())
+        name_of = self._rights.name_of
+        return [name_of(_id) for _id in self._live_rights]
 
     def all_lefts(self) -> list[str]:
         """
@@ -148,7 +464,27 @@ class RLPairView:
 
         :return: List of left phonemes.
         """
-        return list(self._left_to_rights.keys())
+        name_of = self._lefts.name_of
+        return [name_of(_id) for _id in self._live_lefts]
+
+    def pair_ids(self) -> list[tuple[int, int]]:
+        """
+        Get all uncombined pairs as interned IDs, grouped by left phoneme in view order.
+
+        :return: List of (left ID, right ID).
+        """
+        return [(left_id, right_id) for left_id in self._live_lefts
+                for right_id in self._left_to_rights[left_id]]
+
+    def syllable_for(self, left: str, right: str) -> str | None:
+        """
+        Get the syllable made of the given phoneme pair, whether or not the pair is still uncombined.
+
+        :param left: Left phoneme.
+        :param right: Right phoneme.
+        :return: Syllable name, or None if no syllable has this pair.
+        """
+        return self._index.syllable_for(left, right)
 
     def pop_lefts_for_right(self, right: str, count: int) -> list[str]:
         """
@@ -158,24 +494,14 @@ class RLPairView:
         :param count: Number of left phonemes to remove.
         :return: List of removed left phonemes.
         """
-        if right not in self._right_to_lefts:
+        right_id = self._rights.id_of(right)
+        if right_id is None or right_id not in self._live_rights:
             return []
-        lefts = self._right_to_lefts[right]
-        take = min(count, len(lefts))
-        popped = lefts[:take]
-
-        for left in popped:
-            if left in self._left_to_rights:
-                rights = self._left_to_rights[left]
-                if right in rights:
-                    rights.remove(right)
-                    if not rights:
-                        del self._left_to_rights[left]
-
-        self._right_to_lefts[right] = lefts[take:]
-        if not self._right_to_lefts[right]:
-            del self._right_to_lefts[right]
-        return popped
+        popped = list(islice(self._right_to_lefts[right_id], count))
+        for left_id in popped:
+            self._remove_ids(left_id, right_id)
+        name_of = self._lefts.name_of
+        return [name_of(_id) for _id in popped]
 
     def pop_rights_for_left(self, left: str, count: int) -> list[str]:
         """
@@ -185,42 +511,133 @@ class RLPairView:
         :param count: Number of right phonemes to remove.
         :return: List of removed right phonemes.
         """
-        if left not in self._left_to_rights:
+        left_id = self._lefts.id_of(left)
+        if left_id is None or left_id not in self._live_lefts:
             return []
-        rights = self._left_to_rights[left]
-        take = min(count, len(rights))
-        popped = rights[:take]
-        for right in popped:
-            if right in self._right_to_lefts:
-                lefts = self._right_to_lefts[right]
-                if left in lefts:
-                    lefts.remove(left)
-                    if not lefts:
-                        del self._right_to_lefts[right]
-        self._left_to_rights[left] = rights[take:]
-        if not self._left_to_rights[left]:
-            del self._left_to_rights[left]
-        return popped
+        popped = list(islice(self._left_to_rights[left_id], count))
+        for right_id in popped:
+            self._remove_ids(left_id, right_id)
+        name_of = self._rights.name_of
+        return [name_of(_id) for _id in popped]
 
     def remove_pair(self, left: str, right: str) -> bool:
         """
         Remove the specific (left, right) pair from the view.
         Returns True if the pair existed and was removed, False otherwise.
         """
-        removed = False
-
-        if left in self._left_to_rights:
-            rights = self._left_to_rights[left]
-            if right in rights:
-                rights.remove(right)
-                removed = True
-                if not rights:
-                    del self._left_to_rights[left]
-
-        if right in self._right_to_lefts:
-            lefts = self._right_to_lefts[right]
-            if left in lefts:
-                lefts.remove(left)
-                if not lefts:
-                    del self._right_to_lefts[right]
-        return removed
+        left_id = self._lefts.id_of(left)
+        right_id = self._rights.id_of(right)
+        if left_id is None or right_id is None:
+            return False
+        if right_id not in self._left_to_rights[left_id]:
+            return False
+        self._remove_ids(left_id, right_id)
+        return True
+
+    def remove_pair_ids(self, left_id: int, right_id: int) -> bool:
+        """
+        Remove the (left, right) pair given by interned IDs from the view.
+
+        :param left_id: Interned left phoneme ID.
+        :param right_id: Interned right phoneme ID.
+        :return: True if the pair was still uncombined and was removed, False otherwise.
+        """
+        if right_id not in self._left_to_rights[left_id]:
+            return False
+        self._remove_ids(left_id, right_id)
+        return True
+
+    def checkpoint(self) -> int:
+        """
+        Open a checkpoint. Until it is rolled back or released, every removal is logged in O(1) with the bucket
+        positions it changes. Checkpoints nest.
+
+        :return: Token for ``rollback()`` and ``release()``.
+        """
+        if self._ranks is None:
+            index = self._index
+            self._ranks = (
+                [{_id: rank for rank, _id in enumerate(index.right_ids_for_left(left_id))}
+                 for left_id in range(len(self._lefts))],
+                [{_id: rank for rank, _id in enumerate(index.left_ids_for_right(right_id))}
+                 for right_id in range(len(self._rights))])
+        self._levels.append(len(self._undo_log))
+        return len(self._levels) - 1
+
+    def rollback(self, token: int) -> None:
+        """
+        Undo every removal since a checkpoint and close it, together with the checkpoints opened after it.
+
+        The removals are undone in reverse order. Every phoneme goes back to its position in its bucket, and every
+        pair back to its position in the adjacency, moving only the partners behind it, so the view order is
+        restored exactly. Containers are restored in place, so ``PhonemeView`` objects stay valid.
+
+        :param token: Token from ``checkpoint()``.
+        :raise ValueError: The checkpoint is not open.
+        """
+        self._check_token(token)
+        start = self._levels[token]
+        del self._levels[token:]
+        left_ranks, right_ranks = self._ranks
+        log = self._undo_log
+        while len(log) > start:
+            left_id, right_id, left_links, right_links = log.pop()
+            rights = self._left_to_rights[left_id]
+            if not rights:
+                self._reinsert(self._live_lefts, left_id, range(len(self._lefts)))
+            self._left_buckets.undo_move(left_id, len(rights) + 1, len(rights), left_links)
+            self._reinsert(rights, right_id, left_ranks[left_id])
+
+            lefts = self._right_to_lefts[right_id]
+            if not lefts:
+                self._reinsert(self._live_rights, right_id, range(len(self._rights)))
+            self._right_buckets.undo_move(right_id, len(lefts) + 1, len(lefts), right_links)
+            self._reinsert(lefts, left_id, right_ranks[right_id])
+
+    def release(self, token: int) -> None:
+        """
+        Keep every removal since a checkpoint and close it, together with the checkpoints opened after it.
+
+        Inside an outer checkpoint the removals stay logged, so the outer one can still roll back past them.
+
+        :param token: Token from ``checkpoint()``.
+        :raise ValueError: The checkpoint is not open.
+        """
+        self._check_token(token)
+        start = self._levels[token]
+        del self._levels[token:]
+        if not self._levels:
+            del self._undo_log[start:]
+
+    @staticmethod
+    def _reinsert(ids: dict[int, None], _id: int, rank: Sequence[int] | Mapping[int, int]) -> None:
+        """Put an ID back at its position in an ordered container, by taking off and re-adding the IDs behind it."""
+        position = rank[_id]
+        behind = []
+        while ids and rank[next(reversed(ids))] > position:
+            behind.append(ids.popitem()[0])
+        ids[_id] = None
+        for other in reversed(behind):
+            ids[other] = None
+
+    def _check_token(self, token: int) -> None:
+        """Raise ValueError if ``token`` is not an open checkpoint."""
+        if not 0 <= token < len(self._levels):
+            raise ValueError(f"Checkpoint {token} is not open.")
+
+    def _remove_ids(self, left_id: int, right_id: int) -> None:
+        """Remove an existing pair by IDs in O(1), dropping phonemes that have no partner left."""
+        rights = self._left_to_rights[left_id]
+        del rights[right_id]
+        left_links = self._left_buckets.move(left_id, len(rights))
+        if not rights:
+            del self._live_lefts[left_id]
+
+        lefts = self._right_to_lefts[right_id]
+        del lefts[left_id]
+        right_links = self._right_buckets.move(right_id, len(lefts))
+        if not lefts:
+            del self._live_rights[right_id]
+
+        if self._levels:
+            self._undo_log.append((left_id, right_id, left_links, right_links))
@@ -0,0 +1,121 @@
+import os
+import time
+from types import TracebackType
+from typing import Literal, Self
+
+from .generator import Generator
+from .options import GenerateOptions
+from .oto import build_oto
+
+
+class ReclistWriter:
+    """
+    Incremental writer for ``REClist.txt`` and ``oto.ini``.
+
+    Lines are collected into chunks of up to ``CHUNK_LINES``, and the oto.ini rows of a chunk are built by one
+    ``build_oto()`` call. A chunk is also written when ``flush_interval`` seconds have passed since the last flush,
+    and the files are flushed then, so they grow while the search is still running without a system call per line.
+
+    :param output_dir: Output directory, created if it does not exist.
+    :param bpm: Tempo of the guide BGM.
+    :param mode: Generation mode of the lines.
+    :param flush_interval: Minimum number of seconds between two flushes.
+    """
+
+    RECLIST_NAME = "REClist.txt"
+    OTO_NAME = "oto.ini"
+    CHUNK_LINES = 2048
+
+    def __init__(
+            self,
+            output_dir: str,
+            bpm: int,
+            mode: Literal["CVVC", "VCV", "VCV_WITH_VC"] = "CVVC",
+            flush_interval: float = 1.0
+    ) -> None:
+        self._output_dir = output_dir
+        self._bpm = bpm
+        self._mode = mode
+        self._flush_interval = flush_interval
+        self._last_flush = 0.0
+        self._pending: list[tuple[str, list[tuple[str, str]]]] = []
+        self.line_count = 0
+
+    def __enter__(self) -> Self:
+        os.makedirs(self._output_dir, exist_ok=True)
+        self._reclist = open(os.path.join(self._output_dir, self.RECLIST_NAME),
+                             "w", encoding="utf-8", buffering=1 << 16)
+        self._oto = open(os.path.join(self._output_dir, self.OTO_NAME),
+                         "w", encoding="utf-8", buffering=1 << 16)
+        self._last_flush = time.monotonic()
+        return self
+
+    def __exit__(
+            self,
+            exc_type: type[BaseException] | None,
+            exc: BaseException | None,
+            tb: TracebackType | None
+    ) -> None:
+        try:
+            self._write_pending()
+        finally:
+            self._reclist.close()
+            self._oto.close()
+
+    def write(self, line: str, phoneme_pairs: list[tuple[str, str]]) -> None:
+        """
+        Append a reclist line; its oto.ini rows are written with its chunk.
+
+        :param line: Reclist line.
+        :param phoneme_pairs: Phoneme pairs of the line, as built by ``Generator``.
+        """
+        self._pending.append((line, phoneme_pairs))
+        self.line_count += 1
+
+        now = time.monotonic()
+        if now - self._last_flush >= self._flush_interval:
+            self._write_pending()
+            self._reclist.flush()
+            self._oto.flush()
+            self._last_flush = now
+        elif len(self._pending) >= self.CHUNK_LINES:
+            self._write_pending()
+
+    def _write_pending(self) -> None:
+        """Write the collected lines and their oto.ini rows."""
+        if not self._pending:
+            return
+        for line, _ in self._pending:
+            self._reclist.write(line)
+            self._reclist.write("\n")
+        self._oto.write(build_oto(self._pending, self._bpm, self._mode))
+        self._oto.write("\n")
+        self._pending.clear()
+
+
+def write_generation(
+        generator: Generator,
+        output_dir: str,
+        options: GenerateOptions,
+        previous_reclist: list[str] | None = None,
+        previous_syllable_map: dict[str, tuple[str, str]] | None = None
+) -> int:
+    """
+    Run a generator and stream its output into ``REClist.txt`` and ``oto.ini``.
+
+    :param generator: Generator of the dictionary.
+    :param output_dir: Output directory.
+    :param options: Generation parameters.
+    :param previous_reclist: Lines of a previous reclist for incremental regeneration.
+    :param previous_syllable_map: The syllable map the previous reclist was generated from.
+
+    :return: Number of lines written.
+    """
+    with ReclistWriter(output_dir, options.bpm, options.mode) as writer:
+        for line, phoneme_pairs in generator.iter_reclist(
+                **options.reclist_kwargs(),
+                previous_reclist=previous_reclist,
+                previous_syllable_map=previous_syllable_map
+        ):
+            writer.write(line, phoneme_pairs)
+    return writer.line_count
@@ -1,6 +1,11 @@
 import argparse
+import os
 import sys
 
+# Command modules are imported by the command that needs them, so a run only loads what it uses; startup on a
+# compiled dictionary is then dominated by the search.
+from core.options import GenerateOptions
+
 
 class CLI:
     """
@@ -18,10 +23,28 @@ class CLI:
 
         self._command_generate = self._subparser.add_parser(
             "generate", aliases=["gen"], help="Generate CVVC or VCV recording list.")
+        self._command_generate.set_defaults(command="generate")
         self._command_from_presamp = self._subparser.add_parser("from_presamp", aliases=[
                                                                 "fp"], help="Convert phoneme dictionary from \"presamp.ini\".")
+        self._command_from_presamp.set_defaults(command="from_presamp")
         self._command_to_presamp = self._subparser.add_parser("to_presamp", aliases=[
                                                               "tp"], help="Convert the syllable dictionary to \"presamp. ini\".")
+        self._command_to_presamp.set_defaults(command="to_presamp")
+        self._command_batch = self._subparser.add_parser(
+            "batch", aliases=["b"], help="Generate recording lists for many dictionaries at once.")
+        self._command_batch.set_defaults(command="batch")
+        self._command_sweep = self._subparser.add_parser(
+            "sweep", aliases=["sw"], help="Compare generation parameters on one dictionary.")
+        self._command_sweep.set_defaults(command="sweep")
+        self._command_validate = self._subparser.add_parser(
+            "validate", aliases=["va"], help="Check which units a recording list covers.")
+        self._command_validate.set_defaults(command="validate")
+        self._command_serve = self._subparser.add_parser(
+            "serve", help="Run a resident generation server on a Unix socket.")
+        self._command_serve.set_defaults(command="serve")
+        self._command_compile = self._subparser.add_parser(
+            "compile", aliases=["co"], help="Check a syllable dictionary and compile it for faster loading.")
+        self._command_compile.set_defaults(command="compile")
         self._add_args()
 
     def _add_args(self) -> None:
@@ -36,7 +59,7 @@ class CLI:
         self._command_generate.add_argument(
             "-o", "--output", help="Output file path.")
         self._command_generate.add_argument(
-            "-m", "--mode", choices=["VCV", "CVVC"], help="CVVC, VCV or VCV_WITH_VC mode, default CVVC.")
+            "-m", "--mode", choices=["CVVC", "VCV", "VCV_WITH_VC"], help="CVVC, VCV or VCV_WITH_VC mode, default CVVC.")
         self._command_generate.add_argument(
             "-b", "--bpm", type=int, help="Used to specify the speed unit bpm for recording BGM, default is 120.")
         self._command_generate.add_argument("-l", "--max-length", choices=range(2, 9), type=int, help="The maximum number of syllables per line is 8, \
@@ -47,6 +70,76 @@ class CLI:
             "-d", "--iter-depth", type=int, help="Find the maximum iteration depth of the sequential order.")
         self._command_generate.add_argument("-r", "--max-redundancy", type=int, help="For the maximum number of extra \
                                             syllables that can be tolerated for fluency, the default is 50.")
+        self._command_generate.add_argument(
+            "-j", "--jobs", type=int, help="Number of worker processes for dictionary components, restarts and the in-turn \
+                                            search. Default is 1.")
+        self._command_generate.add_argument(
+            "--stats", choices=["json"], help="Print per-stage timing and search statistics in the given format.")
+        self._command_generate.add_argument(
+            "--trace-memory", action="store_true", help="Also record per-stage peak memory in the statistics (slower).")
+        self._command_generate.add_argument(
+            "-p", "--previous", help="Previous REClist.txt to regenerate incrementally; requires --previous-input.")
+        self._command_generate.add_argument(
+            "--previous-input", help="The dictionary file the previous REClist.txt was generated from.")
+        self._command_generate.add_argument(
+            "--time-budget", type=float, metavar="SECONDS", help="Stop the in-turn search after this many seconds and \
+                                            keep the lines found so far.")
+        self._command_generate.add_argument(
+            "--restarts", type=int, metavar="K", help="Search K dictionary orders, the original one and K-1 shuffled \
+                                            ones, on the -j workers and keep the best result, default is 1.")
+        self._command_generate.add_argument(
+            "--seed", type=int, metavar="S", help="Seed of the shuffled dictionary orders of --restarts, default is 0.")
+        self._command_generate.add_argument(
+            "--no-cache", action="store_true", help="Always run the search instead of reusing a cached result.")
+        self._command_generate.add_argument(
+            "--cache-dir", help="Directory of the result cache, default is ~/.cache/smooth-reclist.")
+
+        # batch
+        self._command_batch.add_argument(
+            "-i", "--input", required=True, help="Directory of dictionary files, or a manifest file.")
+        self._command_batch.add_argument(
+            "-o", "--output", help="Output root path; each dictionary gets its own directory.")
+        self._command_batch.add_argument(
+            "-w", "--workers", type=int, help="Number of worker processes, default is the number of CPUs.")
+
+        # sweep
+        self._command_sweep.add_argument(
+            "-i", "--input", required=True, help="Import file path.")
+        self._command_sweep.add_argument(
+            "-m", "--mode", choices=["CVVC", "VCV", "VCV_WITH_VC"], help="CVVC, VCV or VCV_WITH_VC mode, default CVVC.")
+        self._command_sweep.add_argument("-l", "--max-length", nargs="+", choices=range(2, 9), type=int,
+                                         help="Maximum line lengths to try, default 4 6 8.")
+        self._command_sweep.add_argument(
+            "-d", "--iter-depth", nargs="+", type=int, help="In-turn iteration depths to try, default half of the length.")
+        self._command_sweep.add_argument(
+            "-r", "--max-redundancy", nargs="+", type=int, help="Maximum redundancies to try, default 50.")
+        self._command_sweep.add_argument("-s", "--SSS-first", nargs="+", choices=[0, 1], type=int,
+                                         help="SSS-first settings to try (0 or 1), default 0 1.")
+        self._command_sweep.add_argument(
+            "-w", "--workers", type=int, help="Number of worker processes, default is the number of CPUs.")
+        self._command_sweep.add_argument(
+            "--json", help="Also write all results to this JSON file.")
+
+        # validate
+        self._command_validate.add_argument(
+            "-i", "--input", required=True, help="Import file path.")
+        self._command_validate.add_argument(
+            "-r", "--reclist", required=True, help="REClist.txt to check.")
+        self._command_validate.add_argument(
+            "-m", "--mode", choices=["VCV", "CVVC", "VCV_WITH_VC"], default="CVVC", help="CVVC, VCV or VCV_WITH_VC \
+                                            mode, default CVVC.")
+
+        # serve
+        self._command_serve.add_argument(
+            "-s", "--socket", required=True, help="Path of the Unix socket to listen on.")
+        self._command_serve.add_argument(
+            "-w", "--workers", type=int, help="Number of worker processes, default is the number of CPUs.")
+
+        # compile
+        self._command_compile.add_argument(
+            "-i", "--input", required=True, help="Import file path.")
+        self._command_compile.add_argument(
+            "-o", "--output", help="Output file path, default is the input path with the .srd extension.")
 
         # from presamp
         self._command_from_presamp.add_argument(
@@ -80,6 +173,237 @@ class App:
         else:
             cli = CLI(self._version)
             args = cli.get_args()
+            try:
+                if args.command == "generate":
+                    self._generate(args)
+                elif args.command == "batch":
+                    self._batch(args)
+                elif args.command == "sweep":
+                    self._sweep(args)
+                elif args.command == "validate":
+                    self._validate(args)
+                elif args.command == "serve":
+                    self._serve(args)
+                elif args.command == "compile":
+                    self._compile(args)
+                elif args.command == "from_presamp":
+                    self._from_presamp(args)
+                elif args.command == "to_presamp":
+                    self._to_presamp(args)
+                else:
+                    print(f"The '{args.command}' command is not supported yet.")
+            except (OSError, ValueError, NotImplementedError) as e:
+                sys.exit(f"Error: {e}")
+
+    def _generate(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``generate`` command. Lines are written to disk as soon as the generator commits them.
+
+        :param args: Parsed arguments.
+        """
+        from core.cache import ResultCache, cache_key, default_cache_dir
+        from core.compiled import load_dictionary
+        from core.presamp import write_presamp_file
+
+        dictionary, index = load_dictionary(args.input)
+        options = self._get_options(args)
+        output = args.output or os.path.splitext(args.input)[0]
+
+        previous_reclist = None
+        previous_syllable_map = None
+        if args.previous or args.previous_input:
+            if not (args.previous and args.previous_input):
+                raise ValueError("--previous and --previous-input must be used together.")
+            if options.mode != "CVVC":
+                # Fail before the writer truncates the output, which may hold the previous reclist.
+                raise ValueError(f"Incremental regeneration is not supported in the '{options.mode}' mode.")
+            from core.reclist import read_reclist
+
+            # Read before the writer truncates the output, which may be the same file.
+            previous_reclist = read_reclist(args.previous)
+            previous_syllable_map = load_dictionary(args.previous_input)[0].syllable_map
+
+        from core.stats import GenerationStats
+
+        stats = GenerationStats(trace_memory=args.trace_memory) if args.stats else None
+        # Statistics need a real run, and a time-budgeted result depends on the machine.
+        cache = None
+        if not (args.no_cache or stats is not None or options.time_budget is not None):
+            cache = ResultCache(args.cache_dir or default_cache_dir())
+            key = cache_key(dictionary, options, previous_reclist, previous_syllable_map)
+            line_count = cache.restore(key, output)
+            if line_count is not None:
+                write_presamp_file(os.path.join(output, "presamp.ini"), dictionary)
+                print(f"{line_count} lines written to '{output}' (cached).")
+                return
+
+        from core import Generator
+        from core.writers import write_generation
+
+        generator = Generator(dictionary.syllable_map, stats=stats, index=index)
+        line_count = write_generation(
+            generator, output, options, previous_reclist, previous_syllable_map)
+        if cache is not None:
+            cache.store(key, output, line_count)
+        write_presamp_file(os.path.join(output, "presamp.ini"), dictionary)
+        if stats is not None:
+            import json
+
+            # Keep stdout machine-readable when statistics are requested.
+            print(json.dumps(stats.to_dict(), indent=2))
+        else:
+            print(f"{line_count} lines written to '{output}'.")
+            summary = generator.summary()
+            if summary["in_turn_timed_out"]:
+                covered = summary["in_turn_patterns_covered"] / max(summary["in_turn_patterns"], 1)
+                print(f"The time budget ran out after {covered:.1%} of the in-turn patterns.")
+            if summary["vcv"]:
+                print(f"No VCV reclist of this dictionary can have fewer than {summary['vcv_lower_bound']} lines.")
+
+    def _from_presamp(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``from_presamp`` command.
+
+        :param args: Parsed arguments.
+        """
+        from core.presamp import read_presamp
+
+        dictionary = read_presamp(args.input).to_dictionary()
+        name = os.path.splitext(os.path.basename(args.input))[0] + ".toml"
+        output_dir = args.output or os.path.dirname(args.input)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, name)
+        with open(path, "w", encoding="utf-8", buffering=1 << 16) as f:
+            dictionary.write_toml(f)
+        print(f"{len(dictionary.syllable_map)} syllables written to '{path}'.")
+
+    def _to_presamp(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``to_presamp`` command.
+
+        :param args: Parsed arguments.
+        """
+        from core.compiled import load_dictionary
+        from core.presamp import write_presamp_file
+
+        dictionary = load_dictionary(args.input)[0]
+        output_dir = args.output or os.path.dirname(args.input)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, "presamp.ini")
+        write_presamp_file(path, dictionary)
+        print(f"{len(dictionary.syllable_map)} syllables written to '{path}'.")
+
+    def _batch(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``batch`` command and print a summary table.
+
+        :param args: Parsed arguments.
+        """
+        from core.batch import format_batch_summary, load_batch_jobs, run_batch
+
+        jobs = load_batch_jobs(args.input, args.output)
+        if not jobs:
+            raise ValueError(f"No dictionaries found in '{args.input}'.")
+        results = run_batch(jobs, args.workers or os.cpu_count() or 1)
+        print(format_batch_summary(results))
+        if any(result.error for result in results):
+            sys.exit(1)
+
+    def _sweep(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``sweep`` command and print the results, Pareto-optimal settings first.
+
+        :param args: Parsed arguments.
+        """
+        from core.compiled import load_dictionary
+        from core.sweep import build_grid, format_sweep_report, run_sweep
+
+        dictionary = load_dictionary(args.input)[0]
+        base = GenerateOptions.from_mapping({"mode": args.mode})
+        grid = build_grid(
+            base,
+            args.max_length or [4, 6, 8],
+            args.iter_depth or [None],
+            args.max_redundancy or [base.max_redundancy],
+            [bool(value) for value in (args.SSS_first or [0, 1])],
+        )
+        results = run_sweep(dictionary.syllable_map, grid, args.workers or os.cpu_count() or 1)
+        print(format_sweep_report(results))
+        if args.json:
+            import json
+
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump([result.to_dict() for result in results], f, indent=2)
+
+    def _validate(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``validate`` command and print the coverage report. Exits with status 1 if units are missing.
+
+        :param args: Parsed arguments.
+        """
+        from core.compiled import load_dictionary
+        from core.reclist import read_reclist
+        from core.validator import CoverageValidator, format_coverage_report
+
+        dictionary, index = load_dictionary(args.input)
+        validator = CoverageValidator(index if index is not None else dictionary.syllable_map, args.mode)
+        report = validator.validate(read_reclist(args.reclist))
+        print(format_coverage_report(report))
+        if not report.complete:
+            sys.exit(1)
+
+    def _serve(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``serve`` command until interrupted.
+
+        :param args: Parsed arguments.
+        """
+        import asyncio
+
+        from core.server import GenerationServer
+
+        server = GenerationServer(args.socket, args.workers)
+        print(f"Listening on '{args.socket}'.", flush=True)
+        try:
+            asyncio.run(server.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    def _compile(self, args: argparse.Namespace) -> None:
+        """
+        Run the ``compile`` command.
+
+        :param args: Parsed arguments.
+        """
+        from core.compiled import COMPILED_SUFFIX, write_compiled
+        from core.dictionary import SyllableDictionary
+
+        dictionary = SyllableDictionary().from_file(args.input)
+        path = args.output or os.path.splitext(args.input)[0] + COMPILED_SUFFIX
+        write_compiled(path, dictionary)
+        print(f"{len(dictionary.syllable_map)} syllables compiled to '{path}'.")
+
+    def _get_options(self, args: argparse.Namespace) -> GenerateOptions:
+        """
+        Get the generation parameters from the ``generate`` arguments, applying the defaults.
+
+        :param args: Parsed arguments.
+        :return: Generation parameters.
+        """
+        return GenerateOptions.from_mapping({
+            "mode": args.mode,
+            "bpm": args.bpm,
+            "max_length": args.max_length,
+            "sss_first": args.SSS_first,
+            "iter_depth": args.iter_depth,
+            "max_redundancy": args.max_redundancy,
+            "jobs": args.jobs,
+            "time_budget": args.time_budget,
+            "restarts": args.restarts,
+            "seed": args.seed,
+        })
 
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+import os
+from dataclasses import replace
+
+from bench.synthetic import japanese_like
+from core.cache import ResultCache, cache_key
+from core.dictionary import SyllableDictionary
+from core.generator import Generator
+from core.options import GenerateOptions
+from core.writers import ReclistWriter, write_generation
+
+FILES = (ReclistWriter.RECLIST_NAME, ReclistWriter.OTO_NAME)
+
+
+def make_dictionary() -> SyllableDictionary:
+    dictionary = SyllableDictionary()
+    dictionary.syllable_map = japanese_like(seed=1)
+    return dictionary
+
+
+def read_files(output_dir) -> list[str]:
+    result = []
+    for name in FILES:
+        with open(os.path.join(output_dir, name), encoding="utf-8") as f:
+            result.append(f.read())
+    return result
+
+
+def fake_output(output_dir, text: str) -> None:
+    os.makedirs(output_dir, exist_ok=True)
+    for name in FILES:
+        with open(os.path.join(output_dir, name), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def test_hit_restores_the_stored_result(tmp_path) -> None:
+    dictionary = make_dictionary()
+    options = GenerateOptions(max_length=4)
+    cache = ResultCache(str(tmp_path / "cache"))
+    key = cache_key(dictionary, options)
+    assert cache.restore(key, str(tmp_path / "restored")) is None
+
+    line_count = write_generation(Generator(dictionary.syllable_map), str(tmp_path / "out"), options)
+    cache.store(key, str(tmp_path / "out"), line_count)
+
+    assert cache.restore(key, str(tmp_path / "restored")) == line_count
+    assert read_files(tmp_path / "restored") == read_files(tmp_path / "out")
+
+
+def test_key_changes_with_version_and_options(monkeypatch) -> None:
+    dictionary = make_dictionary()
+    options = GenerateOptions(max_length=4)
+    key = cache_key(dictionary, options)
+
+    assert cache_key(dictionary, replace(options, jobs=4)) == key
+    assert cache_key(dictionary, replace(options, max_length=5)) != key
+    assert cache_key(dictionary, replace(options, restarts=2)) != key
+    assert cache_key(dictionary, options, ["a_a"], dictionary.syllable_map) != key
+    dictionary.end_flag = not dictionary.end_flag
+    assert cache_key(dictionary, options) != key
+    dictionary.end_flag = not dictionary.end_flag
+    monkeypatch.setattr("core.cache.GENERATOR_VERSION", "0")
+    assert cache_key(dictionary, options) != key
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path / "cache"))
+    for key in ("a", "b"):
+        fake_output(tmp_path / key, key * 100)
+        cache.store(key, str(tmp_path / key), 1)
+    entry_size = sum(f.stat().st_size for f in (tmp_path / "cache" / "a").iterdir())
+    # "a" is stored first but used last.
+    os.utime(tmp_path / "cache" / "a" / "meta.json", (100, 100))
+    os.utime(tmp_path / "cache" / "b" / "meta.json", (200, 200))
+    assert cache.restore("a", str(tmp_path / "restored")) == 1
+
+    cache.max_bytes = 2 * entry_size
+    fake_output(tmp_path / "c", "c" * 100)
+    cache.store("c", str(tmp_path / "c"), 1)
+
+    assert sorted(os.listdir(tmp_path / "cache")) == ["a", "c"]
+    assert cache.restore("b", str(tmp_path / "restored")) is None
@@ -0,0 +1,91 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bench.synthetic import DICTIONARIES
+from core.compiled import COMPILED_FORMAT_VERSION, load_dictionary, read_compiled, write_compiled
+from core.dictionary import SyllableDictionary
+from core.index import SyllableIndex
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+
+def make_dictionary(syllable_map: dict[str, tuple[str, str]]) -> SyllableDictionary:
+    dictionary = SyllableDictionary()
+    dictionary.version = "1.2.0"
+    dictionary.syllable_map = syllable_map
+    return dictionary
+
+
+def index_tables(index: SyllableIndex) -> tuple:
+    num_lefts = len(index.left_table)
+    num_rights = len(index.right_table)
+    return (
+        index.syllable_table.names(),
+        index.left_table.names(),
+        index.right_table.names(),
+        [index.pair_of(syl_id) for syl_id in range(len(index))],
+        [index.right_ids_for_left(left_id) for left_id in range(num_lefts)],
+        [index.left_ids_for_right(right_id) for right_id in range(num_rights)],
+        [index.syllables_for_left(left_id) for left_id in range(num_lefts)],
+        [index.syllables_for_right(right_id) for right_id in range(num_rights)],
+    )
+
+
+@pytest.mark.parametrize("name", sorted(DICTIONARIES))
+def test_toml_and_srd_round_trip(tmp_path, name: str) -> None:
+    dictionary = make_dictionary(DICTIONARIES[name](seed=1))
+    dictionary.syllable_map["ü 字"] = ("ü", "字")
+    dictionary.n_fade = ["n", "ng"]
+    dictionary.end_flag = False
+    toml_path = str(tmp_path / "dictionary.toml")
+    with open(toml_path, "w", encoding="utf-8") as f:
+        dictionary.write_toml(f)
+    srd_path = str(tmp_path / "dictionary.srd")
+    write_compiled(srd_path, SyllableDictionary().from_file(toml_path))
+
+    loaded, index = load_dictionary(srd_path)
+    assert list(loaded.syllable_map.items()) == list(dictionary.syllable_map.items())
+    assert (loaded.version, loaded.n_fade, loaded.end_flag) == ("1.2.0", ["n", "ng"], False)
+    assert index_tables(index) == index_tables(SyllableIndex(dictionary.syllable_map))
+    assert load_dictionary(toml_path)[1] is None
+
+
+@pytest.mark.parametrize("syllable_map, message", [
+    ({}, "empty"),
+    ({"ka": ("k", "a"), "a": (" ", "a")}, "without a left or right phoneme: a"),
+    ({"ka": ("k", "a"), "ca": ("k", "a"), "ki": ("k", "i")}, "'ca' and 'ka' \\(k a\\)"),
+])
+def test_bad_dictionaries_are_rejected(tmp_path, syllable_map: dict[str, tuple[str, str]], message: str) -> None:
+    path = tmp_path / "bad.srd"
+    with pytest.raises(ValueError, match=message):
+        write_compiled(str(path), make_dictionary(syllable_map))
+    assert not path.exists()
+
+
+def test_compile_command_rejects_duplicate_pairs(tmp_path) -> None:
+    toml_path = tmp_path / "duplicate.toml"
+    toml_path.write_text('version = "1.0.0"\n\n[syl]\nka = ["k", "a"]\nca = ["k", "a"]\n', encoding="utf-8")
+    process = subprocess.run([sys.executable, MAIN, "compile", "-i", str(toml_path)],
+                             capture_output=True, text=True)
+    assert process.returncode != 0
+    assert "Syllables sharing a phoneme pair" in process.stderr
+    assert not (tmp_path / "duplicate.srd").exists()
+
+
+def test_bad_artifacts_are_rejected(tmp_path) -> None:
+    path = tmp_path / "japanese.srd"
+    write_compiled(str(path), make_dictionary(DICTIONARIES["japanese"](seed=1)))
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        read_compiled(str(path))
+    path.write_bytes(data[:4] + (COMPILED_FORMAT_VERSION + 1).to_bytes(2, "little") + data[6:])
+    with pytest.raises(ValueError, match="format version"):
+        read_compiled(str(path))
+    path.write_bytes(b"version = \"1.0.0\"\n" * 4)
+    with pytest.raises(ValueError, match="not a compiled dictionary"):
+        read_compiled(str(path))
@@ -0,0 +1,208 @@
+import pytest
+
+from bench.synthetic import DICTIONARIES, japanese_like, mandarin_like
+from core.compiled import read_compiled, write_compiled
+from core.dictionary import SyllableDictionary
+from core.generator import Generator
+from core.index import SyllableIndex
+from core.stats import GenerationStats
+from core.validator import CoverageValidator
+from core.vcv import lower_bound
+
+
+def generate(
+        syllable_map: dict[str, tuple[str, str]],
+        max_length: int,
+        index: SyllableIndex | None = None,
+        **kwargs
+) -> list[str]:
+    options = {"mode": "CVVC", "policy": "DEFAULT", "bmp": 120, "max_length": max_length, "sss_first": False,
+               "iter_depth": max_length // 2, "max_redu": 50}
+    options.update(kwargs)
+    reclist, _ = Generator(syllable_map, index=index).generate(**options)
+    return reclist
+
+
+def assert_complete(syllable_map: dict[str, tuple[str, str]], reclist: list[str], mode: str = "CVVC") -> None:
+    report = CoverageValidator(syllable_map, mode).validate(reclist)
+    assert report.complete, (report.missing[:10], report.invalid_lines[:10])
+
+
+def two_languages() -> dict[str, tuple[str, str]]:
+    """Two dictionaries that share no phoneme, so the components path is taken."""
+    syllable_map = dict(japanese_like(seed=2))
+    syllable_map.update({f"zh_{syl}": (f"zh_{left}", f"zh_{right}")
+                         for syl, (left, right) in mandarin_like(seed=3).items()})
+    return syllable_map
+
+
+@pytest.mark.parametrize("name", sorted(DICTIONARIES))
+@pytest.mark.parametrize("max_length", [2, 3, 4, 6, 8])
+def test_cvvc_reclist_covers_every_unit(name: str, max_length: int) -> None:
+    syllable_map = DICTIONARIES[name](seed=1)
+    assert_complete(syllable_map, generate(syllable_map, max_length))
+
+
+@pytest.mark.parametrize("options", [
+    {"sss_first": True},
+    {"policy": "NO_IN_TURN"},
+    {"max_redu": 0},
+    {"time_budget": 0.0},
+    {"restarts": 3, "seed": 5},
+    {"restarts": 2, "jobs": 2},
+], ids=str)
+@pytest.mark.parametrize("max_length", [3, 6])
+def test_every_cvvc_path_covers_every_unit(options: dict, max_length: int) -> None:
+    syllable_map = mandarin_like(seed=4)
+    assert_complete(syllable_map, generate(syllable_map, max_length, **options))
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_components_cover_every_unit(jobs: int) -> None:
+    syllable_map = two_languages()
+    assert len(SyllableIndex(syllable_map).components()) == 2
+    assert_complete(syllable_map, generate(syllable_map, 6, jobs=jobs))
+
+
+@pytest.mark.parametrize("options", [{"restarts": 3, "seed": 2}, {"restarts": 2, "sss_first": True}, {}], ids=str)
+def test_output_does_not_depend_on_jobs(options: dict) -> None:
+    syllable_map = mandarin_like(seed=5) if options else two_languages()
+    runs = []
+    for jobs in (1, 3):
+        generator = Generator(syllable_map)
+        reclist, oto = generator.generate(**{"mode": "CVVC", "policy": "DEFAULT", "bmp": 120, "max_length": 6,
+                                             "sss_first": False, "iter_depth": 3, "max_redu": 50, "jobs": jobs,
+                                             **options})
+        runs.append((reclist, oto, generator.summary()))
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("name", sorted(DICTIONARIES))
+@pytest.mark.parametrize("max_length", [2, 6])
+def test_sss_lines_come_first(name: str, max_length: int) -> None:
+    syllable_map = DICTIONARIES[name](seed=1)
+    generator = Generator(syllable_map)
+    reclist, _ = generator.generate(mode="CVVC", policy="DEFAULT", bmp=120, max_length=max_length, sss_first=True,
+                                    iter_depth=max_length // 2, max_redu=50)
+    summary = generator.summary()
+    sss = [line.split("_") for line in reclist[:summary["sss"]]]
+
+    # One line per right phoneme, each repeating one syllable.
+    assert sorted(syllable_map[line[0]][1] for line in sss) == sorted({right for _, right in syllable_map.values()})
+    assert all(line == [line[0]] * min(3, max_length) for line in sss)
+    # Every stage, SSS included, counts a non-start syllable already recorded at a non-start position.
+    seen: set[str] = set()
+    redundancy = 0
+    for line in reclist:
+        for syl in line.split("_")[1:]:
+            redundancy += syl in seen
+            seen.add(syl)
+    assert summary["redundancy"] == redundancy
+    # The validator counts repeated recordings of every unit; those of middle syllables are the redundancy.
+    report = CoverageValidator(syllable_map, "CVVC").validate(reclist)
+    assert sum(count - 1 for unit, count in report.duplicated.items() if unit in syllable_map) == redundancy
+    assert report.repeated_recordings >= redundancy
+    assert_complete(syllable_map, reclist)
+
+
+@pytest.mark.parametrize("name", sorted(DICTIONARIES))
+def test_in_turn_pool_matches_serial_search(name: str) -> None:
+    syllable_map = DICTIONARIES[name](seed=1)
+    runs = []
+    for jobs in (1, 2):
+        stats = GenerationStats()
+        options = {"mode": "CVVC", "policy": "DEFAULT", "bmp": 120, "max_length": 8, "sss_first": False,
+                   "iter_depth": 4, "max_redu": 50, "jobs": jobs}
+        reclist, _ = Generator(syllable_map, stats=stats).generate(**options)
+        runs.append((reclist, stats.counters, stats.result))
+    assert runs[0][2]["in_turn_fluent"] > 0
+    assert runs[0] == runs[1]
+
+
+@pytest.mark.parametrize("mode", ["VCV", "VCV_WITH_VC"])
+@pytest.mark.parametrize("name", sorted(DICTIONARIES))
+@pytest.mark.parametrize("max_length", [2, 3, 5, 8])
+def test_vcv_reclist_covers_every_unit(mode: str, name: str, max_length: int) -> None:
+    syllable_map = DICTIONARIES[name](seed=1, **({"size": 400} if name == "english" else {}))
+    generator = Generator(syllable_map)
+    reclist, _ = generator.generate(mode=mode, policy="DEFAULT", bmp=120, max_length=max_length, sss_first=False,
+                                    iter_depth=1, max_redu=50)
+    assert_complete(syllable_map, reclist, mode)
+    assert all(len(line.split("_")) <= max_length for line in reclist)
+    assert generator.summary()["vcv_lower_bound"] <= len(reclist)
+
+
+def test_vcv_lower_bound_counts_imbalance() -> None:
+    # Four of nine syllables end in "a", so the five other right vowels have 3 surplus out-edges each.
+    syllable_map = {"ka": ("k", "a"), "sa": ("s", "a"), "ta": ("t", "a"), "na": ("n", "a"),
+                    "ki": ("k", "i"), "ku": ("k", "u"), "ke": ("k", "e"), "ko": ("k", "o"), "n": ("n", "n")}
+    # 54 transitions fit in ceil(54 / 5) = 11 lines of length 6, but the imbalance of 15 forces 12.
+    assert lower_bound(SyllableIndex(syllable_map), 6) == 12
+    reclist, _ = Generator(syllable_map).generate(mode="VCV", policy="DEFAULT", bmp=120, max_length=6,
+                                                  sss_first=False, iter_depth=1, max_redu=50)
+    assert_complete(syllable_map, reclist, "VCV")
+    assert len(reclist) >= 12
+
+
+def test_incremental_regeneration_covers_every_unit() -> None:
+    previous_map = mandarin_like(seed=6)
+    previous_reclist = generate(previous_map, 6)
+    syllable_map = dict(list(previous_map.items())[::2])
+    syllable_map.update({f"new_{n}": (left, f"new_{n % 7}") for n, (left, _) in enumerate(previous_map.values())
+                         if n % 11 == 0})
+    reclist = generate(syllable_map, 6, previous_reclist=previous_reclist, previous_syllable_map=previous_map)
+    assert_complete(syllable_map, reclist)
+
+
+def test_kept_lines_survive_regeneration() -> None:
+    previous_map = mandarin_like(seed=6)
+    previous_reclist = generate(previous_map, 6)
+    # Change one syllable, so the lines holding it must be rebuilt and every other line is kept.
+    changed = next(iter(previous_map))
+    syllable_map = dict(previous_map)
+    syllable_map[changed] = (previous_map[changed][0], "new")
+    kept = [line for line in previous_reclist if changed not in line.split("_")]
+    assert 0 < len(kept) < len(previous_reclist)
+
+    reclist = generate(syllable_map, 6, previous_reclist=previous_reclist, previous_syllable_map=previous_map)
+    assert reclist[:len(kept)] == kept
+    assert_complete(syllable_map, reclist)
+
+
+@pytest.mark.parametrize("mode", ["VCV", "VCV_WITH_VC"])
+def test_previous_reclist_is_rejected_in_vcv_modes(mode: str) -> None:
+    syllable_map = japanese_like(seed=1)
+    with pytest.raises(ValueError, match="Incremental regeneration"):
+        generate(syllable_map, 4, mode=mode, previous_reclist=["a_a"], previous_syllable_map=syllable_map)
+
+
+def test_compiled_index_covers_every_unit(tmp_path) -> None:
+    dictionary = SyllableDictionary()
+    dictionary.syllable_map = DICTIONARIES["english"](seed=7, size=800)
+    path = str(tmp_path / "english.srd")
+    write_compiled(path, dictionary)
+    compiled = read_compiled(path)
+    reclist = generate(compiled.dictionary.syllable_map, 6, index=compiled.index)
+    assert_complete(compiled.dictionary.syllable_map, reclist)
+
+
+@pytest.mark.parametrize("options", [{"jobs": 1}, {"jobs": 2}, {"restarts": 2, "jobs": 1}, {"restarts": 2, "jobs": 2}],
+                         ids=str)
+def test_sub_solve_stats_are_merged(options: dict) -> None:
+    syllable_map = two_languages() if "restarts" not in options else mandarin_like(seed=4)
+    stats = GenerationStats()
+    reclist, _ = Generator(syllable_map, stats=stats).generate(
+        mode="CVVC", policy="DEFAULT", bmp=120, max_length=6, sss_first=False, iter_depth=3, max_redu=50, **options)
+    parent = "restarts" if "restarts" in options else "components"
+    merged = {name: stage for name, stage in stats.stages.items() if name.startswith(parent + ".")}
+
+    assert stats.counters["in_turn.candidates_tried"] > 0
+    assert merged[parent + ".perfect_fluent"].lines > 0
+    assert stats.pair_view_calls
+    if parent == "components":
+        # Every committed line was built by exactly one sub-solve stage.
+        assert sum(stage.lines for stage in merged.values()) == len(reclist) == stats.stages[parent].lines
+    # Sub-solve time is part of the parent stage and is not counted twice.
+    data = stats.to_dict()
+    assert data["total_seconds"] == pytest.approx(sum(
+        stage["seconds"] for name, stage in data["stages"].items() if "." not in name))
@@ -0,0 +1,32 @@
+import pytest
+
+from bench.synthetic import japanese_like, mandarin_like
+from core.generator import Generator
+from core.options import GenerateOptions
+from core.oto import build_oto, oto_lines
+from core.writers import ReclistWriter, write_generation
+
+MODES = ["CVVC", "VCV", "VCV_WITH_VC"]
+
+
+@pytest.mark.parametrize("mode", MODES)
+@pytest.mark.parametrize("bpm", [61, 97, 120, 133])
+def test_single_line_rows_match_batch(mode: str, bpm: int) -> None:
+    entries = list(Generator(mandarin_like(seed=1)).iter_reclist(
+        mode=mode, max_length=5, sss_first=False, iter_depth=2, max_redu=50))
+    rows = [row for line, phoneme_pairs in entries for row in oto_lines(line, phoneme_pairs, bpm, mode)]
+    assert rows == build_oto(entries, bpm, mode).split("\n")
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_chunked_files_match_generate(tmp_path, monkeypatch, mode: str) -> None:
+    monkeypatch.setattr(ReclistWriter, "CHUNK_LINES", 7)
+    syllable_map = japanese_like(seed=1)
+    options = GenerateOptions(mode=mode, max_length=4)
+    reclist, oto = Generator(syllable_map).generate(**options.generate_kwargs())
+
+    assert write_generation(Generator(syllable_map), str(tmp_path), options) == len(reclist)
+    with open(tmp_path / ReclistWriter.RECLIST_NAME, encoding="utf-8") as f:
+        assert f.read().splitlines() == reclist
+    with open(tmp_path / ReclistWriter.OTO_NAME, encoding="utf-8") as f:
+        assert f.read().splitlines() == oto
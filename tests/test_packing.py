@@ -0,0 +1,63 @@
+import itertools
+import random
+
+import pytest
+
+from core.packing import pack_perfect_fluent
+
+
+def optimum(pairs: list[tuple[int, int]], num_lefts: int, num_rights: int, capacity: int) -> int:
+    """Best line count over every assignment of the pairs to one of their phonemes."""
+    best = 0
+    for sides in itertools.product((False, True), repeat=len(pairs)):
+        assigned = [0] * (num_lefts + num_rights)
+        for (left, right), use_right_view in zip(pairs, sides):
+            assigned[num_lefts + right if use_right_view else left] += 1
+        best = max(best, sum(count // capacity for count in assigned))
+    return best
+
+
+def small_cases(count: int) -> list[tuple[list[tuple[int, int]], int, int, int]]:
+    rng = random.Random(0)
+    cases = []
+    for _ in range(count):
+        num_lefts = rng.randint(1, 4)
+        num_rights = rng.randint(1, 4)
+        all_pairs = list(itertools.product(range(num_lefts), range(num_rights)))
+        pairs = rng.sample(all_pairs, rng.randint(1, min(len(all_pairs), 10)))
+        cases.append((pairs, num_lefts, num_rights, rng.randint(1, 4)))
+    return cases
+
+
+@pytest.mark.parametrize("pairs, num_lefts, num_rights, capacity", small_cases(150))
+def test_packing_is_bounded_by_the_optimum(
+        pairs: list[tuple[int, int]],
+        num_lefts: int,
+        num_rights: int,
+        capacity: int
+) -> None:
+    report = pack_perfect_fluent(pairs, num_lefts, num_rights, capacity)
+
+    assert len(report.lines) <= optimum(pairs, num_lefts, num_rights, capacity) <= report.upper_bound
+    assert report.gap == report.upper_bound - len(report.lines)
+    # Every line is a full star of distinct uncombined pairs.
+    used = []
+    for line in report.lines:
+        assert len(line.partners) == capacity
+        used += [(partner, line.key) if line.use_right_view else (line.key, partner) for partner in line.partners]
+    assert len(used) == len(set(used))
+    assert set(used) <= set(pairs)
+
+
+def test_improvement_pass_reaches_the_optimum() -> None:
+    # Left 0 has the larger degree and takes all 3 of its pairs, leaving right 0 one pair short of a line of 2.
+    pairs = [(0, 0), (0, 1), (0, 2), (1, 0)]
+    report = pack_perfect_fluent(pairs, 2, 3, 2)
+    assert len(report.lines) == optimum(pairs, 2, 3, 2) == 2
+    assert report.moved_pairs == 1
+
+
+@pytest.mark.parametrize("capacity", [0, 3])
+def test_nothing_to_pack(capacity: int) -> None:
+    report = pack_perfect_fluent([] if capacity else [(0, 0)], 1, 1, capacity)
+    assert report.lines == [] and report.upper_bound == 0
@@ -0,0 +1,73 @@
+import io
+
+import pytest
+
+from bench.synthetic import DICTIONARIES, english_like
+from core.dictionary import SyllableDictionary
+from core.presamp import parse_presamp, read_presamp, write_presamp, write_presamp_file
+
+
+def make_dictionary(syllable_map: dict[str, tuple[str, str]], end_flag: bool = True) -> SyllableDictionary:
+    dictionary = SyllableDictionary()
+    dictionary.version = "1.0.0"
+    dictionary.syllable_map = syllable_map
+    dictionary.n_fade = sorted({left for left, _ in syllable_map.values()})[::3]
+    dictionary.end_flag = end_flag
+    return dictionary
+
+
+def presamp_text(dictionary: SyllableDictionary) -> str:
+    f = io.StringIO()
+    write_presamp(f, dictionary)
+    return f.getvalue()
+
+
+def round_trip(text: str) -> tuple[SyllableDictionary, str]:
+    dictionary = parse_presamp(io.StringIO(text)).to_dictionary()
+    return (dictionary, presamp_text(dictionary))
+
+
+@pytest.mark.parametrize("syllable_map", [
+    *(DICTIONARIES[name](seed=1) for name in sorted(DICTIONARIES)),
+    english_like(seed=2, size=10000),
+], ids=[*sorted(DICTIONARIES), "english_10000"])
+@pytest.mark.parametrize("end_flag", [True, False])
+def test_round_trip_is_identity(syllable_map: dict[str, tuple[str, str]], end_flag: bool) -> None:
+    source = make_dictionary(syllable_map, end_flag)
+    text = presamp_text(source)
+    dictionary, written = round_trip(text)
+
+    assert written == text
+    assert dictionary.syllable_map == source.syllable_map
+    assert dictionary.n_fade == [left for left in dict.fromkeys(left for left, _ in syllable_map.values())
+                                 if left in set(source.n_fade)]
+    assert dictionary.end_flag == end_flag
+    assert round_trip(written)[1] == written
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "cp932"])
+def test_file_round_trip(tmp_path, encoding: str) -> None:
+    syllable_map = {f"{c}{v}": (c, v) for c in ("k", "s", "t", "n") for v in ("a", "i", "u", "e", "o")}
+    syllable_map["きゃ"] = ("ky", "a")
+    source = make_dictionary(syllable_map)
+    path = str(tmp_path / "presamp.ini")
+    write_presamp_file(path, source, encoding)
+
+    data = read_presamp(path)
+    assert data.to_dictionary().syllable_map == syllable_map
+    with open(path, encoding=encoding) as f:
+        assert presamp_text(data.to_dictionary()) == f.read()
+
+
+def test_syllables_in_one_table_are_skipped() -> None:
+    text = "\n".join([
+        "[VOWEL]", "a=a=a,ka,sa=100", "i=i=i,ki=100",
+        "[CONSONANT]", "k=ka,ki,ku=1", "s=sa,su=0", "z=zu=1",
+        "[ENDFLAG]", "1", "",
+    ])
+    dictionary = parse_presamp(io.StringIO(text)).to_dictionary()
+
+    assert dictionary.syllable_map == {"ka": ("k", "a"), "ki": ("k", "i"), "sa": ("s", "a")}
+    assert dictionary.n_fade == ["k", "z"]
+    # "z" has no syllable left, so it has no consonant row to carry its crossfade flag.
+    assert "z=" not in presamp_text(dictionary)
@@ -0,0 +1,98 @@
+import asyncio
+import io
+import json
+
+from bench.synthetic import japanese_like, mandarin_like
+from core.compiled import write_compiled
+from core.dictionary import SyllableDictionary
+from core.server import GenerationServer
+from core.validator import CoverageValidator
+
+
+def make_dictionary(syllable_map: dict[str, tuple[str, str]]) -> SyllableDictionary:
+    dictionary = SyllableDictionary()
+    dictionary.version = "1.0.0"
+    dictionary.syllable_map = syllable_map
+    return dictionary
+
+
+def toml_text(syllable_map: dict[str, tuple[str, str]]) -> str:
+    f = io.StringIO()
+    make_dictionary(syllable_map).write_toml(f)
+    return f.getvalue()
+
+
+def exchange(tmp_path, requests: list[dict], count: int) -> dict:
+    """Send the requests in one write and collect ``count`` responses by id."""
+    socket_path = str(tmp_path / "server.sock")
+
+    async def run() -> dict:
+        server = asyncio.create_task(GenerationServer(socket_path, workers=1).serve_forever())
+        try:
+            for _ in range(200):
+                try:
+                    reader, writer = await asyncio.open_unix_connection(socket_path)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    await asyncio.sleep(0.05)
+            writer.write(b"".join(json.dumps(request).encode("utf-8") + b"\n" for request in requests))
+            await writer.drain()
+            responses = {}
+            while len(responses) < count:
+                response = json.loads(await asyncio.wait_for(reader.readline(), 60))
+                responses[response["id"]] = response
+            writer.close()
+            return responses
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    return asyncio.run(run())
+
+
+def generate_request(request_id: str, syllable_map: dict[str, tuple[str, str]], **fields) -> dict:
+    return {"id": request_id, "method": "generate",
+            "params": {"toml": toml_text(syllable_map), "options": {"max_length": 4}}, **fields}
+
+
+def test_generate(tmp_path) -> None:
+    syllable_map = japanese_like(seed=1)
+    responses = exchange(tmp_path, [generate_request("a", syllable_map)], 1)
+
+    result = responses["a"]["result"]
+    assert CoverageValidator(syllable_map, "CVVC").validate(result["reclist"]).complete
+    assert result["summary"]["lines"] == len(result["reclist"])
+
+
+def test_generate_from_compiled_dictionary(tmp_path) -> None:
+    syllable_map = japanese_like(seed=1)
+    path = str(tmp_path / "japanese.srd")
+    write_compiled(path, make_dictionary(syllable_map))
+    request = {"id": "a", "method": "generate", "params": {"input": path, "options": {"max_length": 4}}}
+    responses = exchange(tmp_path, [request], 1)
+
+    assert CoverageValidator(syllable_map, "CVVC").validate(responses["a"]["result"]["reclist"]).complete
+
+
+def test_newer_request_supersedes_its_group(tmp_path) -> None:
+    responses = exchange(tmp_path, [
+        generate_request("a", mandarin_like(seed=1), group="doc"),
+        generate_request("b", japanese_like(seed=1), group="doc"),
+        generate_request("c", japanese_like(seed=2), group="other"),
+    ], 3)
+
+    assert responses["a"] == {"id": "a", "error": "cancelled"}
+    assert "result" in responses["b"]
+    assert "result" in responses["c"]
+
+
+def test_cancel(tmp_path) -> None:
+    responses = exchange(tmp_path, [
+        generate_request("a", mandarin_like(seed=1)),
+        {"id": "x", "method": "cancel", "params": {"id": "a"}},
+        generate_request("b", japanese_like(seed=1)),
+    ], 3)
+
+    assert responses["a"] == {"id": "a", "error": "cancelled"}
+    assert responses["x"] == {"id": "x", "result": {"cancelled": True}}
+    assert "result" in responses["b"]
@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from bench.synthetic import mandarin_like
+from core.views import RLPairView
+
+
+def view_state(view: RLPairView) -> tuple:
+    """Everything a search can read from a view, in view order."""
+    return (
+        view.pair_ids(),
+        [list(view.right_ids_for_left(left_id)) for left_id in range(len(view.left_table))],
+        [list(view.left_ids_for_right(right_id)) for right_id in range(len(view.right_table))],
+        view.all_lefts(),
+        view.all_rights(),
+        view.top_left_ids(len(view.left_table)),
+        view.top_right_ids(len(view.right_table)),
+    )
+
+
+def remove_some(view: RLPairView, rng: random.Random, count: int) -> None:
+    pairs = view.pair_ids()
+    for left_id, right_id in rng.sample(pairs, min(count, len(pairs))):
+        assert view.remove_pair_ids(left_id, right_id)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rollback_restores_state_and_order(seed: int) -> None:
+    rng = random.Random(seed)
+    view = RLPairView(mandarin_like(seed=seed))
+    remove_some(view, rng, 200)
+    before = view_state(view)
+
+    token = view.checkpoint()
+    remove_some(view, rng, 300)
+    # Drain some phonemes completely, so they leave the live sets and the buckets.
+    for left_id in view.top_left_ids(3):
+        view.pop_rights_for_left(view.left_table.name_of(left_id), len(view.right_table))
+    assert view_state(view) != before
+    view.rollback(token)
+
+    assert view_state(view) == before
+
+
+def test_nested_checkpoints() -> None:
+    rng = random.Random(7)
+    view = RLPairView(mandarin_like(seed=7))
+    outer = view.checkpoint()
+    remove_some(view, rng, 50)
+    middle_state = view_state(view)
+
+    inner = view.checkpoint()
+    remove_some(view, rng, 50)
+    view.rollback(inner)
+    assert view_state(view) == middle_state
+
+    inner = view.checkpoint()
+    remove_some(view, rng, 50)
+    released_state = view_state(view)
+    view.release(inner)
+    assert view_state(view) == released_state
+
+    view.rollback(outer)
+    assert view_state(view) == view_state(RLPairView(mandarin_like(seed=7)))
+    with pytest.raises(ValueError):
+        view.rollback(outer)
+
+
+def test_phonemes_are_interned_in_first_seen_order() -> None:
+    syllable_map = {"ka": ("k", "a"), "ki": ("k", "i"), "sa": ("s", "a"), "n": ("n", "n")}
+    view = RLPairView(syllable_map)
+
+    assert [view.left_table.name_of(_id) for _id in range(len(view.left_table))] == ["k", "s", "n"]
+    assert [view.right_table.name_of(_id) for _id in range(len(view.right_table))] == ["a", "i", "n"]
+    assert view.left_table.id_of("x") is None
+    assert view.pair_ids() == [(0, 0), (0, 1), (1, 0), (2, 2)]
+    assert view.syllable_for("s", "a") == "sa"
+    assert view.syllable_for("s", "i") is None
+    # Views over one index share its tables but not their adjacency.
+    other = RLPairView(view.index)
+    assert other.left_table is view.left_table
+    assert view.remove_pair("k", "a")
+    assert (0, 0) in other.pair_ids()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_removal_matches_a_list_model(seed: int) -> None:
+    rng = random.Random(seed)
+    syllable_map = mandarin_like(seed=seed)
+    view = RLPairView(syllable_map)
+    # Plain lists in syllable map order, removed from one by one.
+    rights_of: dict[str, list[str]] = {}
+    lefts_of: dict[str, list[str]] = {}
+    for left, right in syllable_map.values():
+        rights_of.setdefault(left, []).append(right)
+        lefts_of.setdefault(right, []).append(left)
+
+    pairs = [(left, right) for left, rights in rights_of.items() for right in rights]
+    for left, right in rng.sample(pairs, len(pairs) * 3 // 4):
+        assert view.remove_pair(left, right)
+        assert not view.remove_pair(left, right)
+        rights_of[left].remove(right)
+        lefts_of[right].remove(left)
+
+    # The remaining partners keep their original order, and drained phonemes leave the view.
+    assert {left: view.get_rights_for_left(left) for left in rights_of} == rights_of
+    assert {right: view.get_lefts_for_right(right) for right in lefts_of} == lefts_of
+    assert view.all_lefts() == [left for left, rights in rights_of.items() if rights]
+    assert view.all_rights() == [right for right, lefts in lefts_of.items() if lefts]
+    counts = [view.count_rights_for_left(view.left_table.name_of(_id)) for _id in view.top_left_ids(len(rights_of))]
+    assert counts == sorted((len(rights) for rights in rights_of.values() if rights), reverse=True)
+
+
+def test_unknown_phonemes_are_ignored() -> None:
+    view = RLPairView({"ka": ("k", "a")})
+    assert not view.remove_pair("x", "a")
+    assert view.pop_rights_for_left("x", 3) == []
+    assert view.pop_lefts_for_right("x", 3) == []
+    assert view.count_rights_for_left("x") == 0
+    assert list(view.rights_for_left("x")) == []
+    assert view.pop_rights_for_left("k", 3) == ["a"]
+    assert view.pop_rights_for_left("k", 3) == []
+    assert view.all_lefts() == [] and view.all_rights() == []